@@ -0,0 +1,214 @@
+import time
+
+import numpy as np
+
+from bitboard import RAYS, NEIGHBORS, SIZE
+from neutron import NeutronBoard, Neutron
+from simulate import SimulationResult
+from util import Color
+
+_SQUARES = SIZE * SIZE
+_OFF_BOARD = _SQUARES
+
+
+def _pad(table, width):
+    # rays and neighbor lists have varying lengths; missing entries point at
+    # an extra off-board square appended to every board
+    return [list(row) + [_OFF_BOARD] * (width - len(row)) for row in table]
+
+
+RAY_TABLE = np.array([_pad(rays, SIZE - 1) for rays in RAYS], dtype=np.intp)
+"""
+Squares of every ray as a ``(25, 8, 4)`` array, indexed by square, direction
+and distance. Steps leaving the board point at square 25.
+"""
+
+NEIGHBOR_TABLE = np.array(_pad(NEIGHBORS, 8), dtype=np.intp)
+"""Neighbors of every square as a ``(25, 8)`` array, padded with square 25."""
+
+
+class BatchSimulator:
+    """
+    Plays many games between two :class:`player.RandomPlayer` players at
+    once, holding all boards in a single NumPy array.
+
+    Every half-move is computed for all boards with vectorized operations:
+    slides along all rays are found by gathering cells with
+    :data:`RAY_TABLE`, and the moves are chosen the same way
+    :class:`player.RandomPlayer` does: a soldier uniformly among those that
+    can move, then a direction uniformly among the ones it can move in.
+    The neutron's direction is chosen uniformly as well. Winning conditions
+    are those of :func:`neutron.NeutronGame.check_won`.
+
+    Since all games start at the same time, they are always in the same
+    phase of the same player's turn. Finished games retire from the batch.
+
+    Args:
+        count (int): number of games to play.
+        grid: starting grid shared by all games, or a ``(count, 5, 5)`` array
+            of starting grids with the same number of soldiers. Defaults to
+            the starting grid of :class:`neutron.NeutronBoard`.
+        first (int): color of the player who starts the games.
+        seed (int): seed of the random number generator.
+        max_rounds (int):
+            number of rounds after which the remaining games are abandoned.
+
+    Attributes:
+        grids (numpy.ndarray):
+            ``(active games, 5, 5)`` view of the boards still being played.
+        winners (numpy.ndarray):
+            winning color of every game, 0 until it is finished, abandoned or
+            stalled with no soldier able to move.
+        lengths (numpy.ndarray): number of half-moves played in every game.
+    """
+    def __init__(self, count, grid=None, first=Color.WHITE, seed=None,
+                 max_rounds=500):
+        if grid is None:
+            grid = NeutronBoard().grid
+        grids = np.array(grid, dtype=np.int8)
+        if grids.ndim == 2:
+            grids = np.broadcast_to(grids, (count, SIZE, SIZE))
+        if grids.shape != (count, SIZE, SIZE):
+            raise ValueError(f'Invalid game board shape: {grids.shape}')
+        # one extra, always occupied, off-board cell at the end of each board
+        self._cells = np.ones((count, _SQUARES + 1), dtype=np.int8)
+        self._cells[:, :_SQUARES] = grids.reshape(count, _SQUARES)
+        for color in (Color.WHITE, Color.BLACK):
+            counts = (self._cells == color).sum(axis=1)
+            if (counts != counts[0]).any():
+                raise ValueError('all boards need the same number of soldiers')
+
+        self._ids = np.arange(count)
+        self._rng = np.random.default_rng(seed)
+        self.color = first
+        self.initial_round = True
+        self.rounds = 0
+        self.max_rounds = max_rounds
+        self.half_moves = 0
+        self.winners = np.zeros(count, dtype=np.int8)
+        self.lengths = np.zeros(count, dtype=np.int64)
+
+    @property
+    def grids(self):
+        return self._cells[:, :_SQUARES].reshape(-1, SIZE, SIZE)
+
+    @property
+    def active(self):
+        """Number of games still being played."""
+        return len(self._ids)
+
+    def _slides(self, squares):
+        """
+        Computes slides of pieces standing on given squares.
+
+        Args:
+            squares (numpy.ndarray): ``(active games, n)`` array of squares.
+
+        Returns:
+            tuple:
+                ``(active games, n, 8)`` arrays of slide lengths and
+                destination squares, the latter valid where the length is
+                positive.
+        """
+        rays = RAY_TABLE[squares]
+        boards = np.arange(len(squares))[:, None, None, None]
+        empty = self._cells[boards, rays] == 0
+        lengths = np.cumprod(empty, axis=3).sum(axis=3)
+        destinations = np.take_along_axis(
+            rays, np.maximum(lengths - 1, 0)[..., None], axis=3
+        )[..., 0]
+        return lengths, destinations
+
+    def _choose(self, allowed):
+        # uniform choice among allowed entries of the last axis
+        weights = self._rng.random(allowed.shape)
+        weights[~allowed] = -1
+        return weights.argmax(axis=-1)
+
+    def _move(self, squares):
+        """
+        Moves one of the pieces on ``squares`` in every game, the same way
+        :class:`player.RandomPlayer` does.
+
+        Returns:
+            numpy.ndarray: mask of games in which no piece could move.
+        """
+        lengths, destinations = self._slides(squares)
+        boards = np.arange(len(squares))
+        movable = (lengths > 0).any(axis=2)
+        piece = self._choose(movable)
+        dir = self._choose(lengths[boards, piece] > 0)
+        src = squares[boards, piece]
+        dst = destinations[boards, piece, dir]
+        stalled = ~movable.any(axis=1)
+        moved = ~stalled
+        self._cells[boards[moved], dst[moved]] = \
+            self._cells[boards[moved], src[moved]]
+        self._cells[boards[moved], src[moved]] = 0
+        return stalled
+
+    def _pieces(self, value):
+        mask = self._cells[:, :_SQUARES] == value
+        return np.nonzero(mask)[1].reshape(len(mask), -1)
+
+    def _check_won(self, stalled):
+        """
+        Checks winning conditions in all games and retires finished ones.
+        """
+        neutron = self._pieces(Neutron.VALUE)[:, 0]
+        boards = np.arange(len(neutron))[:, None]
+        surrounded = (self._cells[boards, NEIGHBOR_TABLE[neutron]] != 0) \
+            .all(axis=1)
+        row = neutron // SIZE
+        winners = np.where(
+            surrounded, self.color,
+            np.where(row == 0, Color.BLACK,
+                     np.where(row == SIZE - 1, Color.WHITE, 0))
+        )
+        winners[stalled] = 0
+        finished = stalled | (winners != 0)
+        if finished.any():
+            ids = self._ids[finished]
+            self.winners[ids] = winners[finished]
+            self.lengths[ids] = self.half_moves
+            keep = ~finished
+            self._cells = self._cells[keep]
+            self._ids = self._ids[keep]
+
+    def play_round(self):
+        """
+        Plays one round in all active games: the neutron move (except in the
+        first round) and the soldier move, swapping players afterwards.
+        """
+        if not self.initial_round:
+            stalled = self._move(self._pieces(Neutron.VALUE))
+            self.half_moves += 1
+            self._check_won(stalled)
+            if not self.active:
+                return
+
+        stalled = self._move(self._pieces(self.color))
+        self.half_moves += 1
+        self._check_won(stalled)
+
+        self.initial_round = False
+        self.rounds += 1
+        self.color = Color.opposite(self.color)
+
+    def run(self):
+        """
+        Plays all games until they are finished or ``max_rounds`` is
+        reached.
+
+        Returns:
+            simulate.SimulationResult: results of all games.
+        """
+        start_time = time.perf_counter()
+        while self.active and self.rounds < self.max_rounds:
+            self.play_round()
+        self.lengths[self._ids] = self.half_moves
+        outcomes = [
+            (int(winner) or None, int(length))
+            for winner, length in zip(self.winners, self.lengths)
+        ]
+        return SimulationResult(outcomes, time.perf_counter() - start_time)
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+
+from argparse import ArgumentParser
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import timeit
+
+from bitboard import BitboardNeutronBoard
+from neutron import NeutronBoard, NeutronGame
+from player import RandomPlayer, StrategyPlayer
+from simulate import play_game
+from util import Color, directions
+
+engines = {
+    'reference': NeutronBoard,
+    'bitboard': BitboardNeutronBoard,
+}
+"""Board classes benchmarked."""
+
+benchmarks = {}
+"""Registered benchmarks, mapping their names to functions."""
+
+# a mid-game position, used so that queries don't only see the starting grid
+MIDGAME_GRID = [
+    [3, 0, 3, 0, 3],
+    [0, 3, 0, 0, 2],
+    [0, 0, 1, 3, 0],
+    [2, 0, 0, 0, 0],
+    [0, 2, 0, 2, 2],
+]
+
+
+def benchmark(func):
+    """
+    Registers a benchmark. The decorated function takes a board class and
+    returns a callable to be timed and the number of operations one call of
+    it performs.
+    """
+    benchmarks[func.__name__] = func
+    return func
+
+
+@benchmark
+def furthest_empty_spot(engine):
+    board = engine(MIDGAME_GRID)
+    positions = [soldier.pos for soldier in board.white_soldiers]
+
+    def run():
+        for pos in positions:
+            for dir in directions:
+                board.furthest_empty_spot(pos, dir)
+    return run, len(positions) * len(directions)
+
+
+@benchmark
+def possible_moves(engine):
+    board = engine(MIDGAME_GRID)
+    soldiers = board.white_soldiers + board.black_soldiers
+
+    def run():
+        for soldier in soldiers:
+            # the moves cache would turn every call after the first one into
+            # a lookup, so it is cleared to measure move generation
+            board._moves_cache.clear()
+            soldier.possible_moves
+    return run, len(soldiers)
+
+
+@benchmark
+def neighbors(engine):
+    board = engine(MIDGAME_GRID)
+    positions = [soldier.pos for soldier in board.white_soldiers]
+
+    def run():
+        for pos in positions:
+            board.neighbors(pos)
+    return run, len(positions)
+
+
+@benchmark
+def check_won(engine):
+    board = engine(MIDGAME_GRID)
+    game = NeutronGame(board, RandomPlayer(board, Color.WHITE, 4),
+                       RandomPlayer(board, Color.BLACK, 0), verbose=False)
+
+    def run():
+        game.winner = None
+        game.check_won()
+    return run, 1
+
+
+@benchmark
+def random_game(engine):
+    def run():
+        play_game(RandomPlayer, RandomPlayer, board_factory=engine)
+    return run, 1
+
+
+@benchmark
+def strategy_decision(engine):
+    def run():
+        board = engine(MIDGAME_GRID)
+        player = StrategyPlayer(board, Color.WHITE, 4)
+        player.move_neutron()
+        player.move_soldier()
+    return run, 2
+
+
+@benchmark
+def startup(engine):
+    # what a short-lived worker process or command line invocation pays
+    # before its first move: starting the interpreter, importing the engine
+    # and the players, and playing one game
+    code = '\n'.join([
+        f'from {engine.__module__} import {engine.__name__}',
+        'from player import RandomPlayer',
+        'from simulate import play_game',
+        f'play_game(RandomPlayer, RandomPlayer, '
+        f'board_factory={engine.__name__})',
+    ])
+    directory = os.path.dirname(os.path.abspath(__file__))
+
+    def run():
+        subprocess.run([sys.executable, '-c', code], cwd=directory,
+                       check=True)
+    return run, 1
+
+
+def run_benchmarks(names=None, engine_names=None, min_time=0.2, repeat=5):
+    """
+    Runs benchmarks on board engines.
+
+    Every benchmark is timed ``repeat`` times, each time running it for at
+    least ``min_time`` seconds, and the fastest run is reported.
+
+    Args:
+        names (list): names of benchmarks to run, all if ``None``.
+        engine_names (list): names of engines to use, all if ``None``.
+        min_time (float): minimal duration of one timing, in seconds.
+        repeat (int): number of timings.
+
+    Returns:
+        dict:
+            results, mapping ``'benchmark/engine'`` keys to dictionaries
+            with seconds per operation and operations per second.
+    """
+    results = {}
+    random.seed(0)
+    for name in names or benchmarks:
+        for engine_name in engine_names or engines:
+            run, ops = benchmarks[name](engines[engine_name])
+            timer = timeit.Timer(run)
+            number, _ = timer.autorange()
+            number = max(1, int(number * min_time / 0.2))
+            best = min(timer.repeat(repeat=repeat, number=number)) / number
+            results[f'{name}/{engine_name}'] = {
+                'seconds_per_op': best / ops,
+                'ops_per_second': ops / best,
+            }
+    return results
+
+
+def compare(results, baseline, tolerance=0.1):
+    """
+    Compares results with a baseline.
+
+    Args:
+        results (dict): results returned by :func:`run_benchmarks`.
+        baseline (dict): results of an earlier run.
+        tolerance (float):
+            relative slowdown above which a benchmark counts as a regression.
+
+    Returns:
+        list:
+            ``(key, ratio, regressed)`` tuples, where ratio is the current
+            time divided by the baseline time and regressed tells whether it
+            exceeds ``1 + tolerance``, for benchmarks present in both results.
+    """
+    comparison = []
+    for key, result in results.items():
+        if key in baseline:
+            ratio = result['seconds_per_op'] / baseline[key]['seconds_per_op']
+            comparison.append((key, ratio, ratio > 1 + tolerance))
+    return comparison
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(
+        description='Benchmarks move generation, game throughput and player '
+                    'decisions on every board engine.'
+    )
+    parser.add_argument('-o', '--output', default='bench_results.json',
+                        help='File to write the results to, in JSON. \
+                        Defaults to bench_results.json.')
+    parser.add_argument('-b', '--baseline',
+                        help='JSON file with results to compare against.')
+    parser.add_argument('-t', '--tolerance', type=float, default=0.1,
+                        help='Relative slowdown reported as a regression. \
+                        Defaults to 0.1.')
+    parser.add_argument('-k', '--benchmark', action='append',
+                        choices=benchmarks,
+                        help='Benchmark to run; may be repeated. Runs all \
+                        benchmarks by default.')
+    parser.add_argument('-e', '--engine', action='append', choices=engines,
+                        help='Engine to benchmark; may be repeated. Uses all \
+                        engines by default.')
+    args = parser.parse_args()
+
+    # read before the output is written, which may be the same file
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)['results']
+
+    results = run_benchmarks(args.benchmark, args.engine)
+    with open(args.output, 'w') as file:
+        json.dump({
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'timestamp': time.time(),
+            'results': results,
+        }, file, indent=2)
+
+    regressions = 0
+    comparison = {
+        key: (ratio, regressed)
+        for key, ratio, regressed in compare(results, baseline or {},
+                                             args.tolerance)
+    }
+    for key, result in results.items():
+        line = f'{key:40} {result["ops_per_second"]:14.1f} ops/s'
+        if key in comparison:
+            ratio, regressed = comparison[key]
+            line += f' {ratio:6.2f}x baseline time'
+            if regressed:
+                line += ' REGRESSION'
+                regressions += 1
+        print(line)
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,678 @@
+from neutron import NeutronBoard, Neutron, board_tables
+from util import Vec, Color, directions
+
+SIZE = 5
+"""
+Length of the side of the default board. Symmetries and packed keys handle
+only boards of this size.
+"""
+
+DIRECTIONS = tuple(directions)
+"""Direction names in the order used to index the ray tables."""
+
+_direction_index = {
+    **{name: idx for idx, name in enumerate(DIRECTIONS)},
+    **{tuple(vec): idx for idx, vec in enumerate(directions.values())},
+}
+
+
+class BoardTables:
+    """
+    Tables precomputed for a board of a given size, indexed by square number
+    (``y * size + x``).
+
+    Args:
+        size (int): length of the side of the board.
+
+    Attributes:
+        size (int): length of the side of the board.
+        squares (tuple):
+            :class:`util.Vec` position of each square, the ones handed out by
+            :class:`neutron.NeutronBoard` of the same size.
+        rays (tuple):
+            for each of :data:`DIRECTIONS`, a tuple of squares lying on the
+            ray starting next to the square.
+        ray_masks (tuple): the same rays as bitmasks.
+        neighbors (tuple): neighboring squares, in row-major order.
+        neighbor_masks (tuple): the same neighbors as bitmasks.
+        steps (tuple):
+            difference of square numbers of one step in each direction.
+        home_rows (dict):
+            masks of the rows the neutron has to reach for a given color to
+            win.
+        zobrist (dict):
+            Zobrist keys of each square, the ones of
+            :class:`neutron.NeutronBoard` of the same size.
+    """
+    __slots__ = ('size', 'squares', 'rays', 'ray_masks', 'neighbors',
+                 'neighbor_masks', 'steps', 'home_rows', 'zobrist')
+
+    def __init__(self, size):
+        self.size = size
+        self.squares, _, _, self.zobrist = board_tables(size)
+        rays, ray_masks, neighbors, neighbor_masks = [], [], [], []
+        for pos in self.squares:
+            square_rays, square_masks = [], []
+            for dir in directions.values():
+                ray = []
+                x, y = pos.x + dir.x, pos.y + dir.y
+                while 0 <= x < size and 0 <= y < size:
+                    ray.append(y * size + x)
+                    x, y = x + dir.x, y + dir.y
+                square_rays.append(tuple(ray))
+                square_masks.append(sum(1 << sq for sq in ray))
+            rays.append(tuple(square_rays))
+            ray_masks.append(tuple(square_masks))
+            # neighbors are kept in row-major order, the same one
+            # NeutronBoard.neighbors uses
+            square_neighbors = tuple(
+                y * size + x
+                for y in range(max(0, pos.y - 1), min(pos.y + 2, size))
+                for x in range(max(0, pos.x - 1), min(pos.x + 2, size))
+                if x != pos.x or y != pos.y
+            )
+            neighbors.append(square_neighbors)
+            neighbor_masks.append(sum(1 << sq for sq in square_neighbors))
+        self.rays = tuple(rays)
+        self.ray_masks = tuple(ray_masks)
+        self.neighbors = tuple(neighbors)
+        self.neighbor_masks = tuple(neighbor_masks)
+        self.steps = tuple(dir.y * size + dir.x for dir in directions.values())
+        self.home_rows = {
+            Color.BLACK: sum(1 << sq for sq in range(size)),
+            Color.WHITE: sum(1 << sq
+                             for sq in range(size * (size - 1), size * size)),
+        }
+
+
+_tables = {}
+
+
+def tables(size=SIZE):
+    """
+    Get the :class:`BoardTables` of a board size, building them on first use.
+
+    Args:
+        size (int): length of the side of the board.
+
+    Returns:
+        BoardTables: the tables.
+    """
+    board = _tables.get(size)
+    if board is None:
+        board = _tables[size] = BoardTables(size)
+    return board
+
+
+_default = tables(SIZE)
+SQUARES, RAYS, RAY_MASKS, NEIGHBORS, NEIGHBOR_MASKS = (
+    _default.squares, _default.rays, _default.ray_masks, _default.neighbors,
+    _default.neighbor_masks,
+)
+"""
+Tables of the default 5x5 board, see :class:`BoardTables`, indexed by square
+number (``y * 5 + x``):
+
+* ``SQUARES`` - :class:`util.Vec` position of each square,
+* ``RAYS`` - for each of :data:`DIRECTIONS`, a tuple of squares lying on the
+  ray starting next to the square,
+* ``RAY_MASKS`` - the same rays as bitmasks,
+* ``NEIGHBORS`` - neighboring squares, in row-major order,
+* ``NEIGHBOR_MASKS`` - the same neighbors as bitmasks.
+"""
+
+HOME_ROWS = _default.home_rows
+"""
+Masks of the rows the neutron has to reach for a given color to win, on the
+default board.
+"""
+
+
+IDENTITY, MIRROR, FLIP, MIRROR_FLIP = range(4)
+"""
+Symmetries of the game: the identity, the left-to-right mirror, the vertical
+flip swapping soldier colors (and the side to move), and both at once. Each
+of them is its own inverse.
+"""
+
+SYMMETRY_SQUARES = tuple(
+    tuple(
+        (SIZE - 1 - y if symmetry & FLIP else y) * SIZE
+        + (SIZE - 1 - x if symmetry & MIRROR else x)
+        for y in range(SIZE) for x in range(SIZE)
+    )
+    for symmetry in (IDENTITY, MIRROR, FLIP, MIRROR_FLIP)
+)
+"""Square each square is mapped to, indexed by symmetry and square."""
+
+_CHUNK_BITS = 2 * SIZE
+
+
+def _plane_tables(symmetry):
+    # a 25-bit plane is transformed in three lookups: two rows at a time
+    squares = SYMMETRY_SQUARES[symmetry]
+    tables = []
+    for offset in range(0, SIZE * SIZE, _CHUNK_BITS):
+        bits = min(_CHUNK_BITS, SIZE * SIZE - offset)
+        table = [0] * (1 << bits)
+        # every value extends a smaller one by its lowest set bit
+        for value in range(1, 1 << bits):
+            low = value & -value
+            table[value] = table[value ^ low] \
+                | 1 << squares[offset + low.bit_length() - 1]
+        tables.append(tuple(table))
+    return tuple(tables)
+
+
+_PLANE_TABLES = tuple(_plane_tables(symmetry) for symmetry in range(4))
+_PLANE = (1 << SIZE * SIZE) - 1
+_CHUNK = (1 << _CHUNK_BITS) - 1
+
+
+def _transform_plane(plane, tables):
+    low, middle, high = tables
+    return low[plane & _CHUNK] | middle[plane >> _CHUNK_BITS & _CHUNK] \
+        | high[plane >> 2 * _CHUNK_BITS]
+
+
+def transform_key(key, symmetry):
+    """
+    Applies a symmetry to a state packed by :func:`BitBoard.key`.
+
+    Args:
+        key (int): the packed state.
+        symmetry (int): one of :data:`IDENTITY`, :data:`MIRROR`,
+            :data:`FLIP` and :data:`MIRROR_FLIP`.
+
+    Returns:
+        int: the packed transformed state.
+    """
+    if symmetry == IDENTITY:
+        return key
+    squares = SIZE * SIZE
+    odd = key & _PLANE
+    soldiers = key >> squares & _PLANE
+    rest = key >> 2 * squares
+    if symmetry & FLIP:
+        # swapping colors turns black soldiers into white ones, so the odd
+        # plane becomes the neutron and the former white soldiers
+        odd ^= soldiers
+        rest ^= 1
+    tables = _PLANE_TABLES[symmetry]
+    return _transform_plane(odd, tables) \
+        | _transform_plane(soldiers, tables) << squares | rest << 2 * squares
+
+
+def canonical_key(key):
+    """
+    Finds the canonical form of a state packed by :func:`BitBoard.key`: the
+    smallest of its packed images under all symmetries. States related by a
+    symmetry share their canonical key, and so their value for both players.
+
+    Args:
+        key (int): the packed state.
+
+    Returns:
+        tuple:
+            the canonical key and the symmetry which transforms the state
+            into it. Applying the same symmetry to the canonical key gives
+            back the original state.
+    """
+    squares = SIZE * SIZE
+    odd = key & _PLANE
+    soldiers = key >> squares & _PLANE
+    rest = key >> 2 * squares
+    swapped = odd ^ soldiers
+    best, best_symmetry = key, IDENTITY
+    for symmetry, plane, flipped in (
+        (MIRROR, odd, rest),
+        (FLIP, swapped, rest ^ 1),
+        (MIRROR_FLIP, swapped, rest ^ 1),
+    ):
+        tables = _PLANE_TABLES[symmetry]
+        image = _transform_plane(plane, tables) \
+            | _transform_plane(soldiers, tables) << squares \
+            | flipped << 2 * squares
+        if image < best:
+            best, best_symmetry = image, symmetry
+    return best, best_symmetry
+
+
+def transform_move(move, symmetry):
+    """
+    Applies a symmetry to a move.
+
+    Args:
+        move (tuple): ``(source, destination)`` square pair.
+        symmetry (int): the symmetry.
+
+    Returns:
+        tuple: the transformed square pair.
+    """
+    squares = SYMMETRY_SQUARES[symmetry]
+    return squares[move[0]], squares[move[1]]
+
+
+def square(pos, size=SIZE):
+    """
+    Converts a position to a square number.
+
+    Args:
+        pos (util.Vec): position on the board.
+        size (int): length of the side of the board.
+
+    Returns:
+        int: square number of the position.
+    """
+    return pos.y * size + pos.x
+
+
+class BitBoard:
+    """
+    Compact board representation packing the grid into integer bitmasks,
+    one per soldier color plus one for the neutron.
+
+    Square ``y * size + x`` corresponds to bit ``1 << (y * size + x)`` of each
+    mask. All queries work on the precomputed :class:`BoardTables` of the
+    board's size, so none of them walk the grid cell by cell, whatever the
+    size.
+
+    Args:
+        white (int): mask of white soldiers.
+        black (int): mask of black soldiers.
+        neutron (int): mask of the neutron.
+        zobrist (int): Zobrist hash of the position, computed if ``None``.
+        size (int): length of the side of the board.
+
+    Attributes:
+        tables (BoardTables): tables of the board's size.
+        zobrist (int):
+            Zobrist hash of the position, equal to the one of
+            :class:`neutron.NeutronBoard` with the same grid.
+    """
+    __slots__ = 'white', 'black', 'neutron', 'zobrist', 'tables'
+
+    def __init__(self, white=0, black=0, neutron=0, zobrist=None, size=SIZE):
+        self.white = white
+        self.black = black
+        self.neutron = neutron
+        self.tables = tables(size)
+        if zobrist is None:
+            zobrist = 0
+            for value, mask in ((Color.WHITE, white), (Color.BLACK, black),
+                                (Neutron.VALUE, neutron)):
+                keys = self.tables.zobrist[value]
+                while mask:
+                    low = mask & -mask
+                    zobrist ^= keys[low.bit_length() - 1]
+                    mask ^= low
+        self.zobrist = zobrist
+
+    @classmethod
+    def from_grid(cls, grid):
+        """
+        Creates a :class:`BitBoard` from a square grid of cell values.
+
+        Args:
+            grid: square array-like of cell values.
+
+        Returns:
+            BitBoard: a newly created BitBoard.
+
+        Raises:
+            ValueError: if the grid contains an invalid cell value.
+        """
+        return cls.from_cells([value for row in grid for value in row],
+                              len(grid))
+
+    @classmethod
+    def from_cells(cls, cells, size=SIZE):
+        """
+        Creates a :class:`BitBoard` from a flat sequence of cell values,
+        e.g. :attr:`neutron.NeutronBoard.cells`.
+
+        Args:
+            cells: cell values, indexed by square number.
+            size (int): length of the side of the board.
+
+        Returns:
+            BitBoard: a newly created BitBoard.
+
+        Raises:
+            ValueError: if the cells contain an invalid cell value.
+        """
+        masks = {0: 0, Neutron.VALUE: 0, Color.WHITE: 0, Color.BLACK: 0}
+        for sq, value in enumerate(cells):
+            value = int(value)
+            if value not in masks:
+                raise ValueError(f'invalid cell value: {value}')
+            masks[value] |= 1 << sq
+        return cls(masks[Color.WHITE], masks[Color.BLACK],
+                   masks[Neutron.VALUE], size=size)
+
+    def key(self, color, phase):
+        """
+        Packs the position together with the side to move and the turn phase
+        into a single integer, unique for every state of the game.
+
+        The lowest ``size * size`` bits hold the squares with odd cell values
+        (the neutron and black soldiers), the next ``size * size`` bits the
+        squares with values greater than 1 (both soldier colors), followed by
+        one bit set if black is to move and one bit set in the soldier phase
+        of the turn.
+
+        Args:
+            color (int): color of the player to move.
+            phase (str): ``'neutron'`` or ``'soldier'``.
+
+        Returns:
+            int: the packed state, fitting in 52 bits on the default board.
+        """
+        squares = self.tables.size ** 2
+        return (self.neutron | self.black) \
+            | (self.white | self.black) << squares \
+            | (color == Color.BLACK) << 2 * squares \
+            | (phase == 'soldier') << 2 * squares + 1
+
+    @classmethod
+    def from_key(cls, key, size=SIZE):
+        """
+        Unpacks a state packed by :func:`key`.
+
+        Args:
+            key (int): the packed state.
+            size (int): length of the side of the board.
+
+        Returns:
+            tuple: the :class:`BitBoard`, the color to move and the phase.
+        """
+        squares = size * size
+        full = (1 << squares) - 1
+        odd = key & full
+        soldiers = key >> squares & full
+        color = Color.BLACK if key >> 2 * squares & 1 else Color.WHITE
+        phase = 'soldier' if key >> 2 * squares + 1 & 1 else 'neutron'
+        return cls(soldiers & ~odd, soldiers & odd, odd & ~soldiers,
+                   size=size), color, phase
+
+    def canonical_key(self, color, phase):
+        """
+        Packs the state like :func:`key` does, in its canonical form under the
+        symmetries of the game.
+
+        Args:
+            color (int): color of the player to move.
+            phase (str): ``'neutron'`` or ``'soldier'``.
+
+        Returns:
+            tuple:
+                the canonical key and the symmetry mapping this state to it,
+                as returned by :func:`canonical_key`. Moves found in the
+                canonical state are mapped back with :func:`transform_move`
+                and the same symmetry.
+
+        Raises:
+            ValueError: if the board is not of the default size.
+        """
+        if self.tables.size != SIZE:
+            raise ValueError('symmetries are only defined for the default '
+                             'board size')
+        return canonical_key(self.key(color, phase))
+
+    def to_grid(self):
+        """
+        Converts this :class:`BitBoard` back to a grid of cell values.
+
+        Returns:
+            list: square nested list of cell values.
+        """
+        size = self.tables.size
+        return [
+            [self.value(y * size + x) for x in range(size)]
+            for y in range(size)
+        ]
+
+    def copy(self):
+        """Returns a copy of this :class:`BitBoard`."""
+        bits = BitBoard.__new__(BitBoard)
+        bits.white = self.white
+        bits.black = self.black
+        bits.neutron = self.neutron
+        bits.zobrist = self.zobrist
+        bits.tables = self.tables
+        return bits
+
+    @property
+    def occupied(self):
+        """Mask of all non-empty squares."""
+        return self.white | self.black | self.neutron
+
+    @property
+    def neutron_square(self):
+        """Square number of the neutron."""
+        return self.neutron.bit_length() - 1
+
+    def mask(self, value):
+        """
+        Get the mask of squares holding a given cell value.
+
+        Args:
+            value (int): a soldier color or :attr:`neutron.Neutron.VALUE`.
+
+        Returns:
+            int: the mask of squares holding this value.
+        """
+        if value == Color.WHITE:
+            return self.white
+        elif value == Color.BLACK:
+            return self.black
+        elif value == Neutron.VALUE:
+            return self.neutron
+        raise ValueError(f'invalid cell value: {value}')
+
+    def value(self, sq):
+        """
+        Get the value of the cell at a given square.
+
+        Args:
+            sq (int): square number.
+
+        Returns:
+            int: cell value, 0 if the square is empty.
+        """
+        bit = 1 << sq
+        if self.white & bit:
+            return Color.WHITE
+        if self.black & bit:
+            return Color.BLACK
+        if self.neutron & bit:
+            return Neutron.VALUE
+        return 0
+
+    def slide(self, sq, dir):
+        """
+        Get the square a piece standing on ``sq`` ends up on after sliding
+        in direction ``dir`` until it hits an edge or another piece.
+
+        Args:
+            sq (int): starting square.
+            dir (int): index into :data:`DIRECTIONS`.
+
+        Returns:
+            int: destination square, or ``None`` if the move cannot be made.
+        """
+        tables = self.tables
+        ray = tables.rays[sq][dir]
+        if not ray:
+            return None
+        blockers = tables.ray_masks[sq][dir] & (self.white | self.black |
+                                                self.neutron)
+        if not blockers:
+            return ray[-1]
+        # rays running towards higher square numbers hit their nearest
+        # blocker at the lowest set bit, the remaining ones at the highest
+        step = tables.steps[dir]
+        if step > 0:
+            dst = (blockers & -blockers).bit_length() - 1 - step
+        else:
+            dst = blockers.bit_length() - 1 - step
+        return dst if dst != sq else None
+
+    def moves(self, sq):
+        """
+        Get all moves of a piece standing on a given square.
+
+        Args:
+            sq (int): square of the piece.
+
+        Returns:
+            list: ``(direction index, destination square)`` tuples.
+        """
+        moves = []
+        for dir in range(len(DIRECTIONS)):
+            dst = self.slide(sq, dir)
+            if dst is not None:
+                moves.append((dir, dst))
+        return moves
+
+    def neighbors(self, sq):
+        """
+        Get values of the cells neighboring a given square, in the same order
+        as :func:`neutron.NeutronBoard.neighbors` does.
+
+        Args:
+            sq (int): square number.
+
+        Returns:
+            list: values of neighboring cells.
+        """
+        return [self.value(n) for n in self.tables.neighbors[sq]]
+
+    def is_surrounded(self, sq):
+        """
+        Checks if all squares neighboring ``sq`` are occupied.
+
+        Args:
+            sq (int): square number.
+
+        Returns:
+            bool: ``True`` if no neighboring square is empty.
+        """
+        mask = self.tables.neighbor_masks[sq]
+        return self.occupied & mask == mask
+
+    def winner(self, current_color):
+        """
+        Checks the winning conditions the same way as
+        :func:`neutron.NeutronGame.check_won` does.
+
+        Args:
+            current_color (int): color of the player who made the last move.
+
+        Returns:
+            int: the winning color, or ``None`` if the game is not over.
+        """
+        if self.is_surrounded(self.neutron_square):
+            return current_color
+        home_rows = self.tables.home_rows
+        if self.neutron & home_rows[Color.BLACK]:
+            return Color.BLACK
+        elif self.neutron & home_rows[Color.WHITE]:
+            return Color.WHITE
+        return None
+
+    def move(self, src, dst):
+        """
+        Moves the piece standing on ``src`` to ``dst``, without checking if
+        the move is legal.
+
+        Args:
+            src (int): source square.
+            dst (int): destination square.
+        """
+        change = (1 << src) | (1 << dst)
+        bit = 1 << src
+        if self.white & bit:
+            self.white ^= change
+            keys = self.tables.zobrist[Color.WHITE]
+        elif self.black & bit:
+            self.black ^= change
+            keys = self.tables.zobrist[Color.BLACK]
+        else:
+            self.neutron ^= change
+            keys = self.tables.zobrist[Neutron.VALUE]
+        self.zobrist ^= keys[src] ^ keys[dst]
+
+
+class BitboardNeutronBoard(NeutronBoard):
+    """
+    A :class:`neutron.NeutronBoard` answering its queries with a
+    :class:`BitBoard` kept in sync with the grid.
+
+    It is a drop-in replacement for :class:`neutron.NeutronBoard`: soldiers
+    and players work with it unchanged, only faster.
+
+    Args:
+        starting_grid: array-like representing starting board data.
+        size (int): length of the side of the board, see
+            :class:`neutron.NeutronBoard`.
+
+    Attributes:
+        bits (BitBoard): bitboard mirroring the grid of this board.
+    """
+    def __init__(self, starting_grid=None, size=None):
+        super().__init__(starting_grid, size)
+        self.bits = BitBoard.from_cells(self.cells, self.size)
+
+    def furthest_empty_spot(self, pos, dir):
+        """
+        Get the furthest empty position one can get by moving in direction
+        ``dir`` from position ``pos`` without colliding with anything.
+
+        Answered by :func:`BitBoard.slide` with no walk over the grid.
+
+        Args:
+            pos (util.Vec): starting position.
+            dir (str or util.Vec): direction in which to move.
+
+        Returns:
+            util.Vec:
+                position of the furthest empty spot in the line of sight of
+                source position, or ``None`` if the movement cannot be made.
+        """
+        dst = self.bits.slide(
+            pos.y * self.size + pos.x,
+            _direction_index[tuple(dir) if isinstance(dir, Vec) else dir]
+        )
+        return self.bits.tables.squares[dst] if dst is not None else None
+
+    def neighbors(self, pos):
+        """
+        Get values of board cells neighboring cell with position ``pos``.
+
+        Args:
+            pos (util.Vec): position of the cell.
+
+        Returns:
+            list: list of neighboring cells' values, without the source cell
+        """
+        return self.bits.neighbors(pos.y * self.size + pos.x)
+
+    def canonical_key(self, color, phase):
+        """
+        Get the canonical key of the game's state, see
+        :func:`BitBoard.canonical_key`.
+
+        Args:
+            color (int): color of the player to move.
+            phase (str): ``'neutron'`` or ``'soldier'``.
+
+        Returns:
+            tuple: the canonical key and the symmetry mapping to it.
+        """
+        return self.bits.canonical_key(color, phase)
+
+    def _move_piece(self, src, dst, value):
+        super()._move_piece(src, dst, value)
+        size = self.size
+        self.bits.move(src.y * size + src.x, dst.y * size + dst.x)
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+
+from argparse import ArgumentParser
+import os
+import tempfile
+
+from bitboard import BitBoard, SQUARES, SIZE, canonical_key, transform_key, \
+    transform_move
+from mmtable import MappedTable
+from player import Player, StrategyPlayer
+from record import GameReader
+from simulate import player_types, simulate
+from util import Color
+
+_SQUARE_COUNT = SIZE * SIZE
+
+
+def encode_move(move):
+    """Packs a ``(source, destination)`` square pair into a table value."""
+    return move[0] * _SQUARE_COUNT + move[1]
+
+
+def decode_move(value):
+    """Unpacks a table value made by :func:`encode_move`."""
+    return divmod(value, _SQUARE_COUNT)
+
+
+def opening_positions(record, depth):
+    """
+    Walks the opening of a recorded game.
+
+    Args:
+        record (record.GameRecord): the game.
+        depth (int): number of half-moves to walk.
+
+    Yields:
+        tuple:
+            ``(canonical key, canonical move, mover)`` for each of the first
+            ``depth`` half-moves: the canonical key of the state before the
+            move (see :func:`bitboard.canonical_key`), the move mapped to the
+            canonical state, and the color of the player who made it.
+    """
+    bits = BitBoard.from_key(record.grid)[0]
+    color, phase = record.first, 'soldier'
+    moves = record.moves
+    for idx in range(0, min(len(moves), 2 * depth), 2):
+        move = moves[idx], moves[idx + 1]
+        state = bits.key(color, phase)
+        key, _ = canonical_key(state)
+        # a symmetric state has several symmetries mapping it to its
+        # canonical key; taking the smallest image merges equivalent moves
+        yield key, min(
+            transform_move(move, symmetry)
+            for symmetry in range(4)
+            if transform_key(state, symmetry) == key
+        ), color
+        bits.move(*move)
+        if phase == 'neutron':
+            phase = 'soldier'
+        else:
+            color, phase = Color.opposite(color), 'neutron'
+
+
+def build_book(records, depth=8, min_games=10):
+    """
+    Aggregates outcomes of recorded games into an opening book.
+
+    Every move played in the first ``depth`` half-moves of a game is scored
+    from the point of view of the player who made it: 1 for a won game, 0 for
+    a lost one and 0.5 for an abandoned one. Positions are merged under
+    their canonical keys, so games differing only by a symmetry add up. For
+    every position reached in at least ``min_games`` games, the book keeps
+    the move with the best average score among those played at least
+    ``min_games`` times.
+
+    Args:
+        records: iterable of :class:`record.GameRecord` objects, e.g. a
+            :class:`record.GameReader`.
+        depth (int): number of half-moves covered by the book.
+        min_games (int): number of games a move needs to be considered.
+
+    Returns:
+        dict:
+            mapping of canonical keys to moves in the canonical state, packed
+            with :func:`encode_move`.
+    """
+    stats = {}
+    for record in records:
+        for key, move, mover in opening_positions(record, depth):
+            score = 1 if record.winner == mover \
+                else 0.5 if not record.winner else 0
+            moves = stats.setdefault(key, {})
+            games, total = moves.get(move, (0, 0))
+            moves[move] = games + 1, total + score
+    book = {}
+    for key, moves in stats.items():
+        candidates = [
+            (total / games, games, move)
+            for move, (games, total) in moves.items()
+            if games >= min_games
+        ]
+        if candidates:
+            book[key] = encode_move(max(candidates)[2])
+    return book
+
+
+class BookPlayer(Player):
+    """
+    A player playing the opening from a book created by :func:`build_book`,
+    and falling back to another player once it leaves the book.
+
+    Each turn costs a single table lookup while in book. After the first
+    position missing from the book, the book isn't consulted anymore.
+
+    Args:
+        board (neutron.NeutronBoard):
+            board of the game played by this player.
+        color (int): color of this player's soldiers.
+        home_row (int): index of this player's home row on board.
+        path (str): path of the book file.
+        fallback: :class:`player.Player` subclass used outside the book.
+
+    Attributes:
+        in_book (bool): whether the book is still consulted.
+
+    Raises:
+        ValueError: if the board is not of the default size, which is the
+            only one books hold.
+    """
+    _books = {}
+
+    def __init__(self, board, color, home_row, path='book.bin',
+                 fallback=StrategyPlayer):
+        if board.size != SIZE:
+            raise ValueError(f'books only hold {SIZE}x{SIZE} games')
+        super().__init__(board, color, home_row)
+        if path not in self._books:
+            self._books[path] = MappedTable(path)
+        self.book = self._books[path]
+        self.fallback = fallback(board, color, home_row)
+        self.in_book = True
+
+    def book_move(self, phase):
+        """
+        Looks the current state up in the book.
+
+        Args:
+            phase (str): ``'neutron'`` or ``'soldier'``.
+
+        Returns:
+            tuple:
+                ``(source, destination)`` square pair, or ``None`` if the
+                state is not in the book.
+        """
+        if not self.in_book:
+            return None
+        key, symmetry = self.board.canonical_key(self.color, phase)
+        value = self.book.get(key)
+        if value is None:
+            self.in_book = False
+            return None
+        return transform_move(decode_move(value), symmetry)
+
+    def move_neutron(self):
+        move = self.book_move('neutron')
+        if move is None:
+            self.fallback.move_neutron()
+        else:
+            self.board.neutron.move_to_pos(SQUARES[move[1]])
+
+    def move_soldier(self):
+        move = self.book_move('soldier')
+        if move is None:
+            self.fallback.move_soldier()
+            return
+        soldier = next(
+            soldier
+            for soldier in self.board.get_soldiers(self.color)
+            if soldier.pos == SQUARES[move[0]]
+        )
+        soldier.move_to_pos(SQUARES[move[1]])
+
+    def close(self):
+        if hasattr(self.fallback, 'close'):
+            self.fallback.close()
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(
+        description='Builds an opening book from outcomes of recorded '
+                    'games.'
+    )
+    parser.add_argument('records', nargs='*',
+                        help='Game record files, written by simulate.py \
+                        --record.')
+    parser.add_argument('-o', '--output', default='book.bin',
+                        help='Book file. Defaults to book.bin.')
+    parser.add_argument('-d', '--depth', type=int, default=8,
+                        help='Number of half-moves covered by the book. \
+                        Defaults to 8.')
+    parser.add_argument('-m', '--min-games', type=int, default=10,
+                        help='Number of games a move needs to be played in to \
+                        enter the book. Defaults to 10.')
+    parser.add_argument('-n', '--self-play', type=int, default=0,
+                        help='Number of self-play games to play and add to \
+                        the records first.')
+    parser.add_argument('-p', '--player', choices=player_types,
+                        default='strategy',
+                        help='Type of the self-playing player. Defaults to \
+                        strategy.')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='Number of self-play worker processes. Defaults \
+                        to the number of CPUs.')
+    args = parser.parse_args()
+
+    paths = list(args.records)
+    if args.self_play:
+        fd, path = tempfile.mkstemp(suffix='.rec')
+        os.close(fd)
+        os.remove(path)
+        player = player_types[args.player]
+        simulate(player, player, args.self_play, workers=args.workers,
+                 record=path)
+        paths.append(path)
+    if not paths:
+        parser.error('no game records given')
+
+    def records():
+        for path in paths:
+            with GameReader(path) as reader:
+                yield from reader
+
+    book = build_book(records(), args.depth, args.min_games)
+    MappedTable.write(args.output, book)
+    if args.self_play:
+        os.remove(paths[-1])
+    print(f'{len(book)} positions written to {args.output}')
@@ -0,0 +1,100 @@
+import numpy as np
+
+from batch import NEIGHBOR_TABLE, RAY_TABLE
+from bitboard import SIZE
+from neutron import Neutron
+from util import Color
+
+_SQUARES = SIZE * SIZE
+_OFF_BOARD = _SQUARES
+
+FEATURES = (
+    'neutron_mobility',
+    'neutron_distance_white',
+    'neutron_distance_black',
+    'empty_home_white',
+    'empty_home_black',
+    'neutron_blocked',
+    'mobility_white',
+    'mobility_black',
+)
+"""
+Names of the columns of :func:`extract`'s result:
+
+* ``neutron_mobility`` - number of directions the neutron can move in,
+* ``neutron_distance_white`` and ``neutron_distance_black`` - number of rows
+  between the neutron and the home row of a color,
+* ``empty_home_white`` and ``empty_home_black`` - number of empty squares in
+  the home row of a color,
+* ``neutron_blocked`` - number of occupied squares around the neutron,
+* ``mobility_white`` and ``mobility_black`` - number of moves of the soldiers
+  of a color, counting every direction a soldier can move in.
+"""
+
+_FIRST_STEPS = RAY_TABLE[:, :, 0]
+
+
+def extract(grids):
+    """
+    Computes :data:`FEATURES` of many positions at once.
+
+    All features are computed with array operations over the whole batch:
+    a piece can move in a direction exactly when the first square of the
+    ray in that direction (see :data:`batch.RAY_TABLE`) is empty, so
+    mobilities are sums of gathered cells, and the neutron's surroundings
+    are gathered with :data:`batch.NEIGHBOR_TABLE`. Only 5x5 grids are
+    handled.
+
+    Args:
+        grids: a 5x5 grid, or an ``(n, 5, 5)`` array of grids, each holding
+            exactly one neutron.
+
+    Returns:
+        numpy.ndarray:
+            ``(n, len(FEATURES))`` array of features, or a 1-D array of them
+            given a single grid.
+    """
+    grids = np.asarray(grids)
+    single = grids.ndim == 2
+    if single:
+        grids = grids[None]
+    if grids.shape[1:] != (SIZE, SIZE):
+        raise ValueError(f'Invalid game board shape: {grids.shape[1:]}')
+    count = len(grids)
+    # one extra, always occupied, off-board cell at the end of each board
+    cells = np.ones((count, _SQUARES + 1), dtype=np.int8)
+    cells[:, :_SQUARES] = grids.reshape(count, _SQUARES)
+    empty = cells == 0
+    boards = np.arange(count)[:, None]
+
+    # number of directions a piece on every square could move in
+    mobility = empty[:, _FIRST_STEPS].sum(axis=2, dtype=np.int32)
+    squares = cells[:, :_SQUARES]
+    neutron = np.argmax(squares == Neutron.VALUE, axis=1)
+    row = neutron // SIZE
+    neighbors = NEIGHBOR_TABLE[neutron]
+
+    features = np.empty((count, len(FEATURES)), dtype=np.int32)
+    features[:, 0] = mobility[boards[:, 0], neutron]
+    features[:, 1] = SIZE - 1 - row
+    features[:, 2] = row
+    features[:, 3] = empty[:, _SQUARES - SIZE:_SQUARES].sum(axis=1)
+    features[:, 4] = empty[:, :SIZE].sum(axis=1)
+    features[:, 5] = ((neighbors != _OFF_BOARD)
+                      & ~empty[boards, neighbors]).sum(axis=1)
+    features[:, 6] = (mobility * (squares == Color.WHITE)).sum(axis=1)
+    features[:, 7] = (mobility * (squares == Color.BLACK)).sum(axis=1)
+    return features[0] if single else features
+
+
+def board_features(board):
+    """
+    Computes :data:`FEATURES` of a board's position, see :func:`extract`.
+
+    Args:
+        board (neutron.NeutronBoard): the board.
+
+    Returns:
+        numpy.ndarray: 1-D array of features.
+    """
+    return extract(board.grid)
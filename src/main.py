@@ -3,16 +3,19 @@
 from argparse import ArgumentParser, RawDescriptionHelpFormatter
 import textwrap
 
-from neutron import NeutronGame, NeutronBoard
-from player import HumanPlayer, RandomPlayer, StrategyPlayer
+from bitboard import BitboardNeutronBoard
+from neutron import BOARD_SIZE, NeutronGame, NeutronBoard
+from player import HumanPlayer, RandomPlayer, StrategyPlayer, SearchPlayer, \
+    MCTSPlayer
 from util import Color
 
 if __name__ == '__main__':
     parser = ArgumentParser(description=textwrap.dedent("""
         User Guide
 
-        The game, upon start, presents the player a 5x5 grid. The top and
-        bottom rows are home rows of the respective players.
+        The game, upon start, presents the player a 5x5 grid (or a larger
+        one, see --size). The top and bottom rows are home rows of the
+        respective players.
 
         When there's the player's turn, the game prints what exactly the
         player is supposed to move (the neutron or a regular soldier),
@@ -39,24 +42,48 @@ if __name__ == '__main__':
     parser.add_argument('-f', '--first', choices=['computer', 'human'],
                         default='human', help="Defines who should start the \
                         game: computer or human player.")
-    parser.add_argument('-p', '--player-type', choices=['random', 'strategy'],
+    parser.add_argument('-p', '--player-type',
+                        choices=['random', 'strategy', 'search', 'mcts'],
                         default='strategy', help="Sets the preferred player \
-                        type: random, which makes random movements, and \
-                        strategy, which makes decisions based on rules.")
+                        type: random, which makes random movements, \
+                        strategy, which makes decisions based on rules, \
+                        search, which looks a few moves ahead, and mcts, \
+                        which plays out many random games.")
+    parser.add_argument('-e', '--engine', choices=['reference', 'bitboard'],
+                        default='reference', help="Sets the board engine: \
+                        reference, which walks the board array, and bitboard, \
+                        which answers the same queries with bitmasks. \
+                        Defaults to reference, the faster one.")
+    parser.add_argument('-s', '--size', type=int, default=BOARD_SIZE,
+                        help=f"Size of the board. Defaults to {BOARD_SIZE}.")
+    parser.add_argument('--no-ponder', action='store_true',
+                        help="Keeps search and mcts players idle during the \
+                        human player's turn, instead of searching the likely \
+                        replies in the background.")
     args = parser.parse_args()
 
-    board = NeutronBoard()
-    player_constructor = StrategyPlayer if args.player_type == 'strategy' \
-        else RandomPlayer
+    board_class = BitboardNeutronBoard if args.engine == 'bitboard' \
+        else NeutronBoard
+    board = board_class(size=args.size)
+    last_row = board.size - 1
+    player_constructor = {
+        'random': RandomPlayer,
+        'strategy': StrategyPlayer,
+        'search': SearchPlayer,
+        'mcts': MCTSPlayer,
+    }[args.player_type]
+    options = {} if args.player_type in ('random', 'strategy') \
+        else {'ponder': not args.no_ponder}
     computer = player_constructor(
         board,
         Color.WHITE if args.color == 'black' else Color.BLACK,
-        4 if args.color == 'black' else 0
+        last_row if args.color == 'black' else 0,
+        **options
     )
     human = HumanPlayer(
         board,
         Color.WHITE if args.color == 'white' else Color.BLACK,
-        4 if args.color == 'white' else 0
+        last_row if args.color == 'white' else 0
     )
     game = NeutronGame(
         board,
@@ -67,3 +94,6 @@ if __name__ == '__main__':
         game.start()
     except KeyboardInterrupt:
         pass
+    finally:
+        if hasattr(computer, 'close'):
+            computer.close()
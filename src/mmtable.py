@@ -0,0 +1,100 @@
+import mmap
+import struct
+
+_HEADER = struct.Struct('<4sIQ')
+_MAGIC = b'NTBL'
+_EMPTY = 0
+
+
+def _slot(key, bits):
+    # Fibonacci hashing spreads packed states, which differ mostly in a few
+    # bits, over the whole table
+    return (key * 0x9E3779B97F4A7C15 & 0xFFFFFFFFFFFFFFFF) >> (64 - bits)
+
+
+class MappedTable:
+    """
+    A read-only hash table mapping 64-bit keys to 16-bit values, stored in a
+    file and accessed through :mod:`mmap`, so that opening it costs nothing
+    and lookups only touch the pages they need.
+
+    The file consists of a header, an array of keys and an array of values.
+    Keys are placed with open addressing and linear probing in a table at
+    most half full, so a lookup takes a couple of probes.
+
+    Args:
+        path (str): path of a file created by :func:`MappedTable.write`.
+    """
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._bits, self.size = _HEADER.unpack_from(self._mmap)
+        if magic != _MAGIC:
+            raise ValueError(f'{path} is not a table file')
+        self.slots = 1 << self._bits
+        view = memoryview(self._mmap)
+        keys_end = _HEADER.size + 8 * self.slots
+        self._keys = view[_HEADER.size:keys_end].cast('Q')
+        self._values = view[keys_end:keys_end + 2 * self.slots].cast('H')
+
+    @staticmethod
+    def write(path, items):
+        """
+        Writes a table file.
+
+        Args:
+            path (str): path of the file.
+            items (dict): mapping of keys to values, both non-negative;
+                keys below 2**64 - 1, values below 2**16.
+        """
+        bits = max(1, (2 * len(items) - 1).bit_length())
+        slots = 1 << bits
+        mask = slots - 1
+        keys = [_EMPTY] * slots
+        values = [0] * slots
+        for key, value in items.items():
+            slot = _slot(key, bits)
+            while keys[slot] != _EMPTY:
+                slot = (slot + 1) & mask
+            # keys are stored incremented, so that 0 marks an empty slot
+            keys[slot] = key + 1
+            values[slot] = value
+        with open(path, 'wb') as file:
+            file.write(_HEADER.pack(_MAGIC, bits, len(items)))
+            file.write(struct.pack(f'<{slots}Q', *keys))
+            file.write(struct.pack(f'<{slots}H', *values))
+
+    def get(self, key, default=None):
+        """
+        Looks a key up.
+
+        Args:
+            key (int): the key.
+            default: value returned if the key is not in the table.
+
+        Returns:
+            int: the value stored for the key, or ``default``.
+        """
+        mask = self.slots - 1
+        slot = _slot(key, self._bits)
+        stored = key + 1
+        keys = self._keys
+        while True:
+            found = keys[slot]
+            if found == stored:
+                return self._values[slot]
+            if found == _EMPTY:
+                return default
+            slot = (slot + 1) & mask
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return self.size
+
+    def close(self):
+        """Releases the mapping."""
+        self._keys.release()
+        self._values.release()
+        self._mmap.close()
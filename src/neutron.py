@@ -1,9 +1,72 @@
+import array
 import itertools
-import textwrap
-import numpy as np
+import random
 
 from util import Vec, Color, directions
 
+BOARD_SIZE = 5
+"""Default length of the side of the board."""
+
+MIN_BOARD_SIZE = 3
+
+
+def _build_squares(size):
+    return tuple(Vec(sq % size, sq // size) for sq in range(size * size))
+
+
+SQUARES = _build_squares(BOARD_SIZE)
+"""
+Positions of the squares of the default board, indexed by square number
+(``y * 5 + x``). Boards hand out these :class:`util.Vec` objects instead of
+creating new ones.
+"""
+
+
+def _build_rays(size):
+    rays = []
+    for y in range(size):
+        for x in range(size):
+            square_rays = {}
+            for name, dir in directions.items():
+                ray = []
+                ray_x, ray_y = x + dir.x, y + dir.y
+                while 0 <= ray_x < size and 0 <= ray_y < size:
+                    ray.append(ray_y * size + ray_x)
+                    ray_x, ray_y = ray_x + dir.x, ray_y + dir.y
+                square_rays[name] = tuple(ray)
+            rays.append(square_rays)
+    return tuple(rays)
+
+
+RAYS = _build_rays(BOARD_SIZE)
+"""
+Rays of every square of the default board, built once at import. Maps a
+square number and a direction name to a tuple of square numbers one passes
+moving from the square in that direction, nearest first.
+"""
+
+
+def _build_neighbors(size):
+    return tuple(
+        tuple(
+            ny * size + nx
+            for ny in range(max(0, y - 1), min(y + 2, size))
+            for nx in range(max(0, x - 1), min(x + 2, size))
+            if nx != x or ny != y
+        )
+        for y in range(size)
+        for x in range(size)
+    )
+
+
+NEIGHBORS = _build_neighbors(BOARD_SIZE)
+"""
+Neighbors of every square of the default board, built once at import. Maps a
+square number to a tuple of neighboring square numbers, in row-major order.
+"""
+
+_direction_names = {tuple(dir): name for name, dir in directions.items()}
+
 
 class Soldier:
     """
@@ -28,27 +91,20 @@ class Soldier:
         """
         List of directions this :class:`Soldier` can move.
 
-        Works by calling :func:`NeutronBoard.furthest_empty_spot` for this
-        Soldier's position and filtering out ``None`` results.
+        Works by taking the keys of :func:`NeutronBoard.legal_moves` for this
+        Soldier's position.
         """
-        return {
-            dir
-            for dir in directions
-            if self._board.furthest_empty_spot(self.pos, dir) is not None
-        }
+        return set(self._board.legal_moves(self.pos))
 
     @property
     def possible_moves(self):
         """
         List of positions this :class:`Soldier` can be after one move.
 
-        Works by supplying :func:`NeutronBoard.furthest_empty_spot` with all
-        possible directions, then filtering out ``None`` results.
+        Works by taking the values of :func:`NeutronBoard.legal_moves` for
+        this Soldier's position.
         """
-        return {dir for dir in {
-            self._board.furthest_empty_spot(self.pos, dir)
-            for dir in directions
-        } if dir is not None}
+        return set(self._board.legal_moves(self.pos).values())
 
     @property
     def neighbors(self):
@@ -65,9 +121,9 @@ class Soldier:
         This method will fail if the given direction is not in
         :attr:`possible_directions`.
 
-        Works by calling :func:`NeutronBoard.furthest_empty_spot`, setting
-        the position returned by this function to this :class:`Soldier`'s
-        color, and the original position to 0.
+        Works by looking the destination up in
+        :func:`NeutronBoard.legal_moves`, setting it to this
+        :class:`Soldier`'s color, and the original position to 0.
 
         Args:
             direction (str): direction in which to move this :class:`Soldier`.
@@ -76,11 +132,10 @@ class Soldier:
             ValueError:
                 if the given direction is not in :attr:`possible_directions`.
         """
-        if direction not in self.possible_directions:
+        dst = self._board.legal_moves(self.pos).get(direction)
+        if dst is None:
             raise ValueError(f'not possible to move in direction {direction}')
-        dst = self._board.furthest_empty_spot(self.pos, direction)
-        self._board.grid[tuple(dst)] = self.color
-        self._board.grid[tuple(self.pos)] = 0
+        self._board._move_piece(self.pos, dst, self.color)
         self.pos = dst
 
     def move_to_pos(self, position):
@@ -96,10 +151,9 @@ class Soldier:
         Raises:
             ValueError: if the given position is not in :attr:`possible_moves`.
         """
-        if position not in self.possible_moves:
+        if position not in self._board.legal_moves(self.pos).values():
             raise ValueError(f'not possible to move to position {position}')
-        self._board.grid[tuple(position)] = self.color
-        self._board.grid[tuple(self.pos)] = 0
+        self._board._move_piece(self.pos, position, self.color)
         self.pos = position
 
 
@@ -116,56 +170,208 @@ class Neutron(Soldier):
         super().__init__(board, position, self.VALUE)
 
 
+def _zobrist_keys(size):
+    # a fixed seed keeps hashes stable between processes and runs
+    rng = random.Random(0x6e657574726f6e)
+    keys = {
+        value: tuple(rng.getrandbits(64) for _ in range(size * size))
+        for value in (Neutron.VALUE, Color.WHITE, Color.BLACK)
+    }
+    return keys, rng.getrandbits(64), rng.getrandbits(64)
+
+
+ZOBRIST, ZOBRIST_BLACK_TO_MOVE, ZOBRIST_SOLDIER_PHASE = \
+    _zobrist_keys(BOARD_SIZE)
+"""
+Zobrist keys: ``ZOBRIST`` maps a cell value to random 64-bit keys of every
+square of the default board, numbered ``y * 5 + x``. The remaining two keys
+are mixed into a position's hash when black is to move and when the turn is
+in its soldier phase.
+"""
+
+_board_tables = {BOARD_SIZE: (SQUARES, RAYS, NEIGHBORS, ZOBRIST)}
+
+
+def board_tables(size):
+    """
+    Get the precomputed tables of a board of a given size, building them on
+    first use.
+
+    Args:
+        size (int): length of the side of the board.
+
+    Returns:
+        tuple:
+            positions, rays, neighbors and Zobrist keys of every square, laid
+            out like :data:`SQUARES`, :data:`RAYS`, :data:`NEIGHBORS` and
+            :data:`ZOBRIST`, with squares numbered ``y * size + x``.
+    """
+    tables = _board_tables.get(size)
+    if tables is None:
+        tables = _board_tables[size] = (
+            _build_squares(size), _build_rays(size), _build_neighbors(size),
+            _zobrist_keys(size)[0]
+        )
+    return tables
+
+
+def default_grid(size=BOARD_SIZE):
+    """
+    Creates the starting grid of a board: black soldiers fill the first row,
+    white soldiers the last one, and the neutron stands in the middle.
+
+    Args:
+        size (int): length of the side of the board.
+
+    Returns:
+        list: the grid, as a list of rows.
+    """
+    grid = [[0] * size for _ in range(size)]
+    grid[0] = [Color.BLACK] * size
+    grid[-1] = [Color.WHITE] * size
+    grid[size // 2][size // 2] = Neutron.VALUE
+    return grid
+
+
+class Move:
+    """
+    A compact description of a single move, which can be applied to and
+    reverted on a board with :func:`NeutronBoard.make_move` and
+    :func:`NeutronBoard.unmake_move`.
+
+    Args:
+        piece (Soldier): the moved piece, a :class:`Soldier` or the
+            :class:`Neutron`.
+        src (util.Vec): position of the piece before the move.
+        dst (util.Vec): position of the piece after the move.
+    """
+    __slots__ = 'piece', 'src', 'dst'
+
+    def __init__(self, piece, src, dst):
+        self.piece = piece
+        self.src = src
+        self.dst = dst
+
+    def __eq__(self, other):
+        return isinstance(other, Move) and self.piece is other.piece \
+            and self.src == other.src and self.dst == other.dst
+
+    def __hash__(self):
+        return hash((id(self.piece), self.src, self.dst))
+
+    def __repr__(self):
+        return f'Move({self.piece.color}, {self.src}, {self.dst})'
+
+
 class NeutronBoard:
     """
     The Neutron game board.
 
-    It is represented by a 5x5 NumPy array. The purpose of this class is to
-    manage the array, ensuring it doesn't get into an invalid state, and to
-    provide useful functions for the game's logic.
+    It is represented by a flat array of the cells of a square grid, 5x5 by
+    default, indexed by square number (``y * size + x``). The purpose of this
+    class is to manage the array, ensuring it doesn't get into an invalid
+    state, and to provide useful functions for the game's logic.
+
+    The board doesn't need NumPy: it is only imported the first time
+    :attr:`grid` is used, which keeps the startup of short-lived processes
+    fast.
 
     Args:
-        starting_grid (:class:`numpy.array`):
-            array representing starting board data.
+        starting_grid:
+            square array-like (e.g. a :class:`numpy.array` or a list of rows)
+            representing starting board data. Defaults to the grid made by
+            :func:`default_grid`.
+        size (int):
+            length of the side of the board. Only needed without a starting
+            grid, otherwise taken from its shape.
 
     Attributes:
-        grid (numpy.array):
-            the array containing raw data of this board. Only
-            for testing purposes
+        cells (array.array):
+            values of all cells, indexed by square number.
+        size (int): length of the side of the board.
+        last_move (tuple):
+            source and destination positions of the most recent move.
+        neutron_liberties (int):
+            number of empty cells neighboring the neutron, updated
+            incrementally as pieces move. The neutron is surrounded when it
+            drops to 0.
+        zobrist (int):
+            Zobrist hash of the grid, updated incrementally as pieces move.
+            Cells holding values other than soldier colors and the neutron do
+            not contribute to it.
         white_soldiers (list):
             list of :class:`Soldier` objects representing white soldiers.
         black_soldiers (list):
             list of :class:`Soldier` objects representing black soldiers.
     """
-    def __init__(self, starting_grid=None):
-        if starting_grid:
-            if not isinstance(starting_grid, np.ndarray):
-                starting_grid = np.array(starting_grid)
-            if starting_grid.shape != (5, 5):
-                raise ValueError(
-                    f'Invalid game board shape: {starting_grid.shape}'
-                )
-        self.grid = np.array(starting_grid) if starting_grid is not None \
-            else np.array([
-                [3, 3, 3, 3, 3],
-                [0, 0, 0, 0, 0],
-                [0, 0, 1, 0, 0],
-                [0, 0, 0, 0, 0],
-                [2, 2, 2, 2, 2]
-            ])
-
+    def __init__(self, starting_grid=None, size=None):
+        if starting_grid is not None:
+            if hasattr(starting_grid, 'tolist'):
+                starting_grid = starting_grid.tolist()
+            try:
+                rows = [[int(value) for value in row]
+                        for row in starting_grid]
+            except TypeError:
+                raise ValueError('Invalid game board shape') from None
+            shape = (len(rows), *{len(row) for row in rows})
+            if len(shape) != 2 or shape[0] != shape[1] \
+                    or shape[0] < MIN_BOARD_SIZE \
+                    or size is not None and shape[0] != size:
+                raise ValueError(f'Invalid game board shape: {shape}')
+        else:
+            size = BOARD_SIZE if size is None else size
+            if size < MIN_BOARD_SIZE:
+                raise ValueError(f'Invalid game board size: {size}')
+            rows = default_grid(size)
+        self.size = len(rows)
+        self._squares, self._rays, self._neighbors, self._zobrist = \
+            board_tables(self.size)
+        # 64-bit cells, so that the grid view has NumPy's default int type
+        self.cells = array.array('q', itertools.chain.from_iterable(rows))
+        self._grid = None
+
+        squares = {Color.WHITE: [], Color.BLACK: [], Neutron.VALUE: []}
+        for sq, value in enumerate(self.cells):
+            if value in squares:
+                squares[value].append(sq)
         self.white_soldiers = [
-            Soldier(self, Vec.fromtuple(idx), Color.WHITE)
-            for idx in zip(*np.where(self.grid == Color.WHITE))
+            Soldier(self, self._squares[sq], Color.WHITE)
+            for sq in squares[Color.WHITE]
         ]
-
         self.black_soldiers = [
-            Soldier(self, Vec.fromtuple(idx), Color.BLACK)
-            for idx in zip(*np.where(self.grid == Color.BLACK))
+            Soldier(self, self._squares[sq], Color.BLACK)
+            for sq in squares[Color.BLACK]
         ]
+        self.neutron = Neutron(self, self._squares[squares[Neutron.VALUE][0]])
+
+        self._moves_cache = {}
+        self.last_move = None
+        self.neutron_liberties = self._count_liberties(self.neutron.pos)
 
-        self.neutron = Neutron(self, Vec.fromtuple(
-                       next(zip(*np.where(self.grid == Neutron.VALUE)))))
+        self.zobrist = 0
+        for sq, value in enumerate(self.cells):
+            if value in self._zobrist:
+                self.zobrist ^= self._zobrist[value][sq]
+
+    @property
+    def grid(self):
+        """
+        The cells as a ``(size, size)`` :class:`numpy.array`. It is a view
+        sharing memory with :attr:`cells`, so writing to it changes the
+        board too; like writing to :attr:`cells`, that is only meant for
+        testing purposes, since it bypasses :class:`Soldier` objects.
+        """
+        if self._grid is None:
+            import numpy as np
+            self._grid = np.frombuffer(self.cells, dtype=np.int64) \
+                .reshape(self.size, self.size)
+        return self._grid
+
+    def __getstate__(self):
+        # the grid view would be pickled as a copy of the cells
+        state = self.__dict__.copy()
+        state['_grid'] = None
+        return state
 
     def get_soldiers(self, color):
         """
@@ -189,23 +395,88 @@ class NeutronBoard:
         else:
             raise ValueError('invalid soldier color')
 
-    def furthest_empty_spot(self, pos, dir):
+    def generate_moves(self, color):
         """
-        Get the furthest empty position one can get by moving in direction
-        ``dir`` from position ``pos`` without colliding with anything.
+        Get all moves of the soldiers of a given color, or of the neutron.
 
-        Implemented as a while loop checking following conditions:
+        Args:
+            color (int):
+                color of the soldiers, or :attr:`Neutron.VALUE` to get moves
+                of the neutron.
 
-        * if the position after a step in the given direction is still in
-          the board's bounds,
+        Returns:
+            list: list of :class:`Move` objects.
+        """
+        pieces = [self.neutron] if color == Neutron.VALUE \
+            else self.get_soldiers(color)
+        return [
+            Move(piece, piece.pos, dst)
+            for piece in pieces
+            for dst in self.legal_moves(piece.pos).values()
+        ]
 
-        * if the position after the step is empty.
+    def make_move(self, move):
+        """
+        Applies a move to the board, without validating it. Positions are
+        reused from the move, so no new :class:`Soldier` or
+        :class:`util.Vec` objects are created.
 
-        While those conditions are met, the step is performed, adding direction
-        to position.
-        If, after executing the loop, the resulting position is different from
-        the starting position, we return it. Else, the move could not be made,
-        and we return ``None``.
+        Args:
+            move (Move): a move generated by :func:`generate_moves` for the
+                current state of the board.
+        """
+        self._move_piece(move.src, move.dst, move.piece.color)
+        move.piece.pos = move.dst
+
+    def unmake_move(self, move):
+        """
+        Reverts a move applied with :func:`make_move`. Moves have to be
+        reverted in the reverse order they were made in.
+
+        Args:
+            move (Move): the most recently made move.
+        """
+        self._move_piece(move.dst, move.src, move.piece.color)
+        move.piece.pos = move.src
+
+    def legal_moves(self, pos):
+        """
+        Get all moves of a piece standing at position ``pos``.
+
+        Moves are generated once per position and board state: the result is
+        cached until any piece moves. The cache assumes the grid changes only
+        through :class:`Soldier` methods. Destinations are the shared
+        positions of :data:`SQUARES`, so no :class:`util.Vec` is created.
+
+        Args:
+            pos (util.Vec): position of the piece.
+
+        Returns:
+            dict:
+                mapping of direction names to positions the piece ends up at
+                after moving in that direction. Directions in which the piece
+                cannot move are left out.
+        """
+        sq = pos.y * self.size + pos.x
+        moves = self._moves_cache.get(sq)
+        if moves is None:
+            moves = {}
+            for dir in directions:
+                dst = self.furthest_empty_spot(pos, dir)
+                if dst is not None:
+                    moves[dir] = dst
+            self._moves_cache[sq] = moves
+        return moves
+
+    def furthest_empty_spot(self, pos, dir):
+        """
+        Get the furthest empty position one can get by moving in direction
+        ``dir`` from position ``pos`` without colliding with anything.
+
+        Implemented as a walk along the precomputed ray (see :data:`RAYS`),
+        stopping at the first non-empty cell. If at least one step could be
+        made, the last empty position is returned. Else, the move could not be
+        made, and we return ``None``.
 
         Args:
             pos (util.Vec): starting position.
@@ -216,25 +487,22 @@ class NeutronBoard:
                 position of the furthest empty spot in the line of sight of
                 source position, or ``None`` if the movement cannot be made.
         """
-        orig_pos = pos
-        if not isinstance(dir, Vec):
-            dir = directions[dir]
-        # we check if the position would still be in the board's bounds even
-        # after we move one step in the given direction
-        while (0 <= (pos + dir).x < len(self.grid[pos.y])) \
-                and (0 <= (pos + dir).y < len(self.grid)) \
-                and self.grid[tuple(pos + dir)] == 0:
-            pos += dir
-        return pos if pos != orig_pos else None
+        if isinstance(dir, Vec):
+            dir = _direction_names[tuple(dir)]
+        dst = None
+        cells = self.cells
+        for step in self._rays[pos.y * self.size + pos.x][dir]:
+            if cells[step]:
+                break
+            dst = step
+        return self._squares[dst] if dst is not None else None
 
     def neighbors(self, pos):
         """
         Get values of board cells neighboring cell with position ``pos``.
 
-        It iterates over coordinates from x-1 to x+1 and y-1 to y+1, making
-        sure they are not out of the bounds of the board, and appends values
-        at those positions to the resulting list. The source position itself
-        is not included.
+        Neighboring positions are precomputed (see :data:`NEIGHBORS`), in
+        row-major order. The source position itself is not included.
 
         Args:
             pos (util.Vec): position of the cell.
@@ -242,29 +510,122 @@ class NeutronBoard:
         Returns:
             list: list of neighboring cells' values, without the source cell
         """
-        neighbors = []
-        for y in range(max(0, pos.y - 1), min(pos.y + 2, len(self.grid))):
-            for x in range(max(0, pos.x - 1),
-                           min(pos.x + 2, len(self.grid[y]))):
-                if x != pos.x or y != pos.y:
-                    neighbors.append(self.grid[y, x])
-        return neighbors
+        cells = self.cells
+        return [cells[n] for n in self._neighbors[pos.y * self.size + pos.x]]
 
-    def __str__(self):
-        grid_str = textwrap.dedent("""
-                1   2   3   4   5
-              +---+---+---+---+---+
-            A | {} | {} | {} | {} | {} |
-              +---+---+---+---+---+
-            B | {} | {} | {} | {} | {} |
-              +---+---+---+---+---+
-            C | {} | {} | {} | {} | {} |
-              +---+---+---+---+---+
-            D | {} | {} | {} | {} | {} |
-              +---+---+---+---+---+
-            E | {} | {} | {} | {} | {} |
-              +---+---+---+---+---+""")
+    def winner(self, current_color):
+        """
+        Checks the winning conditions of the game: the player who made the
+        last move wins if the neutron is surrounded, otherwise the neutron
+        reaching a home row wins the game for the row's owner.
 
+        Both checks are constant-time: the number of empty cells around the
+        neutron is kept in :attr:`neutron_liberties`.
+
+        Args:
+            current_color (int): color of the player who made the last move.
+
+        Returns:
+            int: the winning color, or ``None`` if the game is not over.
+        """
+        if not self.neutron_liberties:
+            return current_color
+        elif self.neutron.pos.y == 0:
+            return Color.BLACK
+        elif self.neutron.pos.y == self.size - 1:
+            return Color.WHITE
+        return None
+
+    def canonical_key(self, color, phase):
+        """
+        Get the canonical key of the game's state, see
+        :func:`bitboard.BitBoard.canonical_key`. Position-keyed stores, like
+        tablebases and opening books, are looked up with it, whichever the
+        board engine.
+
+        Args:
+            color (int): color of the player to move.
+            phase (str): ``'neutron'`` or ``'soldier'``.
+
+        Returns:
+            tuple: the canonical key and the symmetry mapping to it.
+
+        Raises:
+            ValueError: if the board is not of the default size.
+        """
+        # imported here, the bitboard module builds on this one
+        from bitboard import BitBoard
+        return BitBoard.from_cells(self.cells, self.size).canonical_key(
+            color, phase
+        )
+
+    def _count_liberties(self, pos):
+        cells = self.cells
+        return sum(1 for n in self._neighbors[pos.y * self.size + pos.x]
+                   if not cells[n])
+
+    def empty_neighbors(self, pos):
+        """
+        Get empty positions neighboring position ``pos``.
+
+        Args:
+            pos (util.Vec): the position.
+
+        Returns:
+            set: set of :class:`util.Vec` positions of empty cells.
+        """
+        cells = self.cells
+        squares = self._squares
+        return {squares[n] for n in self._neighbors[pos.y * self.size + pos.x]
+                if not cells[n]}
+
+    def empty_in_row(self, row):
+        """
+        Get empty positions of a row of the board.
+
+        Args:
+            row (int): index of the row.
+
+        Returns:
+            set: set of :class:`util.Vec` positions of empty cells.
+        """
+        cells = self.cells
+        squares = self._squares
+        start = row * self.size
+        return {squares[sq] for sq in range(start, start + self.size)
+                if not cells[sq]}
+
+    def _move_piece(self, src, dst, value):
+        """
+        Moves a piece between two cells of the grid. Called by
+        :class:`Soldier` after the move has been validated, so that subclasses
+        can keep their own representation of the board in sync.
+
+        Args:
+            src (util.Vec): current position of the piece.
+            dst (util.Vec): new position of the piece.
+            value (int): cell value of the piece.
+        """
+        size = self.size
+        src_sq, dst_sq = src.y * size + src.x, dst.y * size + dst.x
+        self.cells[dst_sq] = value
+        self.cells[src_sq] = 0
+        self.last_move = (src, dst)
+        self._moves_cache.clear()
+        if value == Neutron.VALUE:
+            self.neutron_liberties = self._count_liberties(dst)
+        else:
+            # a soldier leaving the neutron's neighborhood frees a cell, one
+            # entering it takes one
+            neutron = self.neutron.pos
+            if abs(src.x - neutron.x) <= 1 and abs(src.y - neutron.y) <= 1:
+                self.neutron_liberties += 1
+            if abs(dst.x - neutron.x) <= 1 and abs(dst.y - neutron.y) <= 1:
+                self.neutron_liberties -= 1
+        keys = self._zobrist[value]
+        self.zobrist ^= keys[src_sq] ^ keys[dst_sq]
+
+    def __str__(self):
         color_map = {
             Color.WHITE: '\u25cf',
             Color.BLACK: '\u25cb',
@@ -272,61 +633,229 @@ class NeutronBoard:
             0: ' '
         }
 
-        formats = [
-            color_map[self.grid[j, i]]
-            for j in range(self.grid.shape[0])
-            for i in range(self.grid.shape[1])
-        ]
-
-        return grid_str.format(*formats)
+        separator = '  +' + '---+' * self.size
+        lines = ['', '    ' + ''.join(
+            f'{x + 1:<4}' for x in range(self.size)
+        ).rstrip(), separator]
+        for y in range(self.size):
+            lines.append(f'{chr(ord("A") + y)} | ' + ' | '.join(
+                color_map[self.cells[y * self.size + x]]
+                for x in range(self.size)
+            ) + ' |')
+            lines.append(separator)
+        return '\n'.join(lines)
 
 
 class NeutronGame:
     """
     The main Neutron game class.
 
+    A game is a state machine which can be stepped from outside: every turn
+    consists of a neutron move and a soldier move (the very first turn has
+    no neutron move), and each of them is one step. The current
+    :attr:`phase`, :func:`legal_actions` and :func:`apply` let any driver
+    (an event loop, a batch scheduler, a search) play the game, while
+    :func:`step` lets the current player decide. None of them print
+    anything; :func:`start` is a thin loop over :func:`step` which does.
+
     Args:
         board (neutron.NeutronBoard):
             the game board to be used by this game instance
         first_player (player.Player): the player who will start the game
         second_player (player.Player): the second player
+        verbose (bool):
+            whether to print the board before every move. Disable it to run
+            games headless.
+        recorder (record.GameRecorder):
+            optional recorder notified about the game's start, every move and
+            the game's end.
+        phase (str):
+            phase of the first player's turn the game starts in,
+            ``'soldier'`` for a new game.
+
+    Attributes:
+        current_player (player.Player): the player to move.
+        phase (str):
+            ``'neutron'`` or ``'soldier'``, the kind of piece the current
+            player moves next.
+        winner (int): color of the winning player, ``None`` until the game
+            is over.
+        half_moves (int): number of moves made so far, counting soldier and
+            neutron moves separately.
     """
-    def __init__(self, board, first_player, second_player):
+    def __init__(self, board, first_player, second_player, verbose=True,
+                 recorder=None, phase='soldier'):
         self.board = board
         self.players = itertools.cycle([first_player, second_player])
         self.current_player = next(self.players)
+        self.phase = phase
         self.winner = None
-        self.initial_round = True
+        self.verbose = verbose
+        self.half_moves = 0
+        self.recorder = recorder
+        if recorder is not None:
+            recorder.begin(board, first_player, second_player)
+
+    @property
+    def is_over(self):
+        """Whether the game has been won."""
+        return self.winner is not None
+
+    def legal_actions(self):
+        """
+        Get all moves the current player can make in the current phase.
+
+        Returns:
+            list:
+                list of :class:`Move` objects, empty if the game is over.
+        """
+        if self.is_over:
+            return []
+        return self.board.generate_moves(
+            Neutron.VALUE if self.phase == 'neutron'
+            else self.current_player.color
+        )
+
+    def apply(self, action):
+        """
+        Makes a move on behalf of the current player and advances the game.
+
+        The move is made by the piece of this game's board standing on the
+        move's source square, so a move describing the same position on
+        another board never changes that board.
+
+        Args:
+            action (Move): one of the moves returned by
+                :func:`legal_actions`.
+
+        Returns:
+            int: winning player's color, ``None`` if the game goes on.
+
+        Raises:
+            ValueError:
+                if the game is over, or the move is not legal in the current
+                phase.
+        """
+        if self.is_over:
+            raise ValueError('the game is over')
+        if self.phase == 'neutron':
+            pieces = [self.board.neutron]
+        else:
+            pieces = self.board.get_soldiers(self.current_player.color)
+        piece = next((piece for piece in pieces if piece.pos == action.src),
+                     None)
+        if piece is None or action.piece.color != piece.color:
+            raise ValueError(f'{action} cannot be made in this phase')
+        piece.move_to_pos(action.dst)
+        return self._advance()
+
+    def step(self):
+        """
+        Lets the current player make their move in the current phase, and
+        advances the game.
+
+        Returns:
+            int: winning player's color, ``None`` if the game goes on.
+        """
+        if self.phase == 'neutron':
+            self.current_player.move_neutron()
+        else:
+            self.current_player.move_soldier()
+        return self._advance()
+
+    async def step_async(self, executor=None):
+        """
+        Makes a step like :func:`step`, without blocking the event loop:
+        players may define :func:`player.Player.move_neutron` and
+        :func:`player.Player.move_soldier` as coroutines, which are awaited,
+        for example to wait for a remote human's decision. Moves of other
+        players, which may take a long time to compute, run in ``executor``.
+
+        Args:
+            executor (concurrent.futures.Executor):
+                executor running moves of players which aren't coroutines,
+                ``None`` for the event loop's default one.
+
+        Returns:
+            int: winning player's color, ``None`` if the game goes on.
+        """
+        method = self.current_player.move_neutron if self.phase == 'neutron' \
+            else self.current_player.move_soldier
+        # imported here, games driven synchronously need neither of them, and
+        # both take a while to import
+        import asyncio
+        import inspect
+        if inspect.iscoroutinefunction(method):
+            await method()
+        else:
+            await asyncio.get_running_loop().run_in_executor(executor, method)
+        return self._advance()
+
+    def _advance(self):
+        self.half_moves += 1
+        if self.recorder is not None:
+            self.recorder.record(*self.board.last_move)
+        if self.check_won():
+            return self.winner
+        if self.phase == 'neutron':
+            self.phase = 'soldier'
+        else:
+            self.phase = 'neutron'
+            self.current_player = next(self.players)
+        return None
 
     def start(self):
         """
         Starts the game, playing rounds until the game is won by either of
         the players.
         """
-        while not self.winner:
-            self.play_round()
+        while not self.is_over:
+            if self.verbose:
+                print(self.board)
+            self.step()
 
-        print(self.board)
-        print(f'{Color.color_names[self.winner]} player won the game!'
-              .capitalize())
+        if self.verbose:
+            print(self.board)
+            print(f'{Color.color_names[self.winner]} player won the game!'
+                  .capitalize())
 
     def play_round(self):
-        """Plays one round, swapping players afterwards."""
-        if not self.initial_round:
-            print(self.board)
-            self.current_player.move_neutron()
-            if self.check_won():
-                return
+        """
+        Plays the rest of the current player's turn, swapping players
+        afterwards.
+        """
+        player = self.current_player
+        while not self.is_over and self.current_player is player:
+            if self.verbose:
+                print(self.board)
+            self.step()
 
-        print(self.board)
+    async def play_async(self, executor=None):
+        """
+        Plays the game until it is won, like :func:`start`, without blocking
+        the event loop. Nothing is printed.
 
-        self.current_player.move_soldier()
+        Args:
+            executor (concurrent.futures.Executor):
+                executor running moves of players which aren't coroutines,
+                see :func:`step_async`.
+        """
+        while not self.is_over:
+            await self.step_async(executor)
 
-        if self.check_won():
-            return
+    async def play_round_async(self, executor=None):
+        """
+        Plays the rest of the current player's turn like :func:`play_round`,
+        without blocking the event loop. Nothing is printed.
 
-        self.initial_round = False
-        self.current_player = next(self.players)
+        Args:
+            executor (concurrent.futures.Executor):
+                executor running moves of players which aren't coroutines,
+                see :func:`step_async`.
+        """
+        player = self.current_player
+        while not self.is_over and self.current_player is player:
+            await self.step_async(executor)
 
     def check_won(self):
         """
@@ -336,13 +865,9 @@ class NeutronGame:
         Returns:
             int: winning player's color
         """
-        if all(
-            neighbor != 0
-            for neighbor in self.board.neighbors(self.board.neutron.pos)
-        ):
-            self.winner = self.current_player.color
-        elif self.board.neutron.pos.y == 0:
-            self.winner = Color.BLACK
-        elif self.board.neutron.pos.y == 4:
-            self.winner = Color.WHITE
+        winner = self.board.winner(self.current_player.color)
+        if winner and not self.winner:
+            self.winner = winner
+            if self.recorder is not None:
+                self.recorder.end(winner)
         return self.winner
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+
+from argparse import ArgumentParser
+import json
+import time
+
+from bitboard import BitBoard, BitboardNeutronBoard, square
+from neutron import BOARD_SIZE, NeutronBoard, Neutron
+from util import Color
+
+
+class BoardEngine:
+    """
+    Adapts a :class:`neutron.NeutronBoard` class to the interface used by
+    perft: moves keyed by ``(source, destination)`` square pairs, applied
+    with :func:`neutron.NeutronBoard.make_move`.
+
+    Args:
+        board_class: :class:`neutron.NeutronBoard` or a subclass of it.
+        grid: starting grid.
+    """
+    def __init__(self, board_class, grid):
+        self.board = board_class(grid)
+
+    def moves(self, value):
+        return {
+            (square(move.src, self.board.size),
+             square(move.dst, self.board.size)): move
+            for move in self.board.generate_moves(value)
+        }
+
+    def make(self, move):
+        self.board.make_move(move)
+
+    def unmake(self, move):
+        self.board.unmake_move(move)
+
+    def winner(self, color):
+        return self.board.winner(color)
+
+
+class BitBoardEngine:
+    """
+    Adapts a :class:`bitboard.BitBoard`, as used by search-based players, to
+    the interface used by perft.
+
+    Args:
+        grid: starting grid.
+    """
+    def __init__(self, grid):
+        self.bits = BitBoard.from_grid(grid)
+
+    def moves(self, value):
+        mask = self.bits.mask(value)
+        moves = {}
+        while mask:
+            low = mask & -mask
+            src = low.bit_length() - 1
+            for _, dst in self.bits.moves(src):
+                moves[src, dst] = (src, dst)
+            mask ^= low
+        return moves
+
+    def make(self, move):
+        self.bits.move(*move)
+
+    def unmake(self, move):
+        self.bits.move(move[1], move[0])
+
+    def winner(self, color):
+        return self.bits.winner(color)
+
+
+engines = {
+    'reference': lambda grid: BoardEngine(NeutronBoard, grid),
+    'bitboard': lambda grid: BoardEngine(BitboardNeutronBoard, grid),
+    'bits': BitBoardEngine,
+}
+"""Factories of engines perft can run on, taking a starting grid."""
+
+
+def _next(color, phase):
+    if phase == 'neutron':
+        return color, 'soldier'
+    return Color.opposite(color), 'neutron'
+
+
+class PerftResult:
+    """
+    Results of a perft run.
+
+    Attributes:
+        levels (list):
+            one dictionary per depth, counting positions reached by neutron
+            moves, by soldier moves, and the number of those that end the
+            game.
+        elapsed (float): wall-clock time of the run, in seconds.
+    """
+    def __init__(self, depth):
+        self.levels = [
+            {'neutron': 0, 'soldier': 0, 'wins': 0}
+            for _ in range(depth)
+        ]
+        self.elapsed = 0.0
+
+    @property
+    def leaves(self):
+        """Number of positions at the maximum depth."""
+        last = self.levels[-1]
+        return last['neutron'] + last['soldier']
+
+    @property
+    def nodes(self):
+        """Number of positions visited."""
+        return sum(level['neutron'] + level['soldier']
+                   for level in self.levels)
+
+    @property
+    def nodes_per_second(self):
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        lines = [f'{"depth":>5} {"neutron":>12} {"soldier":>12} {"wins":>12}']
+        for depth, level in enumerate(self.levels, 1):
+            lines.append(f'{depth:5} {level["neutron"]:12} '
+                         f'{level["soldier"]:12} {level["wins"]:12}')
+        lines.append(f'{self.nodes} nodes in {self.elapsed:.2f} s, '
+                     f'{self.nodes_per_second:.0f} nodes/s')
+        return '\n'.join(lines)
+
+
+def perft(engine, depth, color=Color.WHITE, phase='soldier'):
+    """
+    Counts positions reachable from the engine's position in up to ``depth``
+    half-moves. Positions which end the game are counted, but not expanded.
+
+    Args:
+        engine: an engine, e.g. created by one of :data:`engines`.
+        depth (int): number of half-moves.
+        color (int): color of the player to move.
+        phase (str):
+            phase of the turn, ``'soldier'`` for the first turn of the game.
+
+    Returns:
+        PerftResult: position counts per depth.
+    """
+    result = PerftResult(depth)
+    levels = result.levels
+
+    def walk(color, phase, ply):
+        level = levels[ply]
+        next_color, next_phase = _next(color, phase)
+        for move in engine.moves(
+            Neutron.VALUE if phase == 'neutron' else color
+        ).values():
+            engine.make(move)
+            level[phase] += 1
+            if engine.winner(color):
+                level['wins'] += 1
+            elif ply + 1 < depth:
+                walk(next_color, next_phase, ply + 1)
+            engine.unmake(move)
+
+    start = time.perf_counter()
+    if depth > 0:
+        walk(color, phase, 0)
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def cross_check(engine, grid, depth, color=Color.WHITE, phase='soldier'):
+    """
+    Walks the game tree with the reference :class:`neutron.NeutronBoard` and
+    another engine in lockstep, comparing moves and winners in every
+    position.
+
+    Args:
+        engine: factory of the checked engine, taking a starting grid.
+        grid: starting grid.
+        depth (int): number of half-moves.
+        color (int): color of the player to move.
+        phase (str): phase of the turn.
+
+    Returns:
+        list:
+            mismatches, as dictionaries describing the position and the
+            difference. Empty if the engines agree.
+    """
+    reference = BoardEngine(NeutronBoard, grid)
+    checked = engine(grid)
+    mismatches = []
+
+    def walk(color, phase, ply):
+        value = Neutron.VALUE if phase == 'neutron' else color
+        expected = reference.moves(value)
+        actual = checked.moves(value)
+        if expected.keys() != actual.keys():
+            mismatches.append({
+                'grid': reference.board.grid.tolist(),
+                'color': color,
+                'phase': phase,
+                'missing': sorted(expected.keys() - actual.keys()),
+                'extra': sorted(actual.keys() - expected.keys()),
+            })
+            return
+        next_color, next_phase = _next(color, phase)
+        for key, move in expected.items():
+            reference.make(move)
+            checked.make(actual[key])
+            winner = reference.winner(color)
+            if winner != checked.winner(color):
+                mismatches.append({
+                    'grid': reference.board.grid.tolist(),
+                    'color': color,
+                    'phase': phase,
+                    'winner': winner,
+                    'checked_winner': checked.winner(color),
+                })
+            elif not winner and ply + 1 < depth:
+                walk(next_color, next_phase, ply + 1)
+            checked.unmake(actual[key])
+            reference.unmake(move)
+
+    if depth > 0:
+        walk(color, phase, 0)
+    return mismatches
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(
+        description='Counts positions reachable in a number of half-moves '
+                    'and cross-checks board engines against the reference '
+                    'implementation.'
+    )
+    parser.add_argument('depth', type=int, help='Number of half-moves.')
+    parser.add_argument('-g', '--grid', type=json.loads, default=None,
+                        help='Starting grid as a JSON list of rows. Defaults \
+                        to the starting grid of the game.')
+    parser.add_argument('-s', '--size', type=int, default=BOARD_SIZE,
+                        help=f'Size of the default starting grid. Defaults \
+                        to {BOARD_SIZE}.')
+    parser.add_argument('-c', '--color', choices=['white', 'black'],
+                        default='white', help='Color of the player to move.')
+    parser.add_argument('-p', '--phase', choices=['neutron', 'soldier'],
+                        default='soldier', help='Phase of the turn. Defaults \
+                        to soldier, as in the first turn of the game.')
+    parser.add_argument('-e', '--engine', choices=engines,
+                        default='reference',
+                        help='Engine to count positions with.')
+    parser.add_argument('--check', choices=engines,
+                        help='Engine to cross-check against the reference.')
+    args = parser.parse_args()
+
+    grid = args.grid or NeutronBoard(size=args.size).grid.tolist()
+    color = Color.WHITE if args.color == 'white' else Color.BLACK
+    print(perft(engines[args.engine](grid), args.depth, color, args.phase))
+    if args.check:
+        mismatches = cross_check(engines[args.check], grid, args.depth,
+                                 color, args.phase)
+        for mismatch in mismatches:
+            print(mismatch)
+        print(f'{args.check}: {len(mismatches)} mismatches')
@@ -1,8 +1,13 @@
 from abc import ABC, abstractmethod
+import math
 import random
 import re
-import numpy as np
+import threading
+import time
 
+from bitboard import BitBoard, tables
+from neutron import NeutronBoard, NeutronGame
+from transposition import TranspositionTable
 from util import Vec, Color, directions_abbrev
 
 
@@ -11,6 +16,9 @@ class Player(ABC):
     Abstract base class of all Neutron game players. Defines methods called by
     the game to allow players to make decisions about the next move.
 
+    Players waiting for input, e.g. over the network, may define both methods
+    as coroutines, to be used with :func:`neutron.NeutronGame.play_async`.
+
     Args:
         board (neutron.NeutronBoard):
             board of the game played by this player.
@@ -21,7 +29,7 @@ class Player(ABC):
         self.board = board
         self.color = color
         self.home_row = home_row
-        self.enemy_row = len(self.board.grid) - 1 - self.home_row
+        self.enemy_row = self.board.size - 1 - self.home_row
 
     @abstractmethod
     def move_soldier(self):
@@ -52,54 +60,136 @@ class RandomPlayer(Player):
             for soldier in self.board.get_soldiers(self.color)
             if soldier.possible_directions
         ])
-        soldier.move(random.choice(tuple(soldier.possible_directions)))
+        soldier.move(random.choice(sorted(soldier.possible_directions)))
 
     def move_neutron(self):
         self.board.neutron.move(
-            random.choice(tuple(self.board.neutron.possible_directions))
+            random.choice(sorted(self.board.neutron.possible_directions))
         )
 
 
+class _lazy:
+    """Like :class:`functools.cached_property`, without its lock."""
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+        value = obj.__dict__[self.name] = self.func(obj)
+        return value
+
+
+class TurnAnalysis:
+    """
+    Everything the rules of :class:`StrategyPlayer` look at in one turn,
+    computed at most once, so that a rule costs a few set operations
+    instead of generating moves again.
+
+    Every attribute is computed on first access, so a neutron move doesn't
+    generate soldier moves and vice versa. The analysis is only valid until a
+    piece moves.
+
+    Args:
+        board (neutron.NeutronBoard): board of the game.
+        color (int): color of the soldiers of the player to move.
+        home_row (int): index of that player's home row on board.
+
+    Attributes:
+        soldier_moves (dict):
+            mapping of the player's soldiers which can move to sets of
+            positions they can reach, in the order of
+            :func:`neutron.NeutronBoard.get_soldiers`.
+        neutron_moves (set): positions the neutron can reach.
+        empty_home_row (set): empty positions in the player's home row.
+        empty_enemy_row (set): empty positions in the enemy's home row.
+        neutron_neighbors (set): empty positions neighboring the neutron.
+    """
+    def __init__(self, board, color, home_row):
+        self.board = board
+        self.color = color
+        self.home_row = home_row
+        self.enemy_row = board.size - 1 - home_row
+
+    @_lazy
+    def soldier_moves(self):
+        moves = {}
+        for soldier in self.board.get_soldiers(self.color):
+            reachable = soldier.possible_moves
+            if reachable:
+                moves[soldier] = reachable
+        return moves
+
+    @_lazy
+    def neutron_moves(self):
+        return self.board.neutron.possible_moves
+
+    @_lazy
+    def empty_home_row(self):
+        return self.board.empty_in_row(self.home_row)
+
+    @_lazy
+    def empty_enemy_row(self):
+        return self.board.empty_in_row(self.enemy_row)
+
+    @_lazy
+    def neutron_neighbors(self):
+        return self.board.empty_neighbors(self.board.neutron.pos)
+
+    def reaching(self, positions):
+        """
+        Get the soldiers able to move to any of the given positions.
+
+        Args:
+            positions (set): set of :class:`util.Vec` positions.
+
+        Returns:
+            list:
+                ``(soldier, reachable)`` pairs, where ``reachable`` is the
+                non-empty subset of ``positions`` the soldier can move to.
+        """
+        return [
+            (soldier, moves & positions)
+            for soldier, moves in self.soldier_moves.items()
+            if not moves.isdisjoint(positions)
+        ]
+
+
 class StrategyPlayer(RandomPlayer):
     """
     A player that tries to apply some simple rules to increase its winning
     chance. If no rule can be applied in the current situation, it falls
     back to random movement.
+
+    Every rule takes the :class:`TurnAnalysis` of the current turn, picks
+    its move from it and returns whether it made one, so adding a rule
+    doesn't add move generation.
     """
-    def block_enemy_row(self, soldiers):
+    def block_enemy_row(self, analysis):
         """
         Tries to block an empty spot in enemy's home row by putting one of the
         soldiers in there.
 
         Args:
-            soldiers (list): list of this player's soldiers.
-            enemy_row (int): index of the enemy player's row.
+            analysis (TurnAnalysis): analysis of the current turn.
 
         Returns:
             bool: ``True`` if the move was successful, ``False`` otherwise
         """
-        empty_enemy_pos = {
-            Vec(x, self.enemy_row)
-            for x in range(len(self.board.grid[self.enemy_row]))
-            if self.board.grid[self.enemy_row, x] == 0
-        }
-
-        losing_positions = self.board.neutron.possible_moves & empty_enemy_pos
+        empty_enemy_pos = analysis.empty_enemy_row
+        if not empty_enemy_pos:
+            return False
 
-        eligible_soldiers = [
-            (soldier, soldier.possible_moves & losing_positions)
-            for soldier in soldiers
-            if soldier.possible_moves & losing_positions
-        ]
+        eligible_soldiers = analysis.reaching(
+            analysis.neutron_moves & empty_enemy_pos
+        )
 
         # if there is no empty place the neutron can move immediately to,
         # still try to block some empty enemy row spot.
         if not eligible_soldiers:
-            eligible_soldiers = [
-                (soldier, soldier.possible_moves & empty_enemy_pos)
-                for soldier in soldiers
-                if soldier.possible_moves & empty_enemy_pos
-            ]
+            eligible_soldiers = analysis.reaching(empty_enemy_pos)
 
         if eligible_soldiers:
             soldier, moves = random.choice(eligible_soldiers)
@@ -108,54 +198,41 @@ class StrategyPlayer(RandomPlayer):
 
         return False
 
-    def move_into_home(self):
+    def move_into_home(self, analysis):
         """
         Tries to move the neutron into the home row
 
+        Args:
+            analysis (TurnAnalysis): analysis of the current turn.
+
         Returns:
             bool: ``True`` if the move was successful, ``False`` otherwise
         """
         try:
             self.board.neutron.move_to_pos(next(
                 pos
-                for pos in self.board.neutron.possible_moves
+                for pos in analysis.neutron_moves
                 if pos.y == self.home_row
             ))
             return True
         except StopIteration:
             return False
 
-    def block_neutron(self, soldiers):
+    def block_neutron(self, analysis):
         """
         Tries to completely block neutron from moving, if there's only one
         direction the neutron can move.
 
+        Args:
+            analysis (TurnAnalysis): analysis of the current turn.
+
         Returns:
             bool: ``True`` if the move was successful, ``False`` otherwise
         """
-        y, x = self.board.neutron.pos
-        maxy, maxx = self.board.grid.shape
-
-        # as we find coordinates of empty neighbors in an subarray, we need to
-        # map those coordinates back to global ones.
-        def mapper(t):
-            return Vec.fromtuple(t) + Vec(x - 1, y - 1)
-
-        empty_neighbors = set(map(mapper, zip(*np.where(
-            self.board.grid[
-                max(0, y-1):min(maxy, y+2),
-                max(0, x-1):min(maxx, x+2)
-            ] == 0
-        ))))
-
-        if len(empty_neighbors) != 1:
+        if self.board.neutron_liberties != 1:
             return False
 
-        eligible_soldiers = [
-            (soldier, soldier.possible_moves & empty_neighbors)
-            for soldier in soldiers
-            if soldier.possible_moves & empty_neighbors
-        ]
+        eligible_soldiers = analysis.reaching(analysis.neutron_neighbors)
 
         if eligible_soldiers:
             soldier, moves = random.choice(eligible_soldiers)
@@ -164,10 +241,19 @@ class StrategyPlayer(RandomPlayer):
 
         return False
 
-    def avoid_enemy_row(self):
+    def avoid_enemy_row(self, analysis):
+        """
+        Tries to move the neutron anywhere but the enemy's home row.
+
+        Args:
+            analysis (TurnAnalysis): analysis of the current turn.
+
+        Returns:
+            bool: ``True`` if the move was successful, ``False`` otherwise
+        """
         not_enemy_row = [
             pos
-            for pos in self.board.neutron.possible_moves
+            for pos in analysis.neutron_moves
             if pos.y != self.enemy_row
         ]
 
@@ -177,25 +263,766 @@ class StrategyPlayer(RandomPlayer):
 
         return False
 
+    def analyze(self):
+        """
+        Get the analysis of the current turn, shared by all rules.
+
+        Returns:
+            TurnAnalysis: analysis of the board as it is now.
+        """
+        return TurnAnalysis(self.board, self.color, self.home_row)
+
     def move_soldier(self):
-        soldiers = self.board.get_soldiers(self.color)
+        analysis = self.analyze()
 
-        if self.block_neutron(soldiers):
+        if self.block_neutron(analysis):
             return
-        if self.block_enemy_row(soldiers):
+        if self.block_enemy_row(analysis):
             return
         super().move_soldier()
 
     def move_neutron(self):
-        if self.move_into_home():
+        analysis = self.analyze()
+
+        if self.move_into_home(analysis):
             return
-        if self.avoid_enemy_row():
+        if self.avoid_enemy_row(analysis):
             return
         super().move_neutron()
 
 
+class _SearchTimeout(Exception):
+    pass
+
+
+class _Pondering:
+    """
+    Runs ``target(stop, *args)`` in a daemon thread while the opponent is
+    deciding; ``stop`` is a :class:`threading.Event` the target polls.
+    """
+    def __init__(self, target, *args):
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=target,
+                                        args=(self._stop, *args),
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Asks the target to return and waits until it does."""
+        self._stop.set()
+        self._thread.join()
+
+
+class SearchPlayer(Player):
+    """
+    A player choosing its moves with an alpha-beta search over whole turns,
+    i.e. the neutron move followed by the soldier move.
+
+    The search runs on a :class:`bitboard.BitBoard` copy of the board, using
+    iterative deepening until ``time_budget`` runs out. Moves are ordered with
+    the rules of :class:`StrategyPlayer`: moving the neutron into the home
+    row goes first and into the enemy row last, blocking the neutron or
+    enemy row spots it could reach goes before other soldier moves.
+
+    The soldier move found while searching for the neutron move is played
+    afterwards, unless the board changed in the meantime.
+
+    With ``ponder`` enabled, the player keeps searching in a background
+    thread during the opponent's turn: it goes through the opponent's
+    replies, the one expected by its own search first and then the ones
+    scoring worst for it, and searches the position after each of them.
+    When the opponent plays one of those, the neutron move is played
+    right away.
+
+    Args:
+        board (neutron.NeutronBoard):
+            board of the game played by this player.
+        color (int): color of this player's soldiers.
+        home_row (int): index of this player's home row on board.
+        time_budget (float): wall-clock time of one search, in seconds.
+        max_depth (int): maximum search depth, in half-moves.
+        table_size (int): number of slots of the transposition table.
+        ponder (bool): whether to search during the opponent's turn.
+
+    Attributes:
+        last_search (dict):
+            statistics of the most recent search: depth reached, number of
+            nodes visited, elapsed time, nodes per second, the score,
+            counters of the transposition table and whether it was made
+            while pondering.
+        table (transposition.TranspositionTable):
+            table of positions searched so far, kept between searches.
+    """
+    WIN = 100000
+
+    def __init__(self, board, color, home_row, time_budget=1.0, max_depth=64,
+                 table_size=2 ** 18, ponder=False):
+        super().__init__(board, color, home_row)
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.ponder = ponder
+        self.last_search = {}
+        self._planned = None
+        self.table = TranspositionTable(table_size)
+        self._positions = tables(board.size).squares
+        self._nodes = 0
+        self._deadline = None
+        self._stop = None
+        self._pondering = None
+        self._pondered = {}
+
+    @staticmethod
+    def _squares(mask):
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def _neutron_moves(self, bits, color, hint=None):
+        home_rows = bits.tables.home_rows
+        my_row = home_rows[color]
+        enemy_row = home_rows[Color.opposite(color)]
+        src = bits.neutron_square
+        moves = [(src, dst) for _, dst in bits.moves(src)]
+        # move into home first, avoid the enemy row if possible
+        moves.sort(key=lambda move: -1 if move == hint
+                   else 0 if my_row >> move[1] & 1
+                   else 2 if enemy_row >> move[1] & 1 else 1)
+        return moves
+
+    def _soldier_moves(self, bits, color, hint=None):
+        occupied = bits.occupied
+        neutron = bits.neutron_square
+        enemy_row = bits.tables.home_rows[Color.opposite(color)]
+        empty_neighbors = bits.tables.neighbor_masks[neutron] & ~occupied
+        if empty_neighbors & (empty_neighbors - 1):
+            empty_neighbors = 0
+        losing = 0
+        for _, dst in bits.moves(neutron):
+            losing |= (1 << dst) & enemy_row
+        empty_enemy = enemy_row & ~occupied
+
+        def priority(move):
+            if move == hint:
+                return -1
+            bit = 1 << move[1]
+            if bit & empty_neighbors:
+                return 0
+            if bit & losing:
+                return 1
+            if bit & empty_enemy:
+                return 2
+            return 3
+
+        moves = [
+            (src, dst)
+            for src in self._squares(bits.mask(color))
+            for _, dst in bits.moves(src)
+        ]
+        moves.sort(key=priority)
+        return moves
+
+    def evaluate(self, bits, color, phase):
+        """
+        Static evaluation of a position, from the point of view of the player
+        of color ``color``, who is about to move.
+
+        It rewards the neutron being close to the player's home row and empty
+        spots in the home row, penalizing the same for the opponent's row.
+        A neutron able to reach the home row of the player who moves it next
+        is scored as an almost certain win for that player.
+
+        Args:
+            bits (bitboard.BitBoard): the evaluated position.
+            color (int): color of the player to move.
+            phase (str): ``'neutron'`` or ``'soldier'``.
+
+        Returns:
+            int: the score, higher is better for the player to move.
+        """
+        other = Color.opposite(color)
+        empty = ~bits.occupied
+        neutron = bits.neutron_square
+        size = bits.tables.size
+        home_rows = bits.tables.home_rows
+        row = neutron // size
+        my_row_idx = 0 if color == Color.BLACK else size - 1
+        score = 2 * (abs(row - (size - 1 - my_row_idx))
+                     - abs(row - my_row_idx))
+        score += bin(home_rows[color] & empty).count('1') \
+            - bin(home_rows[other] & empty).count('1')
+        mover = color if phase == 'neutron' else other
+        if any(home_rows[mover] >> dst & 1 for _, dst in bits.moves(neutron)):
+            score += 100 if mover == color else -100
+        return score
+
+    def _negamax(self, bits, color, phase, depth, alpha, beta, ply, pv):
+        self._nodes += 1
+        if not self._nodes & 1023 and (
+            self._deadline is not None
+            and time.perf_counter() > self._deadline
+            or self._stop is not None and self._stop.is_set()
+        ):
+            raise _SearchTimeout()
+        if depth == 0:
+            return self.evaluate(bits, color, phase)
+
+        key = self.table.key(bits.zobrist, color, phase)
+        entry = self.table.get(key)
+        hint = None
+        if entry is not None:
+            entry_depth, score, flag, hint = entry
+            # winning scores are stored relative to the node, not the root
+            if score > self.WIN - self.max_depth:
+                score -= ply
+            elif score < -self.WIN + self.max_depth:
+                score += ply
+            if ply > 0 and entry_depth >= depth and (
+                flag == TranspositionTable.EXACT
+                or flag == TranspositionTable.LOWER and score >= beta
+                or flag == TranspositionTable.UPPER and score <= alpha
+            ):
+                pv[:] = [hint] if hint else []
+                return score
+
+        if phase == 'neutron':
+            moves = self._neutron_moves(bits, color, hint)
+            next_color, next_phase = color, 'soldier'
+        else:
+            moves = self._soldier_moves(bits, color, hint)
+            next_color, next_phase = Color.opposite(color), 'neutron'
+        if not moves:
+            return -self.WIN + ply
+
+        alpha_orig = alpha
+
+        best = -self.WIN - 1
+        child_pv = []
+        for move in moves:
+            bits.move(*move)
+            winner = bits.winner(color)
+            if winner:
+                child_pv.clear()
+                score = self.WIN - ply if winner == color \
+                    else -self.WIN + ply
+            elif next_color == color:
+                score = self._negamax(bits, next_color, next_phase, depth - 1,
+                                      alpha, beta, ply + 1, child_pv)
+            else:
+                score = -self._negamax(bits, next_color, next_phase,
+                                       depth - 1, -beta, -alpha, ply + 1,
+                                       child_pv)
+            bits.move(move[1], move[0])
+            if score > best:
+                best = score
+                pv[:] = [move] + child_pv
+            if best > alpha:
+                alpha = best
+            if alpha >= beta:
+                break
+
+        if best <= alpha_orig:
+            flag = TranspositionTable.UPPER
+        elif best >= beta:
+            flag = TranspositionTable.LOWER
+        else:
+            flag = TranspositionTable.EXACT
+        stored = best
+        if best > self.WIN - self.max_depth:
+            stored += ply
+        elif best < -self.WIN + self.max_depth:
+            stored -= ply
+        self.table.put(key, depth, stored, flag, pv[0])
+        return best
+
+    def search(self, phase):
+        """
+        Searches the current position with iterative deepening until the
+        time budget or maximum depth is reached.
+
+        Args:
+            phase (str):
+                ``'neutron'`` if the turn starts with a neutron move,
+                ``'soldier'`` if only a soldier move is left.
+
+        Returns:
+            list:
+                principal variation, a list of ``(source, destination)``
+                square pairs starting with the move to make now.
+        """
+        pv, self.last_search = self._search(
+            BitBoard.from_cells(self.board.cells, self.board.size), phase
+        )
+        return pv
+
+    def _search(self, bits, phase, stop=None):
+        start = time.perf_counter()
+        self._nodes = 0
+        self._stop = stop
+        # the first iteration always completes, so there is a move to play
+        self._deadline = None
+        self.table.new_search()
+        # the table counts across searches, the stats are for this one only
+        hits, misses = self.table.hits, self.table.misses
+        evictions = self.table.evictions
+        best_pv, depth_reached, best_score = [], 0, 0
+        for depth in range(1, self.max_depth + 1):
+            pv = []
+            try:
+                score = self._negamax(bits, self.color, phase, depth,
+                                      -self.WIN - 1, self.WIN + 1, 0, pv)
+            except _SearchTimeout:
+                break
+            best_pv, depth_reached, best_score = pv, depth, score
+            if abs(score) >= self.WIN - self.max_depth:
+                break
+            self._deadline = start + self.time_budget
+            if time.perf_counter() > self._deadline:
+                break
+        elapsed = time.perf_counter() - start
+        return best_pv, {
+            'depth': depth_reached,
+            'nodes': self._nodes,
+            'elapsed': elapsed,
+            'nodes_per_second': self._nodes / elapsed if elapsed else 0.0,
+            'score': best_score,
+            'table_hits': self.table.hits - hits,
+            'table_misses': self.table.misses - misses,
+            'table_evictions': self.table.evictions - evictions,
+            'pondered': False,
+        }
+
+    def _replies(self, bits, expected):
+        # whole turns of the opponent which don't end the game, the one our
+        # search expects first, then the ones worst for us
+        other = Color.opposite(self.color)
+        replies = []
+        for neutron_move in self._neutron_moves(bits, other):
+            bits.move(*neutron_move)
+            if not bits.winner(other):
+                for soldier_move in self._soldier_moves(bits, other):
+                    bits.move(*soldier_move)
+                    if not bits.winner(other):
+                        reply = neutron_move, soldier_move
+                        replies.append((
+                            reply != expected,
+                            self.evaluate(bits, self.color, 'neutron'),
+                            reply,
+                        ))
+                    bits.move(soldier_move[1], soldier_move[0])
+            bits.move(neutron_move[1], neutron_move[0])
+        replies.sort(key=lambda reply: reply[:2])
+        return [reply for _, _, reply in replies]
+
+    def _ponder(self, stop, bits, expected):
+        for neutron_move, soldier_move in self._replies(bits, expected):
+            after = bits.copy()
+            after.move(*neutron_move)
+            after.move(*soldier_move)
+            result = self._search(after, 'neutron', stop)
+            if stop.is_set():
+                break
+            self._pondered[after.white, after.black, after.neutron] = result
+
+    def _start_pondering(self, expected):
+        if self.ponder and not self.board.winner(self.color):
+            self._pondered = {}
+            self._pondering = _Pondering(
+                self._ponder,
+                BitBoard.from_cells(self.board.cells, self.board.size),
+                tuple(expected) if len(expected) == 2 else None
+            )
+
+    def _stop_pondering(self):
+        if self._pondering is not None:
+            self._pondering.stop()
+            self._pondering = None
+
+    def close(self):
+        """Stops pondering, if the player is pondering."""
+        self._stop_pondering()
+
+    def move_neutron(self):
+        self._stop_pondering()
+        bits = BitBoard.from_cells(self.board.cells, self.board.size)
+        pondered = self._pondered.pop((bits.white, bits.black, bits.neutron),
+                                      None)
+        self._pondered = {}
+        if pondered is not None:
+            pv, stats = pondered
+            self.last_search = dict(stats, pondered=True)
+        else:
+            pv = self.search('neutron')
+        self.board.neutron.move_to_pos(self._positions[pv[0][1]])
+        self._planned = (self.board.cells.tobytes(), pv[1:]) \
+            if len(pv) > 1 else None
+
+    def move_soldier(self):
+        self._stop_pondering()
+        planned, self._planned = self._planned, None
+        if planned and planned[0] == self.board.cells.tobytes():
+            pv = planned[1]
+        else:
+            pv = self.search('soldier')
+        src, dst = pv[0]
+        soldier = next(
+            soldier
+            for soldier in self.board.get_soldiers(self.color)
+            if soldier.pos == self._positions[src]
+        )
+        soldier.move_to_pos(self._positions[dst])
+        self._start_pondering(pv[1:3])
+
+
+def _rollout(white, black, neutron, size, color, phase, policy, max_rounds):
+    """
+    Plays a game from a given position to the end with both sides controlled
+    by ``policy``. Runs in worker threads or processes of
+    :class:`MCTSPlayer`.
+
+    Returns:
+        int: the winning color, or ``None`` if the game was abandoned.
+    """
+    board = NeutronBoard(
+        BitBoard(white, black, neutron, size=size).to_grid()
+    )
+    last_row = board.size - 1
+    other = Color.opposite(color)
+    players = {
+        Color.WHITE: policy(board, Color.WHITE, last_row),
+        Color.BLACK: policy(board, Color.BLACK, 0),
+    }
+    game = NeutronGame(board, players[color], players[other], verbose=False,
+                       phase=phase)
+    for _ in range(2 * max_rounds):
+        # a player unable to move a soldier loses the game, like in the tree
+        mover = game.current_player.color
+        if game.phase == 'soldier' and not any(
+            board.legal_moves(soldier.pos)
+            for soldier in board.get_soldiers(mover)
+        ):
+            return Color.opposite(mover)
+        if game.step():
+            break
+    return game.winner
+
+
+def _seed_worker():
+    # forked workers inherit the parent's random state
+    random.seed()
+
+
+class _Node:
+    """A node of the :class:`MCTSPlayer` search tree."""
+    __slots__ = ('bits', 'color', 'phase', 'mover', 'move', 'parent',
+                 'children', 'untried', 'visits', 'wins', 'winner')
+
+    def __init__(self, bits, color, phase, mover=None, move=None,
+                 parent=None):
+        self.bits = bits
+        self.color = color
+        self.phase = phase
+        self.mover = mover
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.visits = 0
+        self.wins = 0.0
+        self.winner = bits.winner(mover) if mover else None
+        if self.winner:
+            self.untried = []
+        elif phase == 'neutron':
+            src = bits.neutron_square
+            self.untried = [(src, dst) for _, dst in bits.moves(src)]
+        else:
+            mask = bits.mask(color)
+            self.untried = []
+            while mask:
+                low = mask & -mask
+                src = low.bit_length() - 1
+                self.untried.extend((src, dst) for _, dst in bits.moves(src))
+                mask ^= low
+            if not self.untried:
+                # a player unable to move a soldier loses the game
+                self.winner = Color.opposite(color)
+
+    def expand(self):
+        move = self.untried.pop(random.randrange(len(self.untried)))
+        bits = self.bits.copy()
+        bits.move(*move)
+        if self.phase == 'neutron':
+            color, phase = self.color, 'soldier'
+        else:
+            color, phase = Color.opposite(self.color), 'neutron'
+        child = _Node(bits, color, phase, self.color, move, self)
+        self.children.append(child)
+        return child
+
+    def matches(self, bits, color, phase):
+        return self.color == color and self.phase == phase \
+            and self.bits.white == bits.white \
+            and self.bits.black == bits.black \
+            and self.bits.neutron == bits.neutron
+
+
+class MCTSPlayer(Player):
+    """
+    A player choosing its moves with Monte Carlo Tree Search, using the UCT
+    formula to balance exploring new moves and exploiting good ones.
+
+    Each half-move (the neutron move or the soldier move) is a separate level
+    of the tree. New positions are evaluated with rollouts: games played to
+    the end by two ``policy`` players. Rollouts are run in batches, ``workers``
+    at a time, in a thread or process pool; paths to the batch's leaves get a
+    virtual loss during selection, so the batch spreads over the tree.
+
+    The tree is kept between turns: if the position after the opponent's
+    reply is already in the tree, the search continues from it.
+
+    With ``ponder`` enabled, the player keeps growing the tree in a
+    background thread during the opponent's turn: first from the position
+    the opponent moves in, which shows the likely replies, then from the
+    position after each reply, the most visited first and the ones never
+    visited last, with the same iteration and time limits as a move search.
+    When the opponent plays one of those, its move is picked from the
+    pondered subtree without searching any further.
+
+    Args:
+        board (neutron.NeutronBoard):
+            board of the game played by this player.
+        color (int): color of this player's soldiers.
+        home_row (int): index of this player's home row on board.
+        iterations (int):
+            maximum number of rollouts per move, ``None`` for no limit.
+        time_budget (float):
+            wall-clock time of one search, in seconds, ``None`` for no limit.
+        policy: :class:`Player` subclass playing the rollouts.
+        workers (int): number of rollouts run in parallel.
+        executor (str):
+            ``'thread'`` or ``'process'``, the kind of pool running rollouts
+            when ``workers`` is greater than one.
+        exploration (float): exploration constant of the UCT formula.
+        max_rounds (int): number of rounds after which a rollout is a draw.
+        ponder (bool): whether to search during the opponent's turn.
+
+    Attributes:
+        last_search (dict):
+            statistics of the most recent search: number of rollouts, elapsed
+            time, rollouts per second, whether the tree was reused and
+            whether the search was made while pondering.
+    """
+    def __init__(self, board, color, home_row, iterations=1000,
+                 time_budget=None, policy=RandomPlayer, workers=1,
+                 executor='thread', exploration=1.4, max_rounds=200,
+                 ponder=False):
+        super().__init__(board, color, home_row)
+        if iterations is None and time_budget is None:
+            raise ValueError('either iterations or time_budget is required')
+        if executor not in ('thread', 'process'):
+            raise ValueError(f'invalid executor: {executor}')
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.policy = policy
+        self.workers = workers
+        self.executor = executor
+        self.exploration = exploration
+        self.max_rounds = max_rounds
+        self.ponder = ponder
+        self.last_search = {}
+        self._positions = tables(board.size).squares
+        self._root = None
+        self._pool = None
+        self._pondering = None
+        self._pondered = set()
+
+    def close(self):
+        """
+        Stops pondering, and shuts down the pool running rollouts, if one
+        was started.
+        """
+        self._stop_pondering()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _find_root(self, bits, phase):
+        # the current position is at most four half-moves below the root
+        # left by the previous move: our soldier move and the opponent's turn
+        level = [self._root] if self._root else []
+        for _ in range(5):
+            for node in level:
+                if node.matches(bits, self.color, phase):
+                    node.parent = None
+                    node.move = None
+                    return node, True
+            level = [child for node in level for child in node.children]
+        return _Node(bits, self.color, phase), False
+
+    def _select(self, node):
+        path = [node]
+        node.visits += 1
+        while not node.winner:
+            if node.untried:
+                node = node.expand()
+            else:
+                log_visits = math.log(node.visits)
+                node = max(node.children, key=lambda child: (
+                    child.wins / child.visits
+                    + self.exploration
+                    * math.sqrt(log_visits / child.visits)
+                ))
+            node.visits += 1
+            path.append(node)
+            if node.visits == 1:
+                break
+        return path
+
+    def _run_rollouts(self, leaves):
+        args = [
+            (leaf.bits.white, leaf.bits.black, leaf.bits.neutron,
+             leaf.bits.tables.size, leaf.color, leaf.phase, self.policy,
+             self.max_rounds)
+            for leaf in leaves
+        ]
+        if self.workers <= 1:
+            return [_rollout(*arg) for arg in args]
+        if self._pool is None:
+            # imported on demand, it takes a good part of the startup time
+            from concurrent.futures import ThreadPoolExecutor, \
+                ProcessPoolExecutor
+            if self.executor == 'thread':
+                self._pool = ThreadPoolExecutor(self.workers)
+            else:
+                self._pool = ProcessPoolExecutor(self.workers,
+                                                 initializer=_seed_worker)
+        return list(self._pool.map(_rollout, *zip(*args)))
+
+    def search(self, phase):
+        """
+        Runs the search from the current position until the iteration or
+        time limit is reached.
+
+        Args:
+            phase (str):
+                ``'neutron'`` if the turn starts with a neutron move,
+                ``'soldier'`` if only a soldier move is left.
+
+        Returns:
+            tuple:
+                the best move, as a ``(source, destination)`` square pair, or
+                ``None`` if the game is over in the current position, e.g.
+                because the player cannot move any soldier.
+        """
+        start = time.perf_counter()
+        bits = BitBoard.from_cells(self.board.cells, self.board.size)
+        root, reused = self._find_root(bits, phase)
+        pondered = root in self._pondered
+        self._pondered = set()
+        rollouts = 0 if pondered or root.winner else self._grow(root)
+
+        best = None
+        if root.children:
+            best = max(root.children, key=lambda child: child.visits)
+            best.parent = None
+        self._root = best
+        elapsed = time.perf_counter() - start
+        self.last_search = {
+            'rollouts': rollouts,
+            'elapsed': elapsed,
+            'rollouts_per_second': rollouts / elapsed if elapsed else 0.0,
+            'reused': reused,
+            'pondered': pondered,
+        }
+        return best.move if best is not None else None
+
+    def _grow(self, root, stop=None):
+        start = time.perf_counter()
+        rollouts = 0
+        while True:
+            batch = self.workers
+            if self.iterations is not None:
+                batch = min(batch, self.iterations - rollouts)
+            paths = [self._select(root) for _ in range(batch)]
+            pending = [path for path in paths if not path[-1].winner]
+            results = dict(zip(
+                map(id, pending),
+                self._run_rollouts([path[-1] for path in pending])
+            ))
+            for path in paths:
+                winner = path[-1].winner or results[id(path)]
+                for node in path:
+                    if winner is None:
+                        node.wins += 0.5
+                    elif winner == node.mover:
+                        node.wins += 1
+            rollouts += batch
+            if self.iterations is not None and rollouts >= self.iterations:
+                break
+            if self.time_budget is not None \
+                    and time.perf_counter() - start > self.time_budget:
+                break
+            if stop is not None and stop.is_set():
+                break
+        return rollouts
+
+    def _ponder(self, stop, root):
+        self._grow(root, stop)
+        while not stop.is_set():
+            replies = [
+                node
+                for child in root.children
+                for node in child.children
+                if not node.winner and node not in self._pondered
+            ]
+            if replies:
+                node = max(replies,
+                           key=lambda node: (node.parent.visits, node.visits))
+                self._grow(node, stop)
+                if not stop.is_set():
+                    self._pondered.add(node)
+                continue
+            # replies the search never tried come last, they are only
+            # expanded, never selected from, so unvisited nodes are fine
+            unexplored = [node for node in (root, *root.children)
+                          if node.untried]
+            if not unexplored:
+                break
+            for node in unexplored:
+                while node.untried:
+                    node.expand()
+
+    def _start_pondering(self):
+        if self.ponder and self._root is not None and not self._root.winner:
+            self._pondering = _Pondering(self._ponder, self._root)
+
+    def _stop_pondering(self):
+        if self._pondering is not None:
+            self._pondering.stop()
+            self._pondering = None
+
+    def move_neutron(self):
+        self._stop_pondering()
+        move = self.search('neutron')
+        if move is not None:
+            self.board.neutron.move_to_pos(self._positions[move[1]])
+
+    def move_soldier(self):
+        self._stop_pondering()
+        move = self.search('soldier')
+        if move is None:
+            return
+        src, dst = move
+        soldier = next(
+            soldier
+            for soldier in self.board.get_soldiers(self.color)
+            if soldier.pos == self._positions[src]
+        )
+        soldier.move_to_pos(self._positions[dst])
+        self._start_pondering()
+
+
 class HumanPlayer(Player):
-    _pattern = re.compile(r'([ABCDE])([12345])')
+    _pattern = re.compile(r'([A-Z])([1-9][0-9]*)')
 
     def __init__(self, board, color, home_row):
         super().__init__(board, color, home_row)
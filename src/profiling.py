@@ -0,0 +1,212 @@
+import functools
+import inspect
+import marshal
+import time
+
+from neutron import NeutronBoard, NeutronGame, Soldier
+from player import Player, StrategyPlayer
+
+STRATEGY_RULES = ('block_neutron', 'block_enemy_row', 'move_into_home',
+                  'avoid_enemy_row')
+"""
+Rule methods of :class:`player.StrategyPlayer` whose outcomes are counted.
+"""
+
+
+def _subclasses(cls):
+    yield cls
+    for subclass in cls.__subclasses__():
+        yield from _subclasses(subclass)
+
+
+class Profiler:
+    """
+    Opt-in instrumentation of the game's hot paths.
+
+    While a profiler is active, it counts calls to and measures time spent in
+    :func:`neutron.NeutronBoard.furthest_empty_spot`,
+    :func:`neutron.NeutronBoard.neighbors` and
+    :attr:`neutron.Soldier.possible_moves` (and overrides of them in
+    subclasses), in players' ``move_soldier`` and ``move_neutron``, and in
+    :func:`neutron.NeutronGame.step`, separately for each phase. It also
+    counts how often every rule of :class:`player.StrategyPlayer` was tried
+    and how often it fired.
+
+    The instrumented methods are wrapped when the profiler is entered and
+    restored when it exits, so there is no overhead at all while no profiler
+    is active::
+
+        with Profiler() as profiler:
+            game.start()
+        print(profiler)
+
+    Timings are labeled with the class of the instance, e.g.
+    ``BitboardNeutronBoard.neighbors``. A method calling itself, or its
+    overridden version through ``super()``, is only counted once. The
+    profiler is meant for a single thread; only one can be active at a time.
+
+    Attributes:
+        timings (dict):
+            mapping of labels to ``[calls, seconds]`` lists.
+        rules (dict):
+            mapping of :data:`STRATEGY_RULES` to ``[tried, fired]`` lists.
+    """
+    _active = False
+
+    def __init__(self):
+        self.timings = {}
+        self.rules = {rule: [0, 0] for rule in STRATEGY_RULES}
+        self._running = set()
+        self._originals = []
+
+    def _timed(self, name, func):
+        timings = self.timings
+        running = self._running
+
+        @functools.wraps(func)
+        def wrapper(obj, *args, **kwargs):
+            label = f'{type(obj).__name__}.{name}'
+            if label in running:
+                return func(obj, *args, **kwargs)
+            running.add(label)
+            start = time.perf_counter()
+            try:
+                return func(obj, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                running.discard(label)
+                entry = timings.get(label)
+                if entry is None:
+                    timings[label] = [1, elapsed]
+                else:
+                    entry[0] += 1
+                    entry[1] += elapsed
+        return wrapper
+
+    def _timed_step(self, func):
+        timed = {
+            phase: self._timed(f'step[{phase}]', func)
+            for phase in ('neutron', 'soldier')
+        }
+
+        @functools.wraps(func)
+        def wrapper(game):
+            return timed[game.phase](game)
+        return wrapper
+
+    def _counted(self, rule, func):
+        counts = self.rules[rule]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            counts[0] += 1
+            fired = func(*args, **kwargs)
+            if fired:
+                counts[1] += 1
+            return fired
+        return wrapper
+
+    def _patch(self, cls, name, wrapper):
+        original = cls.__dict__[name]
+        self._originals.append((cls, name, original))
+        if isinstance(original, property):
+            setattr(cls, name, property(wrapper(original.fget)))
+        else:
+            setattr(cls, name, wrapper(original))
+
+    def _targets(self):
+        for cls in _subclasses(NeutronBoard):
+            for name in ('furthest_empty_spot', 'neighbors'):
+                if name in cls.__dict__:
+                    yield cls, name, functools.partial(self._timed, name)
+        for cls in _subclasses(Soldier):
+            if 'possible_moves' in cls.__dict__:
+                yield cls, 'possible_moves', \
+                    functools.partial(self._timed, 'possible_moves')
+        for cls in _subclasses(Player):
+            for name in ('move_soldier', 'move_neutron'):
+                # coroutines are left alone, the game awaits them as such
+                if name in cls.__dict__ and \
+                        not inspect.iscoroutinefunction(cls.__dict__[name]):
+                    yield cls, name, functools.partial(self._timed, name)
+        for cls in _subclasses(StrategyPlayer):
+            for rule in STRATEGY_RULES:
+                if rule in cls.__dict__:
+                    yield cls, rule, functools.partial(self._counted, rule)
+        yield NeutronGame, 'step', self._timed_step
+
+    def start(self):
+        """Starts collecting data, instrumenting all hot paths."""
+        if Profiler._active:
+            raise RuntimeError('another profiler is already active')
+        Profiler._active = True
+        for cls, name, wrapper in self._targets():
+            self._patch(cls, name, wrapper)
+
+    def stop(self):
+        """Stops collecting data, restoring all instrumented methods."""
+        while self._originals:
+            cls, name, original = self._originals.pop()
+            setattr(cls, name, original)
+        Profiler._active = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def report(self):
+        """
+        Get the collected data.
+
+        Returns:
+            dict:
+                ``'timings'`` maps labels to dictionaries with the number of
+                calls, total and mean time in seconds; ``'rules'`` maps
+                :class:`player.StrategyPlayer` rules to the number of times
+                they were tried and fired.
+        """
+        return {
+            'timings': {
+                label: {
+                    'calls': calls,
+                    'total': total,
+                    'mean': total / calls,
+                }
+                for label, (calls, total) in sorted(self.timings.items())
+            },
+            'rules': {
+                rule: {'tried': tried, 'fired': fired}
+                for rule, (tried, fired) in self.rules.items()
+            },
+        }
+
+    def dump_stats(self, path):
+        """
+        Writes the timings to a file readable by :class:`pstats.Stats`, the
+        same way :func:`cProfile.Profile.dump_stats` does. Every label
+        becomes a function entry without callers.
+
+        Args:
+            path (str): path of the file.
+        """
+        stats = {
+            ('profiling', 0, label): (calls, calls, total, total, {})
+            for label, (calls, total) in self.timings.items()
+        }
+        with open(path, 'wb') as file:
+            marshal.dump(stats, file)
+
+    def __str__(self):
+        lines = [f'{"":40} {"calls":>10} {"total s":>10} {"mean us":>10}']
+        for label, entry in self.report()['timings'].items():
+            lines.append(f'{label:40} {entry["calls"]:10} '
+                         f'{entry["total"]:10.3f} '
+                         f'{entry["mean"] * 1e6:10.1f}')
+        lines.append(f'{"StrategyPlayer rule":40} {"tried":>10} '
+                     f'{"fired":>10}')
+        for rule, (tried, fired) in self.rules.items():
+            lines.append(f'{rule:40} {tried:10} {fired:10}')
+        return '\n'.join(lines)
@@ -0,0 +1,263 @@
+import mmap
+import os
+import struct
+
+from bitboard import BitBoard, SIZE, SQUARES, square
+from neutron import NeutronBoard
+from util import Color
+
+_FILE_HEADER = struct.Struct('<4sHH')
+_MAGIC = b'NREC'
+_VERSION = 1
+_MAX_NAMES = 255
+_NAME_SIZE = 32
+_NAMES_SIZE = _MAX_NAMES * _NAME_SIZE
+_DATA_OFFSET = _FILE_HEADER.size + _NAMES_SIZE
+_RECORD_HEADER = struct.Struct('<QBBBBH')
+
+
+class GameRecord:
+    """
+    A record of one game.
+
+    Moves are kept in their encoded form: two bytes per half-move, the
+    source and the destination square number (``y * 5 + x``), in the order
+    they were played.
+
+    Args:
+        grid (int): starting grid, packed by :func:`bitboard.BitBoard.key`.
+        first (int): color of the player who started the game.
+        winner (int): winning color, 0 if the game was abandoned.
+        white (str): name of the player controlling white soldiers.
+        black (str): name of the player controlling black soldiers.
+        moves (bytes): encoded moves.
+    """
+    __slots__ = 'grid', 'first', 'winner', 'white', 'black', 'moves'
+
+    def __init__(self, grid, first, winner, white, black, moves):
+        self.grid = grid
+        self.first = first
+        self.winner = winner
+        self.white = white
+        self.black = black
+        self.moves = moves
+
+    def __len__(self):
+        return len(self.moves) // 2
+
+    def __iter__(self):
+        """Iterates over moves as ``(source, destination)`` positions."""
+        moves = self.moves
+        for idx in range(0, len(moves), 2):
+            yield SQUARES[moves[idx]], SQUARES[moves[idx + 1]]
+
+    def start_grid(self):
+        """
+        Unpacks the starting grid.
+
+        Returns:
+            list: 5x5 nested list of cell values.
+        """
+        return BitBoard.from_key(self.grid)[0].to_grid()
+
+    def replay(self, upto=None, board_factory=NeutronBoard):
+        """
+        Replays the game on a new board, validating every move.
+
+        Args:
+            upto (int): number of half-moves to replay, all if ``None``.
+            board_factory: callable creating a board from a starting grid.
+
+        Returns:
+            neutron.NeutronBoard: the board after the replayed moves.
+
+        Raises:
+            ValueError: if a recorded move is not legal.
+        """
+        board = board_factory(self.start_grid())
+        for idx, (src, dst) in enumerate(self):
+            if upto is not None and idx >= upto:
+                break
+            pieces = [board.neutron] + board.white_soldiers \
+                + board.black_soldiers
+            piece = next((piece for piece in pieces if piece.pos == src),
+                         None)
+            if piece is None:
+                raise ValueError(f'no piece to move at {src}')
+            piece.move_to_pos(dst)
+        return board
+
+
+class GameRecorder:
+    """
+    Collects moves of a :class:`neutron.NeutronGame` into a
+    :class:`GameRecord`, passed to ``sink`` when the game ends.
+
+    Args:
+        sink: callable receiving finished records, e.g.
+            :func:`GameWriter.write` or ``list.append``.
+    """
+    def __init__(self, sink):
+        self.sink = sink
+        self._record = None
+        self._moves = None
+
+    def begin(self, board, first_player, second_player):
+        """
+        Called by the game when it is created.
+
+        Raises:
+            ValueError: if the board is not of the default size, which is the
+                only one records can hold.
+        """
+        if board.size != SIZE:
+            raise ValueError(f'only {SIZE}x{SIZE} games can be recorded')
+        names = {
+            player.color: type(player).__name__
+            for player in (first_player, second_player)
+        }
+        self._record = GameRecord(
+            BitBoard.from_cells(board.cells).key(Color.WHITE, 'neutron'),
+            first_player.color, 0, names[Color.WHITE], names[Color.BLACK],
+            None
+        )
+        self._moves = bytearray()
+
+    def record(self, src, dst):
+        """Called by the game after every half-move."""
+        self._moves.append(square(src))
+        self._moves.append(square(dst))
+
+    def end(self, winner=0):
+        """
+        Called by the game when it is won. Call it with no winner to record
+        an abandoned game.
+        """
+        if self._record is None:
+            return
+        record, self._record = self._record, None
+        record.winner = winner or 0
+        record.moves = bytes(self._moves)
+        self.sink(record)
+
+
+class GameWriter:
+    """
+    Appends :class:`GameRecord` objects to a file.
+
+    The file starts with a header holding a table of player names. Every
+    record follows as a fixed-size header (starting grid, first color,
+    winner, indices of both players' names, number of moves) and the moves,
+    two bytes each. Player names are cut to 32 bytes.
+
+    Args:
+        path (str): path of the file, created if it doesn't exist.
+    """
+    def __init__(self, path):
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self._file = open(path, 'r+b' if exists else 'w+b')
+        if exists:
+            self.names = _read_names(self._file.read(_DATA_OFFSET), path)
+        else:
+            self.names = []
+            self._write_names()
+        self._ids = {name: idx for idx, name in enumerate(self.names)}
+        self._file.seek(0, os.SEEK_END)
+
+    def _write_names(self):
+        self._file.seek(0)
+        self._file.write(_FILE_HEADER.pack(_MAGIC, _VERSION, len(self.names)))
+        self._file.write(b''.join(
+            name.encode().ljust(_NAME_SIZE, b'\0')
+            for name in self.names
+        ).ljust(_NAMES_SIZE, b'\0'))
+
+    def _name_id(self, name):
+        # shortened to what the slot holds, as it reads back after reopening,
+        # without splitting a multi-byte character
+        name = name.encode()[:_NAME_SIZE].decode(errors='ignore')
+        if name not in self._ids:
+            if len(self.names) == _MAX_NAMES:
+                raise ValueError('too many player names')
+            self._ids[name] = len(self.names)
+            self.names.append(name)
+            self._write_names()
+            self._file.seek(0, os.SEEK_END)
+        return self._ids[name]
+
+    def write(self, record):
+        """
+        Appends a record to the file.
+
+        Args:
+            record (GameRecord): the record.
+        """
+        white, black = self._name_id(record.white), self._name_id(record.black)
+        self._file.write(_RECORD_HEADER.pack(
+            record.grid, record.first, record.winner, white, black,
+            len(record)
+        ))
+        self._file.write(record.moves)
+
+    def recorder(self):
+        """Returns a :class:`GameRecorder` writing to this file."""
+        return GameRecorder(self.write)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _read_names(header, path):
+    magic, version, count = _FILE_HEADER.unpack_from(header)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f'{path} is not a game record file')
+    names = header[_FILE_HEADER.size:_DATA_OFFSET]
+    return [
+        bytes(names[idx * _NAME_SIZE:(idx + 1) * _NAME_SIZE])
+        .rstrip(b'\0').decode()
+        for idx in range(count)
+    ]
+
+
+class GameReader:
+    """
+    Iterates over records of a file written by :class:`GameWriter`.
+
+    The file is memory-mapped and records are decoded one at a time as the
+    iteration proceeds, so files of any size can be read in constant memory.
+
+    Args:
+        path (str): path of the file.
+    """
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.names = _read_names(self._mmap[:_DATA_OFFSET], path)
+
+    def __iter__(self):
+        data = self._mmap
+        names = self.names
+        offset = _DATA_OFFSET
+        end = len(data)
+        while offset < end:
+            grid, first, winner, white, black, count = \
+                _RECORD_HEADER.unpack_from(data, offset)
+            offset += _RECORD_HEADER.size
+            yield GameRecord(grid, first, winner, names[white], names[black],
+                             data[offset:offset + 2 * count])
+            offset += 2 * count
+
+    def close(self):
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
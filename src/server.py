@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+
+from argparse import ArgumentParser
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import json
+import re
+
+from neutron import BOARD_SIZE, NeutronBoard, NeutronGame
+from player import Player
+from simulate import player_types
+from util import Vec, Color
+
+_position_pattern = re.compile(r'([A-Z])([1-9][0-9]*)')
+_colors = {name: color for color, name in Color.color_names.items()}
+
+
+def format_position(pos):
+    """
+    Formats a position the way it is shown on the printed board, e.g. ``A1``.
+
+    Args:
+        pos (util.Vec): the position.
+
+    Returns:
+        str: row letter followed by column number.
+    """
+    return f'{chr(ord("A") + pos.y)}{pos.x + 1}'
+
+
+def parse_position(text):
+    """
+    Parses a position formatted by :func:`format_position`.
+
+    Args:
+        text (str): the formatted position.
+
+    Returns:
+        util.Vec: the position.
+
+    Raises:
+        ValueError: if the text is not a valid position.
+    """
+    match = _position_pattern.fullmatch(str(text).strip().upper())
+    if not match:
+        raise ValueError(f'{text} cannot be interpreted as position')
+    return Vec(int(match.group(2)) - 1, ord(match.group(1)) - ord('A'))
+
+
+def grid_rows(board):
+    """
+    Get the grid of a board as rows of cell values, without creating the
+    NumPy :attr:`neutron.NeutronBoard.grid` view, so serving games doesn't
+    import NumPy.
+
+    Args:
+        board (neutron.NeutronBoard): the board.
+
+    Returns:
+        list: list of rows, each a list of ints.
+    """
+    cells, size = board.cells, board.size
+    return [cells[start:start + size].tolist()
+            for start in range(0, size * size, size)]
+
+
+async def send_message(writer, message):
+    """
+    Sends a message: a JSON object on a single line.
+
+    Args:
+        writer (asyncio.StreamWriter): stream to write to.
+        message (dict): the message.
+    """
+    writer.write(json.dumps(message).encode() + b'\n')
+    await writer.drain()
+
+
+async def receive_message(reader):
+    """
+    Receives a message sent by :func:`send_message`.
+
+    Args:
+        reader (asyncio.StreamReader): stream to read from.
+
+    Returns:
+        dict: the message.
+
+    Raises:
+        ConnectionError: if the stream was closed.
+        ValueError: if the line is not a JSON object.
+    """
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError('connection closed')
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        raise ValueError('a message has to be a JSON object')
+    return message
+
+
+class RemotePlayer(Player):
+    """
+    A player whose decisions come from a client of :class:`GameServer`.
+
+    Its move methods are coroutines: every turn, the player sends the client
+    a ``turn`` message with the grid and all legal moves, then waits for a
+    ``move`` message naming one of them, answering anything else with an
+    ``error`` message. Other games keep running in the meantime.
+
+    Args:
+        board (neutron.NeutronBoard):
+            board of the game played by this player.
+        color (int): color of this player's soldiers.
+        home_row (int): index of this player's home row on board.
+        reader (asyncio.StreamReader): stream of the client's messages.
+        writer (asyncio.StreamWriter): stream of messages to the client.
+    """
+    def __init__(self, board, color, home_row, reader, writer):
+        super().__init__(board, color, home_row)
+        self.reader = reader
+        self.writer = writer
+
+    async def _move(self, pieces, phase):
+        moves = {
+            (format_position(piece.pos), format_position(dst)): (piece, dst)
+            for piece in pieces
+            for dst in piece.possible_moves
+        }
+        await send_message(self.writer, {
+            'type': 'turn',
+            'phase': phase,
+            'grid': grid_rows(self.board),
+            'moves': sorted(moves),
+        })
+        while True:
+            try:
+                message = await receive_message(self.reader)
+            except ValueError as error:
+                await send_message(self.writer,
+                                   {'type': 'error', 'message': str(error)})
+                continue
+            if message.get('type') != 'move':
+                error = f'expected a move, got {message.get("type")}'
+            else:
+                src, dst = message.get('from'), message.get('to')
+                if src is None and phase == 'neutron':
+                    src = format_position(self.board.neutron.pos)
+                # anything but strings, e.g. lists, couldn't even be looked up
+                move = moves.get((src, dst)) \
+                    if isinstance(src, str) and isinstance(dst, str) else None
+                if move is not None:
+                    piece, dst = move
+                    piece.move_to_pos(dst)
+                    return
+                error = 'illegal move'
+            await send_message(self.writer,
+                               {'type': 'error', 'message': error})
+
+    async def move_soldier(self):
+        await self._move(self.board.get_soldiers(self.color), 'soldier')
+
+    async def move_neutron(self):
+        await self._move([self.board.neutron], 'neutron')
+
+
+class GameServer:
+    """
+    Hosts games between remote clients and computer players, any number of
+    them at once, on a single asyncio event loop.
+
+    Every connection plays one game, speaking a line-based protocol of JSON
+    objects. The client opens with::
+
+        {"type": "new", "color": "black", "opponent": "strategy",
+         "first": "human"}
+
+    where every field is optional, with the defaults of the ``main`` module.
+    The server answers with a ``start`` message, then sends a ``turn``
+    message whenever it's the client's move (see :class:`RemotePlayer`),
+    expecting ``{"type": "move", "from": "E1", "to": "D1"}`` in return, and
+    finally an ``end`` message with the winner, ``null`` if the game was
+    abandoned after ``max_rounds`` rounds.
+
+    Computer players' moves run in an executor, so that searching for one
+    doesn't stall other games.
+
+    Args:
+        host (str): address to listen on.
+        port (int): port to listen on, 0 to pick any free one.
+        executor (concurrent.futures.Executor):
+            executor of computer players' moves. Defaults to a
+            :class:`concurrent.futures.ThreadPoolExecutor`.
+        board_factory: callable creating the board of every game.
+        max_rounds (int):
+            number of rounds after which a game is abandoned as unfinished.
+
+    Attributes:
+        games (int): number of games being played.
+    """
+    def __init__(self, host='127.0.0.1', port=7805, executor=None,
+                 board_factory=NeutronBoard, max_rounds=500):
+        self.host = host
+        self.port = port
+        self.executor = executor or ThreadPoolExecutor()
+        self.board_factory = board_factory
+        self.max_rounds = max_rounds
+        self.games = 0
+        self._server = None
+
+    async def start(self):
+        """
+        Starts listening for connections.
+
+        Returns:
+            GameServer: this server.
+        """
+        self._server = await asyncio.start_server(self._handle, self.host,
+                                                  self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        """Accepts connections until cancelled."""
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Stops accepting connections and waits until it is done."""
+        self._server.close()
+        await self._server.wait_closed()
+
+    def _create_game(self, options, reader, writer):
+        color = _colors.get(options.get('color', 'black'))
+        opponent = player_types.get(options.get('opponent', 'strategy'))
+        first = options.get('first', 'human')
+        if color is None or opponent is None \
+                or first not in ('human', 'computer'):
+            raise ValueError('invalid game options')
+        board = self.board_factory()
+        last_row = board.size - 1
+        other = Color.opposite(color)
+        human = RemotePlayer(board, color,
+                             last_row if color == Color.WHITE else 0,
+                             reader, writer)
+        computer = opponent(board, other,
+                            last_row if other == Color.WHITE else 0)
+        players = [human, computer] if first == 'human' \
+            else [computer, human]
+        return NeutronGame(board, *players, verbose=False), computer
+
+    async def _handle(self, reader, writer):
+        computer = None
+        try:
+            options = await receive_message(reader)
+            if options.get('type') != 'new':
+                raise ValueError('expected a new game')
+            game, computer = self._create_game(options, reader, writer)
+            await send_message(writer, {
+                'type': 'start',
+                'color': Color.color_names[
+                    Color.opposite(computer.color)
+                ],
+            })
+            self.games += 1
+            try:
+                for _ in range(self.max_rounds):
+                    await game.play_round_async(self.executor)
+                    if game.winner:
+                        break
+            finally:
+                self.games -= 1
+            await send_message(writer, {
+                'type': 'end',
+                'winner': Color.color_names.get(game.winner),
+                'grid': grid_rows(game.board),
+            })
+        except ValueError as error:
+            await send_message(writer,
+                               {'type': 'error', 'message': str(error)})
+        except ConnectionError:
+            pass
+        finally:
+            if hasattr(computer, 'close'):
+                computer.close()
+            writer.close()
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(
+        description='Hosts games of Neutron for remote clients, speaking '
+                    'a line-based JSON protocol.'
+    )
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='Address to listen on. Defaults to 127.0.0.1.')
+    parser.add_argument('--port', type=int, default=7805,
+                        help='Port to listen on. Defaults to 7805.')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='Number of threads computing computer players\' \
+                        moves.')
+    parser.add_argument('-s', '--size', type=int, default=BOARD_SIZE,
+                        help=f'Size of the board. Defaults to {BOARD_SIZE}.')
+    args = parser.parse_args()
+
+    server = GameServer(args.host, args.port,
+                        ThreadPoolExecutor(max_workers=args.workers),
+                        functools.partial(NeutronBoard, size=args.size))
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
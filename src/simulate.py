@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import random
+import time
+
+from neutron import BOARD_SIZE, NeutronBoard, NeutronGame
+from player import RandomPlayer, StrategyPlayer, SearchPlayer, \
+    MCTSPlayer
+from record import GameRecorder, GameWriter
+from util import Color
+
+player_types = {
+    'random': RandomPlayer,
+    'strategy': StrategyPlayer,
+    'search': SearchPlayer,
+    'mcts': MCTSPlayer,
+}
+"""Player classes selectable from the command line."""
+
+
+def play_game(white, black, first=Color.WHITE,
+              board_factory=NeutronBoard, max_rounds=500,
+              recorder=None):
+    """
+    Plays one game without printing anything.
+
+    Args:
+        white: :class:`player.Player` subclass (or any callable taking
+            the same arguments) controlling white soldiers.
+        black: the same for black soldiers.
+        first (int): color of the player who starts the game.
+        board_factory: callable creating the board in its starting state.
+        max_rounds (int):
+            number of rounds after which the game is abandoned as unfinished.
+        recorder (record.GameRecorder): optional recorder of the game.
+
+    Returns:
+        tuple:
+            the winning color, or ``None`` if the game was abandoned, and the
+            number of half-moves played.
+    """
+    board = board_factory()
+    last_row = board.size - 1
+    players = {
+        Color.WHITE: white(board, Color.WHITE, last_row),
+        Color.BLACK: black(board, Color.BLACK, 0),
+    }
+    game = NeutronGame(board, players[first],
+                       players[Color.opposite(first)], verbose=False,
+                       recorder=recorder)
+    for _ in range(max_rounds):
+        game.play_round()
+        if game.winner:
+            break
+    else:
+        if recorder is not None:
+            recorder.end()
+    return game.winner, game.half_moves
+
+
+def _play_games(white, black, first, board_factory, max_rounds, games, seed,
+                record=False):
+    # runs inside a worker process; seeding every chunk separately keeps the
+    # results reproducible no matter how chunks are assigned to workers
+    random.seed(seed)
+    records = []
+    recorder = GameRecorder(records.append) if record else None
+    outcomes = [
+        play_game(white, black, first, board_factory, max_rounds, recorder)
+        for _ in range(games)
+    ]
+    return outcomes, records
+
+
+class SimulationResult:
+    """
+    Aggregated results of a batch of simulated games.
+
+    Args:
+        outcomes (list): ``(winner, half_moves)`` tuples of all games played.
+        elapsed (float): wall-clock time of the simulation, in seconds.
+
+    Attributes:
+        games (int): number of games played.
+        wins (dict): number of games won by each color.
+        unfinished (int): number of games abandoned without a winner.
+        average_length (float): mean number of half-moves per game.
+        elapsed (float): wall-clock time of the simulation, in seconds.
+    """
+    def __init__(self, outcomes, elapsed):
+        self.games = len(outcomes)
+        self.wins = {Color.WHITE: 0, Color.BLACK: 0}
+        self.unfinished = 0
+        for winner, _ in outcomes:
+            if winner:
+                self.wins[winner] += 1
+            else:
+                self.unfinished += 1
+        self.average_length = \
+            sum(length for _, length in outcomes) / max(1, self.games)
+        self.elapsed = elapsed
+
+    @property
+    def games_per_second(self):
+        """Throughput of the simulation."""
+        return self.games / self.elapsed if self.elapsed else float('inf')
+
+    def __str__(self):
+        return '\n'.join([
+            f'Games played: {self.games}',
+            f'White wins: {self.wins[Color.WHITE]}',
+            f'Black wins: {self.wins[Color.BLACK]}',
+            f'Unfinished: {self.unfinished}',
+            f'Average game length: {self.average_length:.1f} half-moves',
+            f'Throughput: {self.games_per_second:.1f} games/s',
+        ])
+
+
+def simulate(white, black, games, workers=None, seed=None, first=Color.WHITE,
+             board_factory=NeutronBoard, max_rounds=500,
+             chunk_size=None, record=None):
+    """
+    Plays a number of headless games between two players, spreading them over
+    a :class:`concurrent.futures.ProcessPoolExecutor`.
+
+    Games are split into chunks, each played by one worker with the random
+    number generator seeded with ``seed`` plus the chunk's index.
+
+    Args:
+        white: :class:`player.Player` subclass controlling white soldiers.
+            It has to be picklable, e.g. a class or a
+            :func:`functools.partial` of one.
+        black: the same for black soldiers.
+        games (int): number of games to play.
+        workers (int):
+            number of worker processes. ``None`` uses all CPUs, 1 plays all
+            games in the current process.
+        seed (int): base seed; a random one is chosen if ``None``.
+        first (int): color of the player who starts each game.
+        board_factory: callable creating the board in its starting state.
+        max_rounds (int):
+            number of rounds after which a game is abandoned as unfinished.
+        chunk_size (int): number of games played by a worker in one task.
+        record (str):
+            optional path of a file the games are appended to, in the format
+            of :class:`record.GameWriter`.
+
+    Returns:
+        SimulationResult: results of the simulation.
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    if chunk_size is None:
+        chunk_size = max(1, min(100, games // (4 * (workers or 8)) or 1))
+    chunks = [
+        (white, black, first, board_factory, max_rounds,
+         min(chunk_size, games - start), seed + idx, record is not None)
+        for idx, start in enumerate(range(0, games, chunk_size))
+    ]
+
+    start_time = time.perf_counter()
+    outcomes = []
+    writer = GameWriter(record) if record is not None else None
+    executor = ProcessPoolExecutor(workers) if workers != 1 else None
+    try:
+        results = executor.map(_play_games, *zip(*chunks)) if executor \
+            else (_play_games(*chunk) for chunk in chunks)
+        for chunk_outcomes, records in results:
+            outcomes.extend(chunk_outcomes)
+            for game_record in records:
+                writer.write(game_record)
+    finally:
+        if executor:
+            executor.shutdown()
+        if writer is not None:
+            writer.close()
+    return SimulationResult(outcomes, time.perf_counter() - start_time)
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(
+        description='Plays headless games between two computer players.'
+    )
+    parser.add_argument('white', choices=player_types,
+                        help='Type of the player controlling white soldiers.')
+    parser.add_argument('black', choices=player_types,
+                        help='Type of the player controlling black soldiers.')
+    parser.add_argument('-n', '--games', type=int, default=1000,
+                        help='Number of games to play. Defaults to 1000.')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='Number of worker processes. Defaults to the \
+                        number of CPUs.')
+    parser.add_argument('-s', '--seed', type=int, default=None,
+                        help='Base seed of the random number generators.')
+    parser.add_argument('-f', '--first', choices=['white', 'black'],
+                        default='white',
+                        help='Color of the starting player. Defaults to \
+                        white.')
+    parser.add_argument('--size', type=int, default=BOARD_SIZE,
+                        help=f'Size of the board. Defaults to {BOARD_SIZE}.')
+    parser.add_argument('-b', '--batch', action='store_true',
+                        help='Play all games at once with the vectorized \
+                        engine. Only available for random players.')
+    parser.add_argument('-r', '--record',
+                        help='File to append records of the played games to.')
+    parser.add_argument('-P', '--profile', nargs='?', const='', default=None,
+                        metavar='FILE',
+                        help='Play all games in this process with hot paths \
+                        instrumented and print a report; given a file, also \
+                        write the timings there in pstats format.')
+    args = parser.parse_args()
+    first = Color.WHITE if args.first == 'white' else Color.BLACK
+    board_factory = functools.partial(NeutronBoard, size=args.size)
+
+    if args.batch:
+        if args.white != 'random' or args.black != 'random':
+            parser.error('--batch requires both players to be random')
+        if args.size != BOARD_SIZE:
+            parser.error(f'--batch requires a board of size {BOARD_SIZE}')
+        from batch import BatchSimulator
+        print(BatchSimulator(args.games, first=first, seed=args.seed).run())
+    elif args.profile is not None:
+        from profiling import Profiler
+        with Profiler() as profiler:
+            print(simulate(
+                player_types[args.white],
+                player_types[args.black],
+                args.games,
+                workers=1,
+                seed=args.seed,
+                first=first,
+                board_factory=board_factory,
+                record=args.record,
+            ))
+        print(profiler)
+        if args.profile:
+            profiler.dump_stats(args.profile)
+    else:
+        print(simulate(
+            player_types[args.white],
+            player_types[args.black],
+            args.games,
+            workers=args.workers,
+            seed=args.seed,
+            first=first,
+            board_factory=board_factory,
+            record=args.record,
+        ))
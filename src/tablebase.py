@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+
+from argparse import ArgumentParser
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import json
+import time
+
+from bitboard import BitBoard, SQUARES, SIZE, canonical_key
+from mmtable import MappedTable
+from neutron import NeutronBoard
+from player import Player, StrategyPlayer
+from util import Color
+
+WIN = 1
+LOSS = 2
+DRAW = 3
+"""
+Results stored in a tablebase, from the point of view of the player to move.
+``DRAW`` marks positions whose result the analysis could not force within
+the explored part of the game.
+"""
+
+_RESULT_BITS = 2
+
+
+def pack_value(result, distance):
+    """Packs a result and a distance in half-moves into a table value."""
+    return distance << _RESULT_BITS | result
+
+
+def unpack_value(value):
+    """Unpacks a table value into a ``(result, distance)`` tuple."""
+    return value & ((1 << _RESULT_BITS) - 1), value >> _RESULT_BITS
+
+
+def legal_moves(bits, color, phase):
+    """
+    Get all moves in a state.
+
+    Args:
+        bits (bitboard.BitBoard): the position.
+        color (int): color of the player to move.
+        phase (str): ``'neutron'`` or ``'soldier'``.
+
+    Returns:
+        list: ``(source, destination)`` square pairs.
+    """
+    if phase == 'neutron':
+        sources = [bits.neutron_square]
+    else:
+        mask = bits.mask(color)
+        sources = [sq for sq in range(len(SQUARES)) if mask >> sq & 1]
+    return [(src, dst) for src in sources for _, dst in bits.moves(src)]
+
+
+def successors(key):
+    """
+    Expands a state.
+
+    Args:
+        key (int): state packed with :func:`bitboard.BitBoard.key`.
+
+    Returns:
+        list:
+            one entry per move returned by :func:`legal_moves`: the
+            canonical key of the state after the move (see
+            :func:`bitboard.canonical_key`), or the negated winning color if
+            the move ends the game.
+    """
+    bits, color, phase = BitBoard.from_key(key)
+    if phase == 'neutron':
+        next_color, next_phase = color, 'soldier'
+    else:
+        next_color, next_phase = Color.opposite(color), 'neutron'
+    result = []
+    for src, dst in legal_moves(bits, color, phase):
+        bits.move(src, dst)
+        winner = bits.winner(color)
+        result.append(-winner if winner
+                      else canonical_key(bits.key(next_color, next_phase))[0])
+        bits.move(dst, src)
+    return result
+
+
+def _expand(keys):
+    return [(key, successors(key)) for key in keys]
+
+
+def _mover(key):
+    return BitBoard.from_key(key)[1]
+
+
+def _keeps_turn(key):
+    # after a neutron move, the same player moves a soldier; this doesn't
+    # depend on the colors, which canonical keys may swap
+    return BitBoard.from_key(key)[2] == 'neutron'
+
+
+def generate(root, depth, workers=None, chunk_size=2000):
+    """
+    Solves all states reachable from ``root`` within ``depth`` half-moves.
+
+    First, the states are enumerated breadth-first, expanding every level
+    across worker processes. Then the results are propagated backwards from
+    the moves ending the game (retrograde analysis): a state is won if any
+    move leads to a state won for its player, and lost once every move leads
+    to a state lost for its player. States on the horizon are not expanded
+    and stay unresolved, like states in which neither player can force a
+    result; both are labeled :data:`DRAW`.
+
+    States are stored under their canonical keys, so positions related by a
+    symmetry of the game are solved once.
+
+    Args:
+        root (int): packed starting state.
+        depth (int): number of half-moves to explore.
+        workers (int):
+            number of worker processes, ``None`` for all CPUs, 1 to expand in
+            the current process.
+        chunk_size (int): number of states expanded by a worker in one task.
+
+    Returns:
+        dict:
+            mapping of canonical keys of states to values made by
+            :func:`pack_value`.
+    """
+    graph = {}
+    frontier = [canonical_key(root)[0]]
+    executor = ProcessPoolExecutor(workers) if workers != 1 else None
+    try:
+        for _ in range(depth):
+            chunks = [frontier[i:i + chunk_size]
+                      for i in range(0, len(frontier), chunk_size)]
+            expanded = executor.map(_expand, chunks) if executor \
+                else map(_expand, chunks)
+            next_frontier = set()
+            for chunk in expanded:
+                for key, children in chunk:
+                    graph[key] = children
+                    next_frontier.update(
+                        child for child in children
+                        if child > 0 and child not in graph
+                    )
+            frontier = list(next_frontier - graph.keys())
+    finally:
+        if executor:
+            executor.shutdown()
+
+    movers = {key: _mover(key) for key in graph}
+    predecessors = {}
+    remaining = {}
+    solved = {}
+    queue = deque()
+    for key, children in graph.items():
+        remaining[key] = len(children)
+        for child in children:
+            if child < 0:
+                if -child == movers[key]:
+                    if key not in solved:
+                        solved[key] = (WIN, 1)
+                        queue.append(key)
+                else:
+                    remaining[key] -= 1
+            else:
+                predecessors.setdefault(child, []).append(key)
+        if key not in solved and remaining[key] == 0:
+            # every move loses at once, or there is no move at all
+            solved[key] = (LOSS, 1)
+            queue.append(key)
+
+    while queue:
+        child = queue.popleft()
+        result, distance = solved[child]
+        for parent in predecessors.get(child, ()):
+            if parent in solved:
+                continue
+            parent_result = result if _keeps_turn(parent) \
+                else WIN + LOSS - result
+            if parent_result == WIN:
+                solved[parent] = (WIN, distance + 1)
+                queue.append(parent)
+            else:
+                remaining[parent] -= 1
+                if remaining[parent] == 0:
+                    solved[parent] = (LOSS, distance + 1)
+                    queue.append(parent)
+
+    return {
+        key: pack_value(*solved.get(key, (DRAW, 0)))
+        for key in graph
+    }
+
+
+class TablebasePlayer(Player):
+    """
+    A player playing from a tablebase created by :func:`generate`.
+
+    For every legal move it looks the resulting state up, and plays the
+    fastest win, a draw, or the slowest loss, in that order. When the current
+    state is not in the tablebase, it falls back to another player.
+
+    Args:
+        board (neutron.NeutronBoard):
+            board of the game played by this player.
+        color (int): color of this player's soldiers.
+        home_row (int): index of this player's home row on board.
+        path (str): path of the tablebase file.
+        fallback: :class:`player.Player` subclass used outside the tablebase.
+
+    Raises:
+        ValueError: if the board is not of the default size, which is the
+            only one tablebases hold.
+    """
+    _tables = {}
+
+    def __init__(self, board, color, home_row, path='tablebase.bin',
+                 fallback=StrategyPlayer):
+        if board.size != SIZE:
+            raise ValueError(f'tablebases only hold {SIZE}x{SIZE} games')
+        super().__init__(board, color, home_row)
+        if path not in self._tables:
+            self._tables[path] = MappedTable(path)
+        self.table = self._tables[path]
+        self.fallback = fallback(board, color, home_row)
+
+    def _rank(self, child, phase):
+        # lower is better for this player
+        if child < 0:
+            return (0, 0) if -child == self.color else (4, 0)
+        value = self.table.get(child)
+        if value is None:
+            return (2, 0)
+        result, distance = unpack_value(value)
+        if result != DRAW and phase == 'soldier':
+            result = WIN + LOSS - result
+        if result == WIN:
+            return (1, distance)
+        if result == DRAW:
+            return (2, 0)
+        return (3, -distance)
+
+    def best_move(self, phase):
+        """
+        Finds the best move in the current state.
+
+        Args:
+            phase (str): ``'neutron'`` or ``'soldier'``.
+
+        Returns:
+            tuple:
+                ``(source, destination)`` square pair, or ``None`` if the
+                state is not in the tablebase.
+        """
+        bits = BitBoard.from_cells(self.board.cells)
+        key = bits.key(self.color, phase)
+        if canonical_key(key)[0] not in self.table:
+            return None
+        moves = legal_moves(bits, self.color, phase)
+        return min(zip(successors(key), moves),
+                   key=lambda item: self._rank(item[0], phase))[1]
+
+    def move_neutron(self):
+        move = self.best_move('neutron')
+        if move is None:
+            self.fallback.move_neutron()
+        else:
+            self.board.neutron.move_to_pos(SQUARES[move[1]])
+
+    def move_soldier(self):
+        move = self.best_move('soldier')
+        if move is None:
+            self.fallback.move_soldier()
+            return
+        soldier = next(
+            soldier
+            for soldier in self.board.get_soldiers(self.color)
+            if soldier.pos == SQUARES[move[0]]
+        )
+        soldier.move_to_pos(SQUARES[move[1]])
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(
+        description='Generates a tablebase of states reachable from a '
+                    'starting position by retrograde analysis.'
+    )
+    parser.add_argument('depth', type=int,
+                        help='Number of half-moves to explore.')
+    parser.add_argument('-o', '--output', default='tablebase.bin',
+                        help='Tablebase file. Defaults to tablebase.bin.')
+    parser.add_argument('-g', '--grid', type=json.loads, default=None,
+                        help='Starting grid as a JSON list of rows. Defaults \
+                        to the starting grid of the game.')
+    parser.add_argument('-c', '--color', choices=['white', 'black'],
+                        default='white', help='Color of the player to move.')
+    parser.add_argument('-p', '--phase', choices=['neutron', 'soldier'],
+                        default='soldier', help='Phase of the turn. Defaults \
+                        to soldier, as in the first turn of the game.')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='Number of worker processes. Defaults to the \
+                        number of CPUs.')
+    args = parser.parse_args()
+
+    grid = args.grid or NeutronBoard().grid.tolist()
+    root = BitBoard.from_grid(grid).key(
+        Color.WHITE if args.color == 'white' else Color.BLACK, args.phase
+    )
+    start = time.perf_counter()
+    table = generate(root, args.depth, args.workers)
+    MappedTable.write(args.output, table)
+    counts = {WIN: 0, LOSS: 0, DRAW: 0}
+    for value in table.values():
+        counts[unpack_value(value)[0]] += 1
+    print(f'{len(table)} states in {time.perf_counter() - start:.1f} s: '
+          f'{counts[WIN]} won, {counts[LOSS]} lost, {counts[DRAW]} drawn')
+    result, distance = unpack_value(table[canonical_key(root)[0]])
+    print(f'Starting state: {["won", "lost", "drawn"][result - 1]}'
+          + (f' in {distance} half-moves' if result != DRAW else ''))
@@ -0,0 +1,50 @@
+import numpy as np
+
+from batch import BatchSimulator
+from neutron import NeutronBoard
+from util import Color
+
+GRID = [
+    [3, 0, 3, 0, 3],
+    [0, 3, 0, 0, 2],
+    [0, 0, 1, 3, 0],
+    [2, 0, 0, 0, 0],
+    [0, 2, 0, 2, 2],
+]
+
+
+def successors(grid, color):
+    result = set()
+    board = NeutronBoard(grid)
+    for move in board.generate_moves(color):
+        board.make_move(move)
+        result.add(board.grid.tobytes())
+        board.unmake_move(move)
+    return result
+
+
+def test_moves_match_reference():
+    batch = BatchSimulator(500, GRID, seed=0)
+    batch.initial_round = False
+    batch.play_round()
+    expected = {
+        grid
+        for after_neutron in successors(GRID, 1)
+        for grid in successors(
+            np.frombuffer(after_neutron, dtype=int).reshape(5, 5).tolist(),
+            Color.WHITE
+        )
+    }
+    # games won by the neutron move retire before the soldier move
+    assert all(
+        grid.astype(int).tobytes() in expected for grid in batch.grids
+    )
+    assert len({grid.tobytes() for grid in batch.grids}) > 1
+
+
+def test_run():
+    result = BatchSimulator(200, seed=0).run()
+    assert result.games == 200
+    assert result.wins[Color.WHITE] + result.wins[Color.BLACK] + \
+        result.unfinished == 200
+    assert result.average_length > 0
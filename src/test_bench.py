@@ -0,0 +1,40 @@
+import json
+import os
+import subprocess
+import sys
+
+from bench import run_benchmarks, compare
+
+
+def test_run_and_compare():
+    results = run_benchmarks(['check_won', 'neighbors'], ['reference'],
+                             min_time=0.01, repeat=1)
+    assert set(results) == {'check_won/reference', 'neighbors/reference'}
+    assert all(result['ops_per_second'] > 0 for result in results.values())
+
+    baseline = {
+        'check_won/reference': {
+            'seconds_per_op':
+                results['check_won/reference']['seconds_per_op'] / 2,
+        },
+    }
+    assert compare(results, baseline) == [('check_won/reference', 2.0, True)]
+    assert compare(results, baseline, tolerance=1.5) == [
+        ('check_won/reference', 2.0, False)]
+
+
+def test_baseline_overwritten_by_output(tmp_path):
+    path = tmp_path / 'bench_results.json'
+    path.write_text(json.dumps({'results': {
+        'check_won/reference': {'seconds_per_op': 1e-12},
+    }}))
+    process = subprocess.run(
+        [sys.executable, 'bench.py', '-k', 'check_won', '-e', 'reference',
+         '-o', str(path), '-b', str(path)],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True,
+    )
+    assert process.returncode == 1
+    assert 'REGRESSION' in process.stdout
+    assert json.loads(path.read_text())['results']['check_won/reference'][
+        'seconds_per_op'] > 1e-12
@@ -0,0 +1,80 @@
+import random
+
+from bitboard import BitBoard, BitboardNeutronBoard, MIRROR, FLIP, \
+    transform_key, transform_move
+from neutron import NeutronBoard
+from player import RandomPlayer
+from util import Vec, Color, directions
+
+
+def test_empty_spot():
+    board = BitboardNeutronBoard([
+        [1, 2, 0, 1, 0],
+        [3, 0, 2, 0, 2],
+        [0, 0, 0, 0, 0],
+        [3, 2, 0, 0, 3],
+        [0, 3, 2, 2, 2],
+    ])
+    assert board.furthest_empty_spot(Vec(2, 2), 'north') is None
+    assert board.furthest_empty_spot(Vec(2, 2), 'northeast') == Vec(4, 0)
+    assert board.furthest_empty_spot(Vec(2, 2), 'east') == Vec(4, 2)
+    assert board.furthest_empty_spot(Vec(2, 2), 'southeast') == Vec(3, 3)
+    assert board.furthest_empty_spot(Vec(2, 2), 'south') == Vec(2, 3)
+    assert board.furthest_empty_spot(Vec(2, 2), 'southwest') is None
+    assert board.furthest_empty_spot(Vec(2, 2), 'west') == Vec(0, 2)
+    assert board.furthest_empty_spot(Vec(2, 2), 'northwest') == Vec(1, 1)
+
+
+def test_matches_reference():
+    random.seed(0)
+    board = BitboardNeutronBoard()
+    players = [RandomPlayer(board, Color.WHITE, 4),
+               RandomPlayer(board, Color.BLACK, 0)]
+    for turn in range(40):
+        players[turn % 2].move_soldier()
+        reference = NeutronBoard(board.grid.tolist())
+        assert board.bits.white == BitBoard.from_grid(board.grid).white
+        assert board.bits.black == BitBoard.from_grid(board.grid).black
+        for y in range(5):
+            for x in range(5):
+                assert board.neighbors(Vec(x, y)) == \
+                    reference.neighbors(Vec(x, y))
+                for dir in directions:
+                    assert board.furthest_empty_spot(Vec(x, y), dir) == \
+                        reference.furthest_empty_spot(Vec(x, y), dir)
+
+
+def test_symmetries():
+    grid = [
+        [3, 0, 3, 0, 3],
+        [0, 3, 0, 0, 2],
+        [0, 0, 1, 3, 0],
+        [2, 0, 0, 0, 0],
+        [0, 2, 0, 2, 2],
+    ]
+    bits = BitBoard.from_grid(grid)
+    key, symmetry = bits.canonical_key(Color.WHITE, 'neutron')
+    assert transform_key(key, symmetry) == bits.key(Color.WHITE, 'neutron')
+
+    mirrored = BitBoard.from_grid([row[::-1] for row in grid])
+    assert transform_key(bits.key(Color.BLACK, 'soldier'), MIRROR) == \
+        mirrored.key(Color.BLACK, 'soldier')
+    flipped = BitBoard.from_grid([
+        [{2: 3, 3: 2}.get(value, value) for value in row]
+        for row in grid[::-1]
+    ])
+    assert transform_key(bits.key(Color.WHITE, 'neutron'), FLIP) == \
+        flipped.key(Color.BLACK, 'neutron')
+    assert mirrored.canonical_key(Color.WHITE, 'neutron')[0] == key
+    assert flipped.canonical_key(Color.BLACK, 'neutron')[0] == key
+    # every board engine gives the same key
+    for board_class in (NeutronBoard, BitboardNeutronBoard):
+        assert board_class(grid).canonical_key(Color.WHITE, 'neutron') == \
+            (key, symmetry)
+
+    # moves map onto moves of the transformed position
+    for symmetry, image in ((MIRROR, mirrored), (FLIP, flipped)):
+        for src, dst in ((12, 10), (9, 19)):
+            move = transform_move((src, dst), symmetry)
+            assert dst in (d for _, d in bits.moves(src))
+            assert move[1] in (d for _, d in image.moves(move[0]))
@@ -0,0 +1,51 @@
+import pytest
+import random
+
+from bitboard import BitBoard, MIRROR, canonical_key, transform_move
+from book import BookPlayer, build_book, decode_move
+from mmtable import MappedTable
+from neutron import NeutronBoard
+from player import RandomPlayer, StrategyPlayer
+from record import GameRecord, GameRecorder
+from simulate import play_game
+from util import Color
+
+
+def test_build_and_play(tmp_path):
+    random.seed(0)
+    records = []
+    for _ in range(50):
+        play_game(StrategyPlayer, StrategyPlayer,
+                  recorder=GameRecorder(records.append))
+    book = build_book(records, depth=4, min_games=3)
+    start = BitBoard.from_grid(NeutronBoard().grid)
+    key, symmetry = canonical_key(start.key(Color.WHITE, 'soldier'))
+    assert key in book
+
+    MappedTable.write(tmp_path / 'book.bin', book)
+    board = NeutronBoard()
+    player = BookPlayer(board, Color.WHITE, 4,
+                        path=str(tmp_path / 'book.bin'),
+                        fallback=RandomPlayer)
+    player.move_soldier()
+    src, dst = transform_move(decode_move(book[key]), symmetry)
+    assert board.grid.flat[src] == 0 and board.grid.flat[dst] == Color.WHITE
+    assert player.in_book
+
+
+def test_symmetric_games_merge():
+    grid = BitBoard.from_grid(NeutronBoard().grid).key(Color.WHITE,
+                                                       'neutron')
+    # the same opening move, played on both sides of the board
+    records = [
+        GameRecord(grid, Color.WHITE, Color.WHITE, 'A', 'B',
+                   bytes(move))
+        for move in [(20, 15), transform_move((20, 15), MIRROR)] * 2
+    ]
+    book = build_book(records, depth=1, min_games=4)
+    assert len(book) == 1
+
+
+def test_board_size():
+    with pytest.raises(ValueError):
+        BookPlayer(NeutronBoard(size=7), Color.WHITE, 6)
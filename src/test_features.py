@@ -0,0 +1,44 @@
+import random
+
+import numpy as np
+
+from features import FEATURES, board_features, extract
+from neutron import NeutronBoard
+from player import RandomPlayer
+from util import Color
+
+
+def reference_features(board):
+    neutron = board.neutron
+    return [
+        len(neutron.possible_directions),
+        len(board.grid) - 1 - neutron.pos.y,
+        neutron.pos.y,
+        int((board.grid[-1] == 0).sum()),
+        int((board.grid[0] == 0).sum()),
+        len(board.neighbors(neutron.pos)) - board.neutron_liberties,
+        sum(len(soldier.possible_directions)
+            for soldier in board.white_soldiers),
+        sum(len(soldier.possible_directions)
+            for soldier in board.black_soldiers),
+    ]
+
+
+def test_matches_reference():
+    random.seed(0)
+    grids, expected = [], []
+    for _ in range(20):
+        board = NeutronBoard()
+        players = [RandomPlayer(board, Color.WHITE, 4),
+                   RandomPlayer(board, Color.BLACK, 0)]
+        for turn in range(random.randrange(1, 20)):
+            players[turn % 2].move_soldier()
+            if board.winner(Color.WHITE):
+                break
+            players[turn % 2].move_neutron()
+        grids.append(board.grid.copy())
+        expected.append(reference_features(board))
+        assert board_features(board).tolist() == expected[-1]
+    features = extract(np.array(grids))
+    assert features.shape == (20, len(FEATURES))
+    assert features.tolist() == expected
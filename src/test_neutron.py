@@ -1,5 +1,13 @@
-from neutron import NeutronBoard
-from util import Vec
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+from neutron import NeutronBoard, NeutronGame, Neutron, SQUARES
+from player import RandomPlayer
+from util import Vec, Color
 
 
 def test_move():
@@ -63,3 +71,145 @@ def test_empty_spot():
     assert board.furthest_empty_spot(Vec(2, 2), 'southwest') is None
     assert board.furthest_empty_spot(Vec(2, 2), 'west') == Vec(0, 2)
     assert board.furthest_empty_spot(Vec(2, 2), 'northwest') == Vec(1, 1)
+
+
+def test_legal_moves_invalidated():
+    board = NeutronBoard([
+        [2, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0],
+        [0, 1, 0, 0, 0],
+        [0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 3],
+    ])
+    assert board.neutron.possible_moves == {
+        Vec(1, 0), Vec(3, 0), Vec(4, 2), Vec(3, 4),
+        Vec(1, 4), Vec(0, 3), Vec(0, 2), Vec(0, 1),
+    }
+    board.white_soldiers[0].move('south')
+    assert board.legal_moves(board.neutron.pos)['west'] == Vec(0, 2)
+    board.black_soldiers[0].move('west')
+    assert board.legal_moves(board.neutron.pos)['south'] == Vec(1, 3)
+
+
+def test_zobrist():
+    board = NeutronBoard()
+    start = board.zobrist
+    board.white_soldiers[0].move('north')
+    assert board.zobrist != start
+    assert board.zobrist == NeutronBoard(board.grid.tolist()).zobrist
+    board.neutron.move('south')
+    assert board.zobrist == NeutronBoard(board.grid.tolist()).zobrist
+
+
+def test_make_unmake():
+    board = NeutronBoard()
+    grid, zobrist = board.grid.copy(), board.zobrist
+    made = []
+    for color in (Color.WHITE, Neutron.VALUE, Color.BLACK):
+        move = board.generate_moves(color)[-1]
+        board.make_move(move)
+        made.append(move)
+        assert board.grid[tuple(move.dst)] == color
+        assert move.piece.pos is move.dst
+    for move in reversed(made):
+        board.unmake_move(move)
+    assert (board.grid == grid).all()
+    assert board.zobrist == zobrist
+    assert {soldier.pos for soldier in board.white_soldiers} == \
+        {Vec(x, 4) for x in range(5)}
+
+
+def test_step_api():
+    random.seed(1)
+    board = NeutronBoard()
+    game = NeutronGame(board, RandomPlayer(board, Color.WHITE, 4),
+                       RandomPlayer(board, Color.BLACK, 0), verbose=False)
+    assert game.phase == 'soldier'
+    actions = game.legal_actions()
+    assert {action.piece.color for action in actions} == {Color.WHITE}
+    game.apply(actions[0])
+    assert (game.phase, game.current_player.color) == ('neutron', Color.BLACK)
+    with pytest.raises(ValueError):
+        game.apply(actions[1])
+    assert all(action.piece is board.neutron
+               for action in game.legal_actions())
+    game.step()
+    assert (game.phase, game.current_player.color) == ('soldier', Color.BLACK)
+
+    for _ in range(1000):
+        if game.apply(random.choice(game.legal_actions())):
+            break
+    assert game.winner in (Color.WHITE, Color.BLACK)
+    assert game.legal_actions() == []
+    with pytest.raises(ValueError):
+        game.apply(actions[0])
+
+
+def test_apply_foreign_move():
+    board, other = NeutronBoard(), NeutronBoard()
+    game = NeutronGame(board, RandomPlayer(board, Color.WHITE, 4),
+                       RandomPlayer(board, Color.BLACK, 0), verbose=False)
+    action = other.generate_moves(Color.WHITE)[0]
+    game.apply(action)
+    assert other.grid.tolist() == NeutronBoard().grid.tolist()
+    assert board.last_move == (action.src, action.dst)
+    game.apply(game.legal_actions()[0])
+    game.apply(game.legal_actions()[0])
+    # the move's source square is empty on the game's board now
+    with pytest.raises(ValueError):
+        game.apply(action)
+
+
+def test_neutron_liberties():
+    random.seed(1)
+    board = NeutronBoard()
+    for _ in range(200):
+        moves = board.generate_moves(random.choice(
+            [Neutron.VALUE, Color.WHITE, Color.BLACK]
+        ))
+        if moves:
+            board.make_move(random.choice(moves))
+        assert board.neutron_liberties == \
+            board.neighbors(board.neutron.pos).count(0)
+
+
+def test_board_size():
+    board = NeutronBoard(size=7)
+    assert board.size == 7
+    assert board.grid[0].tolist() == [Color.BLACK] * 7
+    assert board.grid[3, 3] == Neutron.VALUE
+    assert len(board.empty_neighbors(board.neutron.pos)) == 8
+    assert NeutronBoard(board.grid.tolist()).size == 7
+    with pytest.raises(ValueError):
+        NeutronBoard(size=2)
+    with pytest.raises(ValueError):
+        NeutronBoard(board.grid.tolist(), size=5)
+
+
+def test_shared_positions():
+    random.seed(0)
+    board = NeutronBoard()
+    players = [RandomPlayer(board, Color.WHITE, 4),
+               RandomPlayer(board, Color.BLACK, 0)]
+    for turn in range(20):
+        players[turn % 2].move_soldier()
+        for move in board.generate_moves(Color.WHITE):
+            assert move.dst is SQUARES[move.dst.y * 5 + move.dst.x]
+        assert board.empty_in_row(0) == {
+            Vec(x, 0) for x in range(5) if board.grid[0, x] == 0
+        }
+    assert Vec(1, 2) == (2, 1)
+    assert hash(Vec(1, 2)) == hash((2, 1))
+
+
+def test_no_numpy_import():
+    code = '\n'.join([
+        'import sys',
+        'import main',
+        'from player import StrategyPlayer',
+        'from simulate import play_game',
+        'play_game(StrategyPlayer, StrategyPlayer)',
+        'assert "numpy" not in sys.modules',
+    ])
+    subprocess.run([sys.executable, '-c', code], check=True,
+                   cwd=os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,33 @@
+from neutron import NeutronBoard
+from perft import engines, perft, cross_check
+from util import Color
+
+MIDGAME_GRID = [
+    [3, 0, 3, 0, 3],
+    [0, 3, 0, 0, 2],
+    [0, 0, 1, 3, 0],
+    [2, 0, 0, 0, 0],
+    [0, 2, 0, 2, 2],
+]
+
+
+def test_perft_start():
+    grid = NeutronBoard().grid.tolist()
+    for engine in engines.values():
+        result = perft(engine(grid), 3)
+        assert [level['soldier'] + level['neutron']
+                for level in result.levels] == [13, 99, 1022]
+        assert result.levels[1]['wins'] == 4
+
+
+def test_cross_check():
+    for name in engines:
+        assert cross_check(engines[name], MIDGAME_GRID, 3, Color.WHITE,
+                           'neutron') == []
+
+
+def test_cross_check_sizes():
+    for size in (3, 7):
+        grid = NeutronBoard(size=size).grid.tolist()
+        for name in engines:
+            assert cross_check(engines[name], grid, 3) == []
@@ -1,6 +1,10 @@
-from neutron import NeutronBoard
-from player import StrategyPlayer
-from util import Color
+import random
+
+from bitboard import BitBoard
+from neutron import NeutronBoard, Soldier
+from player import RandomPlayer, StrategyPlayer, TurnAnalysis, SearchPlayer, \
+    MCTSPlayer, _Node, _rollout
+from util import Color, Vec
 
 
 def test_block_enemy_row():
@@ -54,3 +58,188 @@ def test_avoid_enemy_row():
         player = StrategyPlayer(board, Color.WHITE, 4)
         player.move_neutron()
         assert all(board.grid[0, x] == 0 for x in range(1, 4))
+
+
+def test_turn_analysis(monkeypatch):
+    board = NeutronBoard([
+        [3, 0, 0, 3, 3],
+        [3, 0, 0, 0, 0],
+        [2, 0, 1, 0, 3],
+        [0, 0, 0, 0, 0],
+        [0, 2, 2, 2, 2],
+    ])
+    analysis = TurnAnalysis(board, Color.WHITE, 4)
+    assert {pos.x for pos in analysis.empty_enemy_row} == {1, 2}
+    assert {pos.x for pos in analysis.empty_home_row} == {0}
+    assert len(analysis.neutron_neighbors) == 8
+    assert len(analysis.soldier_moves) == 5
+    assert {(soldier.pos.y, soldier.pos.x, pos.x) for soldier, moves in
+            analysis.reaching(analysis.empty_enemy_row)
+            for pos in moves} == {(2, 0, 2), (4, 1, 1)}
+
+    generated = []
+    possible_moves = Soldier.possible_moves.fget
+
+    def counted(soldier):
+        generated.append(soldier)
+        return possible_moves(soldier)
+    monkeypatch.setattr(Soldier, 'possible_moves', property(counted))
+    # block_enemy_row fires after block_neutron was tried, each piece's
+    # moves are generated once, the move made included
+    board = NeutronBoard([
+        [3, 0, 0, 3, 3],
+        [3, 0, 0, 0, 0],
+        [2, 0, 1, 0, 3],
+        [0, 0, 0, 0, 0],
+        [0, 2, 2, 2, 2],
+    ])
+    moved = board.white_soldiers[0]
+    StrategyPlayer(board, Color.WHITE, 4).move_soldier()
+    assert board.last_move == (Vec(0, 2), Vec(2, 0))
+    assert moved.pos == Vec(2, 0)
+    assert sorted(map(id, generated)) \
+        == sorted(map(id, board.white_soldiers + [board.neutron]))
+
+
+def test_search_move_into_home():
+    board = NeutronBoard([
+        [3, 3, 3, 3, 3],
+        [2, 0, 0, 0, 0],
+        [0, 0, 1, 0, 0],
+        [0, 0, 0, 0, 0],
+        [0, 2, 2, 2, 2],
+    ])
+    player = SearchPlayer(board, Color.WHITE, 4, time_budget=0.1)
+    player.move_neutron()
+    assert board.grid[4, 0] == 1
+    assert player.last_search['nodes'] > 0
+
+
+def test_search_block_enemy_row():
+    board = NeutronBoard([
+        [3, 0, 0, 3, 3],
+        [3, 0, 0, 0, 0],
+        [2, 0, 1, 0, 3],
+        [0, 0, 0, 0, 0],
+        [0, 2, 2, 2, 2],
+    ])
+    player = SearchPlayer(board, Color.WHITE, 4, time_budget=0.1)
+    player.move_soldier()
+    assert board.grid[0, 2] == 2
+
+
+def test_search_table_stats_per_search():
+    board = NeutronBoard([
+        [3, 0, 0, 3, 3],
+        [3, 0, 0, 0, 0],
+        [2, 0, 1, 0, 3],
+        [0, 0, 0, 0, 0],
+        [0, 2, 2, 2, 2],
+    ])
+    player = SearchPlayer(board, Color.WHITE, 4, time_budget=0.1)
+    player.search('soldier')
+    hits, misses = player.table.hits, player.table.misses
+    assert player.last_search['table_hits'] == hits
+    assert player.last_search['table_misses'] == misses
+    player.search('soldier')
+    assert player.last_search['table_hits'] == player.table.hits - hits
+    assert player.last_search['table_misses'] == player.table.misses - misses
+    assert player.last_search['table_hits'] > 0
+
+
+def test_mcts_move_into_home():
+    board = NeutronBoard([
+        [3, 3, 3, 3, 3],
+        [2, 0, 0, 0, 0],
+        [0, 0, 1, 0, 0],
+        [0, 0, 0, 0, 0],
+        [0, 2, 2, 2, 2],
+    ])
+    player = MCTSPlayer(board, Color.WHITE, 4, iterations=200, workers=2)
+    player.move_neutron()
+    player.close()
+    assert board.grid[4, 0] == 1
+    assert player.last_search['rollouts'] == 200
+
+
+def test_mcts_stuck_soldiers():
+    bits = BitBoard.from_cells([
+        0, 3, 0, 3, 0,
+        0, 0, 0, 0, 0,
+        0, 0, 1, 0, 0,
+        3, 3, 0, 0, 0,
+        2, 3, 0, 0, 0,
+    ])
+    # white moved the neutron and cannot move its only soldier
+    node = _Node(bits, Color.WHITE, 'soldier', Color.WHITE, (7, 12))
+    assert node.winner == Color.BLACK
+    root = _Node(bits, Color.WHITE, 'soldier')
+    assert root.winner == Color.BLACK
+
+    for policy in (RandomPlayer, StrategyPlayer):
+        assert _rollout(bits.white, bits.black, bits.neutron, 5,
+                        Color.WHITE, 'soldier', policy, 10) == Color.BLACK
+    board = NeutronBoard(bits.to_grid())
+    player = MCTSPlayer(board, Color.WHITE, 4, iterations=10)
+    player.move_soldier()
+    assert board.grid.tolist() == bits.to_grid()
+    assert player.last_search['rollouts'] == 0
+
+
+def test_mcts_tree_reuse():
+    board = NeutronBoard([
+        [3, 3, 0, 3, 3],
+        [0, 0, 3, 0, 0],
+        [0, 0, 1, 0, 0],
+        [0, 0, 2, 0, 0],
+        [2, 2, 0, 2, 2],
+    ])
+    player = MCTSPlayer(board, Color.WHITE, 4, iterations=200)
+    player.move_neutron()
+    assert not player.last_search['reused']
+    # the soldier move search continues from the neutron move's subtree
+    player.move_soldier()
+    assert player.last_search['reused']
+
+
+def _ponder_board():
+    return NeutronBoard([
+        [2, 2, 2, 2, 2],
+        [0, 0, 0, 0, 0],
+        [0, 0, 1, 0, 0],
+        [0, 2, 0, 2, 0],
+        [3, 0, 3, 0, 3],
+    ])
+
+
+def test_search_ponder():
+    random.seed(0)
+    board = _ponder_board()
+    player = SearchPlayer(board, Color.WHITE, 4, max_depth=2, ponder=True)
+    opponent = StrategyPlayer(board, Color.BLACK, 0)
+    player.move_soldier()
+    # let it ponder every reply, as a slow human opponent would
+    player._pondering._thread.join()
+    opponent.move_neutron()
+    opponent.move_soldier()
+    assert not board.winner(Color.BLACK)
+    player.move_neutron()
+    player.close()
+    assert player.last_search['pondered']
+
+
+def test_mcts_ponder():
+    random.seed(0)
+    board = _ponder_board()
+    player = MCTSPlayer(board, Color.WHITE, 4, iterations=50,
+                        max_rounds=3, ponder=True)
+    opponent = StrategyPlayer(board, Color.BLACK, 0)
+    player.move_soldier()
+    player._pondering._thread.join()
+    opponent.move_neutron()
+    opponent.move_soldier()
+    assert not board.winner(Color.BLACK)
+    player.move_neutron()
+    player.close()
+    assert player.last_search['pondered']
+    assert player.last_search['rollouts'] == 0
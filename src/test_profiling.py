@@ -0,0 +1,39 @@
+import pstats
+import random
+
+from neutron import NeutronBoard, NeutronGame, Soldier
+from player import RandomPlayer, StrategyPlayer
+from profiling import Profiler
+from util import Color
+
+
+def test_profiler(tmp_path):
+    originals = (NeutronBoard.__dict__['neighbors'],
+                 Soldier.__dict__['possible_moves'],
+                 StrategyPlayer.__dict__['move_soldier'],
+                 NeutronGame.__dict__['step'])
+    random.seed(0)
+    board = NeutronBoard()
+    game = NeutronGame(board, StrategyPlayer(board, Color.WHITE, 4),
+                       RandomPlayer(board, Color.BLACK, 0), verbose=False)
+    with Profiler() as profiler:
+        game.start()
+    assert (NeutronBoard.__dict__['neighbors'],
+            Soldier.__dict__['possible_moves'],
+            StrategyPlayer.__dict__['move_soldier'],
+            NeutronGame.__dict__['step']) == originals
+
+    timings = profiler.report()['timings']
+    # win checks don't scan the neutron's neighbors
+    assert 'NeutronBoard.neighbors' not in timings
+    assert timings['NeutronBoard.furthest_empty_spot']['calls'] > 0
+    assert sum(timings[f'NeutronGame.step[{phase}]']['calls']
+               for phase in ('neutron', 'soldier')) == game.half_moves
+    # RandomPlayer.move_soldier called through super() isn't counted again
+    strategy_moves = timings['StrategyPlayer.move_soldier']['calls']
+    assert strategy_moves == profiler.rules['block_neutron'][0]
+
+    profiler.dump_stats(tmp_path / 'game.prof')
+    stats = pstats.Stats(str(tmp_path / 'game.prof'))
+    assert stats.total_calls == sum(entry['calls']
+                                    for entry in timings.values())
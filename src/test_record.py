@@ -0,0 +1,67 @@
+import numpy as np
+
+from player import RandomPlayer, StrategyPlayer
+from record import GameReader, GameRecorder, GameWriter
+from simulate import play_game, simulate
+from util import Color
+
+
+def test_record_and_replay():
+    records = []
+    winner, half_moves = play_game(StrategyPlayer, RandomPlayer,
+                                   recorder=GameRecorder(records.append))
+    record, = records
+    assert record.winner == (winner or 0)
+    assert len(record) == half_moves
+    assert (record.white, record.black) == ('StrategyPlayer', 'RandomPlayer')
+    board = record.replay()
+    assert not winner or board.winner(Color.WHITE) \
+        or board.winner(Color.BLACK)
+
+
+def test_write_and_read(tmp_path):
+    path = tmp_path / 'games.rec'
+    simulate(RandomPlayer, StrategyPlayer, 10, workers=1, seed=0, record=path)
+    simulate(StrategyPlayer, StrategyPlayer, 5, workers=1, seed=1,
+             record=path)
+    with GameReader(path) as reader:
+        records = list(reader)
+        assert reader.names == ['RandomPlayer', 'StrategyPlayer']
+    assert len(records) == 15
+    assert records[0].white == 'RandomPlayer'
+    assert records[-1].black == 'StrategyPlayer'
+    for record in records:
+        board = record.replay()
+        assert np.array_equal(record.replay(0).grid, record.start_grid())
+        assert len(record) == 0 or not np.array_equal(
+            board.grid, record.start_grid())
+
+
+def test_writer_appends(tmp_path):
+    path = tmp_path / 'games.rec'
+    records = []
+    play_game(RandomPlayer, RandomPlayer,
+              recorder=GameRecorder(records.append))
+    for _ in range(2):
+        with GameWriter(path) as writer:
+            writer.write(records[0])
+    with GameReader(path) as reader:
+        first, second = reader
+        assert first.moves == second.moves == records[0].moves
+
+
+def test_writer_long_names(tmp_path):
+    path = tmp_path / 'games.rec'
+    records = []
+    play_game(RandomPlayer, RandomPlayer,
+              recorder=GameRecorder(records.append))
+    record = records[0]
+    record.white, record.black = 'White' * 10, 'a' + '\u00e9' * 20
+    for _ in range(2):
+        with GameWriter(path) as writer:
+            writer.write(record)
+            assert writer.names == ['White' * 6 + 'Wh', 'a' + '\u00e9' * 15]
+    with GameReader(path) as reader:
+        first, second = reader
+        assert first.white == second.white == 'White' * 6 + 'Wh'
+        assert first.black == second.black == 'a' + '\u00e9' * 15
@@ -0,0 +1,115 @@
+import asyncio
+import os
+import random
+import subprocess
+import sys
+
+from neutron import NeutronBoard
+from server import GameServer, grid_rows, receive_message, send_message
+
+
+async def _play(port, options):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    await send_message(writer, {'type': 'new', **options})
+    assert (await receive_message(reader))['type'] == 'start'
+    tried_illegal = False
+    while True:
+        message = await receive_message(reader)
+        if message['type'] == 'end':
+            writer.close()
+            return message['winner']
+        assert message['type'] == 'turn'
+        if not tried_illegal:
+            await send_message(writer, {'type': 'move', 'from': 'C3',
+                                        'to': 'C3'})
+            assert (await receive_message(reader))['type'] == 'error'
+            tried_illegal = True
+        src, dst = random.choice(message['moves'])
+        await send_message(writer, {'type': 'move', 'from': src, 'to': dst})
+
+
+def test_concurrent_games():
+    async def main():
+        server = await GameServer(port=0).start()
+        try:
+            return await asyncio.gather(*(
+                _play(server.port, {
+                    'color': color,
+                    'opponent': 'random',
+                    'first': first,
+                })
+                for color in ('white', 'black')
+                for first in ('human', 'computer')
+                for _ in range(5)
+            ))
+        finally:
+            await server.close()
+
+    random.seed(0)
+    winners = asyncio.run(main())
+    assert len(winners) == 20
+    assert set(winners) <= {'white', 'black', None}
+
+
+def test_invalid_options():
+    async def main():
+        server = await GameServer(port=0).start()
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1',
+                                                           server.port)
+            await send_message(writer, {'type': 'new', 'color': 'red'})
+            message = await receive_message(reader)
+            writer.close()
+            return message
+        finally:
+            await server.close()
+
+    assert asyncio.run(main())['type'] == 'error'
+
+
+def test_malformed_move():
+    async def main():
+        server = await GameServer(port=0).start()
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1',
+                                                           server.port)
+            await send_message(writer, {'type': 'new', 'first': 'human'})
+            await receive_message(reader)
+            turn = await receive_message(reader)
+            await send_message(writer, {'type': 'move', 'from': [0],
+                                        'to': 'A1'})
+            error = await receive_message(reader)
+            # the session goes on after the error
+            src, dst = turn['moves'][0]
+            await send_message(writer, {'type': 'move', 'from': src,
+                                        'to': dst})
+            reply = await receive_message(reader)
+            writer.close()
+            return error, reply
+        finally:
+            await server.close()
+
+    error, reply = asyncio.run(main())
+    assert error == {'type': 'error', 'message': 'illegal move'}
+    assert reply['type'] in ('turn', 'end')
+
+def test_grid_rows():
+    board = NeutronBoard(size=7)
+    assert grid_rows(board) == board.grid.tolist()
+
+
+def test_no_numpy_import():
+    code = '\n'.join([
+        'import asyncio, random, sys',
+        'from server import GameServer',
+        'from test_server import _play',
+        'async def main():',
+        '    server = await GameServer(port=0).start()',
+        '    await _play(server.port, {"opponent": "random"})',
+        '    await server.close()',
+        'random.seed(0)',
+        'asyncio.run(main())',
+        'assert "numpy" not in sys.modules',
+    ])
+    subprocess.run([sys.executable, '-c', code], check=True,
+                   cwd=os.path.dirname(os.path.abspath(__file__)))
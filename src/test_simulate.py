@@ -0,0 +1,33 @@
+import functools
+
+from bitboard import BitboardNeutronBoard
+from player import RandomPlayer, StrategyPlayer, SearchPlayer
+from simulate import simulate
+from util import Color
+
+
+def test_simulate():
+    result = simulate(StrategyPlayer, RandomPlayer, 20, workers=1, seed=0)
+    assert result.games == 20
+    assert result.wins[Color.WHITE] + result.wins[Color.BLACK] + \
+        result.unfinished == 20
+    assert result.average_length > 0
+
+
+def test_simulate_reproducible():
+    results = [
+        simulate(RandomPlayer, RandomPlayer, 10, workers=workers, seed=1,
+                 chunk_size=3)
+        for workers in (1, 2)
+    ]
+    assert results[0].wins == results[1].wins
+    assert results[0].average_length == results[1].average_length
+
+
+def test_simulate_board_size():
+    board_factory = functools.partial(BitboardNeutronBoard, size=7)
+    result = simulate(StrategyPlayer,
+                      functools.partial(SearchPlayer, max_depth=2),
+                      4, workers=1, seed=0, board_factory=board_factory)
+    assert result.games == 4
+    assert result.average_length > 0
@@ -0,0 +1,48 @@
+import pytest
+
+from bitboard import BitBoard, canonical_key
+from mmtable import MappedTable
+from neutron import NeutronBoard
+from tablebase import generate, unpack_value, TablebasePlayer, WIN, LOSS
+from util import Color
+
+
+def test_mapped_table(tmp_path):
+    items = {key * 7919: key % 100 for key in range(1000)}
+    MappedTable.write(tmp_path / 'table.bin', items)
+    table = MappedTable(tmp_path / 'table.bin')
+    assert len(table) == 1000
+    assert all(table.get(key) == value for key, value in items.items())
+    assert table.get(1) is None
+    table.close()
+
+
+def test_generate_and_play(tmp_path):
+    grid = [
+        [3, 0, 0, 3, 3],
+        [3, 0, 0, 0, 0],
+        [2, 0, 1, 0, 3],
+        [0, 0, 0, 0, 0],
+        [0, 2, 2, 2, 2],
+    ]
+    root = BitBoard.from_grid(grid).key(Color.WHITE, 'soldier')
+    table = generate(root, 3, workers=1)
+    assert unpack_value(table[canonical_key(root)[0]])[0] != LOSS
+
+    # a soldier move not blocking the neutron's way to row 0 loses
+    bits = BitBoard.from_grid(grid)
+    bits.move(21, 1)
+    key, _ = bits.canonical_key(Color.BLACK, 'neutron')
+    assert unpack_value(table[key]) == (WIN, 1)
+
+    MappedTable.write(tmp_path / 'tablebase.bin', table)
+    board = NeutronBoard(grid)
+    player = TablebasePlayer(board, Color.WHITE, 4,
+                             path=str(tmp_path / 'tablebase.bin'))
+    player.move_soldier()
+    assert board.grid[0, 2] == 2
+
+
+def test_board_size():
+    with pytest.raises(ValueError):
+        TablebasePlayer(NeutronBoard(size=7), Color.WHITE, 6)
@@ -0,0 +1,38 @@
+from player import RandomPlayer, StrategyPlayer
+from tournament import PairingResult, ratings, sprt_llr, tournament
+
+
+def test_sprt_llr():
+    assert sprt_llr(30, 0, 0, -20, 20) > 3
+    assert sprt_llr(0, 0, 30, -20, 20) < -3
+    assert abs(sprt_llr(15, 0, 15, -20, 20)) < 1e-9
+    assert sprt_llr(60, 0, 40, -20, 20) > sprt_llr(55, 0, 45, -20, 20)
+
+
+def test_ratings():
+    pairings = [PairingResult('a', 'b'), PairingResult('b', 'c'),
+                PairingResult('a', 'c')]
+    for pairing, (wins, losses) in zip(pairings,
+                                       [(70, 30), (70, 30), (100, 0)]):
+        pairing.wins, pairing.losses = wins, losses
+    result = ratings(['a', 'b', 'c'], pairings)
+    assert result['a'][0] > result['b'][0] > result['c'][0]
+    assert abs(sum(rating for rating, _ in result.values())) < 1e-6
+    assert all(0 < error < 100 for _, error in result.values())
+
+
+def test_tournament():
+    players = {'random': RandomPlayer, 'strategy': StrategyPlayer}
+    results = [
+        tournament(players, max_games=80, workers=workers, seed=0)
+        for workers in (1, 2)
+    ]
+    pairing, = results[0].pairings
+    assert pairing.decision == 'strategy'
+    assert pairing.games < 80
+    assert (pairing.wins, pairing.draws, pairing.losses) == (
+        results[1].pairings[0].wins, results[1].pairings[0].draws,
+        results[1].pairings[0].losses
+    )
+    assert [name for name, _, _ in results[0].standings()] == \
+        ['strategy', 'random']
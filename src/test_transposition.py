@@ -0,0 +1,30 @@
+from transposition import TranspositionTable
+from util import Color
+
+
+def test_key():
+    keys = {
+        TranspositionTable.key(12345, color, phase)
+        for color in (Color.WHITE, Color.BLACK)
+        for phase in ('neutron', 'soldier')
+    }
+    assert len(keys) == 4
+
+
+def test_replacement():
+    table = TranspositionTable(4)
+    table.put(1, 5, 10, TranspositionTable.EXACT, (0, 1))
+    assert table.get(1) == (5, 10, TranspositionTable.EXACT, (0, 1))
+    assert table.get(2) is None
+    assert (table.hits, table.misses) == (1, 1)
+
+    # a shallower entry does not replace a deeper one from the same search
+    table.put(5, 3, 20, TranspositionTable.EXACT, (0, 2))
+    assert table.get(1) is not None
+    assert table.evictions == 0
+
+    table.new_search()
+    table.put(5, 3, 20, TranspositionTable.EXACT, (0, 2))
+    assert table.get(1) is None
+    assert table.get(5) == (3, 20, TranspositionTable.EXACT, (0, 2))
+    assert table.evictions == 1
@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+
+from argparse import ArgumentParser
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import itertools
+import math
+import os
+import random
+from statistics import NormalDist
+import time
+
+from neutron import NeutronBoard
+from simulate import play_game, player_types
+from util import Color
+
+_ELO_SCALE = 400 / math.log(10)
+
+_SCHEDULES = (
+    (Color.WHITE, Color.WHITE),
+    (Color.WHITE, Color.BLACK),
+    (Color.BLACK, Color.WHITE),
+    (Color.BLACK, Color.BLACK),
+)
+"""
+Color of the first entrant of a pairing and the color moving first, in each
+game of a round: both colors and both move orders.
+"""
+
+
+def elo_difference(score):
+    """
+    Converts an expected score into an Elo rating difference.
+
+    Args:
+        score (float): expected score, between 0 and 1 exclusive.
+
+    Returns:
+        float: the rating difference.
+    """
+    return -400 * math.log10(1 / score - 1)
+
+
+def expected_score(elo):
+    """Converts an Elo rating difference into an expected score."""
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def _score_variance(wins, draws, losses):
+    # one virtual draw keeps the variance of one-sided results above 0
+    draws += 1
+    games = wins + draws + losses
+    score = (wins + draws / 2) / games
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2
+                + losses * score ** 2) / games
+    return games, score, variance
+
+
+def sprt_llr(wins, draws, losses, elo0, elo1):
+    """
+    Computes the log-likelihood ratio of the sequential probability ratio
+    test, using the normal approximation of the trinomial distribution of
+    game results. One virtual draw is added to the results, so that a
+    one-sided result, e.g. a weak player losing every game, is significant
+    too.
+
+    Args:
+        wins (int): number of games won by the tested player.
+        draws (int): number of drawn (here: unfinished) games.
+        losses (int): number of games lost by the tested player.
+        elo0 (float): rating difference under the null hypothesis.
+        elo1 (float): rating difference under the alternative hypothesis.
+
+    Returns:
+        float:
+            the log-likelihood ratio of the alternative hypothesis to the
+            null one.
+    """
+    games, score, variance = _score_variance(wins, draws, losses)
+    score0, score1 = expected_score(elo0), expected_score(elo1)
+    return (score1 - score0) * (2 * score - score0 - score1) * games \
+        / (2 * variance)
+
+
+def _play_round(first, second, board_factory, max_rounds, repeat, seed):
+    # runs inside a worker process, see simulate._play_games
+    random.seed(seed)
+    results = [0, 0, 0]
+    half_moves = 0
+    for _ in range(repeat):
+        for color, starting in _SCHEDULES:
+            players = (first, second) if color == Color.WHITE \
+                else (second, first)
+            winner, length = play_game(*players, starting, board_factory,
+                                       max_rounds)
+            half_moves += length
+            results[0 if winner == color else 1 if not winner else 2] += 1
+    return results, half_moves
+
+
+class PairingResult:
+    """
+    Results of the games between two entrants of a tournament, from the
+    point of view of the first one. Unfinished games count as draws.
+
+    Args:
+        first (str): name of the first entrant.
+        second (str): name of the second entrant.
+
+    Attributes:
+        wins (int): number of games won by the first entrant.
+        draws (int): number of unfinished games.
+        losses (int): number of games won by the second entrant.
+        half_moves (int): total number of half-moves played.
+        llr (float): log-likelihood ratio of the SPRT, see :func:`sprt_llr`.
+        decision (str):
+            name of the entrant the SPRT found stronger, ``None`` if the
+            pairing was not stopped early.
+    """
+    def __init__(self, first, second):
+        self.first = first
+        self.second = second
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+        self.half_moves = 0
+        self.llr = 0.0
+        self.decision = None
+
+    @property
+    def games(self):
+        """Number of games played."""
+        return self.wins + self.draws + self.losses
+
+    @property
+    def score(self):
+        """Mean score of the first entrant, 0.5 before any game."""
+        if not self.games:
+            return 0.5
+        return (self.wins + self.draws / 2) / self.games
+
+    def elo(self, confidence=0.95):
+        """
+        Estimates the rating difference of the entrants. Like
+        :func:`sprt_llr`, the estimate counts one virtual draw, which keeps
+        it finite.
+
+        Args:
+            confidence (float): confidence level of the interval.
+
+        Returns:
+            tuple:
+                rating difference of the first entrant over the second one,
+                and the lower and upper bounds of its confidence interval.
+                Bounds beyond any finite rating are infinite.
+        """
+        games, score, variance = _score_variance(self.wins, self.draws,
+                                                 self.losses)
+        margin = NormalDist().inv_cdf((1 + confidence) / 2) \
+            * math.sqrt(variance / games)
+
+        def to_elo(value):
+            if value <= 0:
+                return -math.inf
+            if value >= 1:
+                return math.inf
+            return elo_difference(value)
+        return to_elo(score), to_elo(score - margin), to_elo(score + margin)
+
+    def _add(self, results, half_moves):
+        wins, draws, losses = results
+        self.wins += wins
+        self.draws += draws
+        self.losses += losses
+        self.half_moves += half_moves
+
+    def __str__(self):
+        elo, low, high = self.elo()
+        text = f'{self.first} vs {self.second}: ' \
+            f'+{self.wins} ={self.draws} -{self.losses}, ' \
+            f'Elo {elo:+.0f} [{low:+.0f}, {high:+.0f}], LLR {self.llr:.2f}'
+        if self.decision:
+            text += f', stopped early: {self.decision} is stronger'
+        return text
+
+
+def ratings(names, pairings, iterations=1000):
+    """
+    Fits Elo ratings of all entrants to the results of their pairings, by
+    maximum likelihood under the logistic model.
+
+    Every pairing gets one virtual draw, which keeps the ratings of entrants
+    winning or losing all their games finite.
+
+    Args:
+        names (list): names of the entrants.
+        pairings (list): :class:`PairingResult` objects.
+        iterations (int): maximum number of iterations of the fit.
+
+    Returns:
+        dict:
+            mapping of names to ``(rating, standard error)`` tuples, with
+            ratings averaging to 0.
+    """
+    scores = {name: 0.0 for name in names}
+    games = {name: {} for name in names}
+    for pairing in pairings:
+        count = pairing.games + 1
+        scores[pairing.first] += pairing.wins + (pairing.draws + 1) / 2
+        scores[pairing.second] += pairing.losses + (pairing.draws + 1) / 2
+        games[pairing.first][pairing.second] = count
+        games[pairing.second][pairing.first] = count
+
+    # the minorization-maximization update of the Bradley-Terry model, on
+    # strengths 10 ** (rating / 400)
+    strengths = {name: 1.0 for name in names}
+    for _ in range(iterations):
+        updated = {}
+        for name in names:
+            denominator = sum(
+                count / (strengths[name] + strengths[other])
+                for other, count in games[name].items()
+            )
+            updated[name] = scores[name] / denominator if denominator \
+                else strengths[name]
+        mean = sum(math.log(value) for value in updated.values()) \
+            / len(names)
+        updated = {name: value / math.exp(mean)
+                   for name, value in updated.items()}
+        converged = all(abs(math.log(updated[name] / strengths[name])) < 1e-9
+                        for name in names)
+        strengths = updated
+        if converged:
+            break
+
+    result = {}
+    for name in names:
+        information = sum(
+            count * strengths[name] * strengths[other]
+            / (strengths[name] + strengths[other]) ** 2
+            for other, count in games[name].items()
+        )
+        result[name] = (
+            _ELO_SCALE * math.log(strengths[name]),
+            _ELO_SCALE / math.sqrt(information) if information else math.inf,
+        )
+    return result
+
+
+class TournamentResult:
+    """
+    Results of a tournament.
+
+    Args:
+        names (list): names of the entrants.
+        pairings (list): :class:`PairingResult` of every pairing.
+        elapsed (float): wall-clock time of the tournament, in seconds.
+
+    Attributes:
+        ratings (dict): fitted ratings, see :func:`ratings`.
+    """
+    def __init__(self, names, pairings, elapsed):
+        self.names = names
+        self.pairings = pairings
+        self.elapsed = elapsed
+        self.ratings = ratings(names, pairings)
+
+    @property
+    def games(self):
+        """Number of games played."""
+        return sum(pairing.games for pairing in self.pairings)
+
+    def standings(self):
+        """
+        Get the entrants from the highest rated.
+
+        Returns:
+            list: ``(name, rating, standard error)`` tuples.
+        """
+        return sorted(
+            ((name, *self.ratings[name]) for name in self.names),
+            key=lambda entry: -entry[1]
+        )
+
+    def __str__(self):
+        z = NormalDist().inv_cdf(0.975)
+        lines = [f'{"":4}{"entrant":20} {"Elo":>8} {"95% CI":>8}']
+        for rank, (name, rating, error) in enumerate(self.standings(), 1):
+            lines.append(f'{rank:<4}{name:20} {rating:+8.0f} '
+                         f'{"±" + format(z * error, ".0f"):>8}')
+        lines.append('')
+        lines.extend(str(pairing) for pairing in self.pairings)
+        lines.append(f'{self.games} games in {self.elapsed:.1f} s')
+        return '\n'.join(lines)
+
+
+def tournament(players, max_games=400, workers=None, seed=None,
+               board_factory=NeutronBoard, max_rounds=500,
+               elo0=-20, elo1=20, alpha=0.05, beta=0.05, round_repeat=2):
+    """
+    Plays a round-robin tournament, spreading the games over a
+    :class:`concurrent.futures.ProcessPoolExecutor`.
+
+    Every pair of entrants plays rounds of games covering both colors and
+    both move orders. After each round, a sequential probability ratio test
+    of the hypothesis that the first entrant is ``elo1`` stronger against the
+    one that it is ``elo0`` stronger (i.e. weaker) decides whether the
+    pairing's result is already significant; if so, the pairing stops early.
+    Otherwise it goes on until ``max_games`` games have been played.
+
+    Rounds are seeded with ``seed`` plus a per-pairing offset plus the
+    round's index, and accounted in order, so the results don't depend on
+    the number of workers.
+
+    Args:
+        players (dict):
+            mapping of entrant names to :class:`player.Player` subclasses.
+            They have to be picklable, e.g. classes or
+            :func:`functools.partial` objects of them.
+        max_games (int): number of games after which a pairing stops.
+        workers (int):
+            number of worker processes. ``None`` uses all CPUs, 1 plays all
+            games in the current process.
+        seed (int): base seed; a random one is chosen if ``None``.
+        board_factory: callable creating the board in its starting state.
+        max_rounds (int):
+            number of rounds after which a game is abandoned as unfinished.
+        elo0 (float): rating difference under the null hypothesis.
+        elo1 (float): rating difference under the alternative hypothesis.
+        alpha (float): probability of wrongly rejecting the null hypothesis.
+        beta (float): probability of wrongly accepting it.
+        round_repeat (int):
+            number of times the four games of a round are repeated in one
+            task of a worker.
+
+    Returns:
+        TournamentResult: results of the tournament.
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    lower, upper = math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+    round_games = len(_SCHEDULES) * round_repeat
+    rounds = max(1, math.ceil(max_games / round_games))
+    names = list(players)
+    pairings = [PairingResult(first, second)
+                for first, second in itertools.combinations(names, 2)]
+
+    def task(idx, round_idx):
+        pairing = pairings[idx]
+        return (players[pairing.first], players[pairing.second],
+                board_factory, max_rounds, round_repeat,
+                seed + idx * rounds + round_idx)
+
+    def account(idx, results, half_moves):
+        pairing = pairings[idx]
+        pairing._add(results, half_moves)
+        pairing.llr = sprt_llr(pairing.wins, pairing.draws, pairing.losses,
+                               elo0, elo1)
+        if pairing.llr >= upper:
+            pairing.decision = pairing.first
+        elif pairing.llr <= lower:
+            pairing.decision = pairing.second
+
+    start_time = time.perf_counter()
+    if workers == 1:
+        for idx, pairing in enumerate(pairings):
+            for round_idx in range(rounds):
+                account(idx, *_play_round(*task(idx, round_idx)))
+                if pairing.decision:
+                    break
+        return TournamentResult(names, pairings,
+                                time.perf_counter() - start_time)
+
+    # every pairing keeps its next rounds in flight, results arriving out of
+    # order wait until the rounds before them have been accounted
+    scheduled = [0] * len(pairings)
+    accounted = [0] * len(pairings)
+    arrived = [{} for _ in pairings]
+    running = {}
+    executor = ProcessPoolExecutor(workers)
+    capacity = 2 * (workers or os.cpu_count() or 1)
+    try:
+        while True:
+            active = [
+                idx for idx, pairing in enumerate(pairings)
+                if not pairing.decision and scheduled[idx] < rounds
+            ]
+            for idx in itertools.islice(itertools.cycle(active),
+                                        capacity - len(running)):
+                if scheduled[idx] < rounds:
+                    future = executor.submit(_play_round,
+                                             *task(idx, scheduled[idx]))
+                    running[future] = idx, scheduled[idx]
+                    scheduled[idx] += 1
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                idx, round_idx = running.pop(future)
+                arrived[idx][round_idx] = future.result()
+                while accounted[idx] in arrived[idx] \
+                        and not pairings[idx].decision:
+                    account(idx, *arrived[idx].pop(accounted[idx]))
+                    accounted[idx] += 1
+            for future, (idx, _) in list(running.items()):
+                if pairings[idx].decision and future.cancel():
+                    del running[future]
+    finally:
+        executor.shutdown(cancel_futures=True)
+    return TournamentResult(names, pairings, time.perf_counter() - start_time)
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(
+        description='Plays a round-robin tournament between computer '
+                    'players and rates them.'
+    )
+    parser.add_argument('players', nargs='+', choices=player_types,
+                        help='Types of the entrants.')
+    parser.add_argument('-g', '--max-games', type=int, default=400,
+                        help='Number of games after which a pairing stops. \
+                        Defaults to 400.')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='Number of worker processes. Defaults to the \
+                        number of CPUs.')
+    parser.add_argument('-s', '--seed', type=int, default=None,
+                        help='Base seed of the random number generators.')
+    parser.add_argument('--elo0', type=float, default=-20,
+                        help='Rating difference of the SPRT\'s null \
+                        hypothesis. Defaults to -20.')
+    parser.add_argument('--elo1', type=float, default=20,
+                        help='Rating difference of the SPRT\'s alternative \
+                        hypothesis. Defaults to 20.')
+    parser.add_argument('--alpha', type=float, default=0.05,
+                        help='False positive rate of the SPRT. Defaults to \
+                        0.05.')
+    parser.add_argument('--beta', type=float, default=0.05,
+                        help='False negative rate of the SPRT. Defaults to \
+                        0.05.')
+    args = parser.parse_args()
+
+    if len(set(args.players)) < 2:
+        parser.error('at least two different players are required')
+    print(tournament(
+        {name: player_types[name] for name in args.players},
+        max_games=args.max_games,
+        workers=args.workers,
+        seed=args.seed,
+        elo0=args.elo0,
+        elo1=args.elo1,
+        alpha=args.alpha,
+        beta=args.beta,
+    ))
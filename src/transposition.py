@@ -0,0 +1,109 @@
+from neutron import ZOBRIST_BLACK_TO_MOVE, ZOBRIST_SOLDIER_PHASE
+from util import Color
+
+
+class TranspositionTable:
+    """
+    A bounded table of search results, keyed by position.
+
+    The table has a fixed number of slots and a key is stored in the slot
+    given by its lowest bits. When two keys collide, the new entry replaces
+    the stored one if the stored entry comes from an older search (see
+    :func:`new_search`) or was searched to at most the same depth. Otherwise
+    the stored entry is kept, since a deeper result is worth more.
+
+    Args:
+        size (int): number of slots, rounded up to a power of two.
+
+    Attributes:
+        hits (int): number of lookups that found their key.
+        misses (int): number of lookups that did not.
+        evictions (int): number of entries replaced by a different key.
+    """
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+    def __init__(self, size=2 ** 18):
+        self.size = 1 << max(0, size - 1).bit_length()
+        self._mask = self.size - 1
+        self._slots = [None] * self.size
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(zobrist, color, phase):
+        """
+        Combines a board's Zobrist hash with the side to move and the turn
+        phase into a table key.
+
+        Args:
+            zobrist (int): Zobrist hash of the board.
+            color (int): color of the player to move.
+            phase (str): ``'neutron'`` or ``'soldier'``.
+
+        Returns:
+            int: the key.
+        """
+        if color == Color.BLACK:
+            zobrist ^= ZOBRIST_BLACK_TO_MOVE
+        if phase == 'soldier':
+            zobrist ^= ZOBRIST_SOLDIER_PHASE
+        return zobrist
+
+    def new_search(self):
+        """
+        Marks entries stored so far as coming from an older search, letting
+        new entries replace them regardless of depth.
+        """
+        self._generation += 1
+
+    def get(self, key):
+        """
+        Looks a key up.
+
+        Args:
+            key (int): key made by :func:`key`.
+
+        Returns:
+            tuple:
+                ``(depth, score, flag, move)`` stored for the key, or ``None``
+                if the key is not in the table.
+        """
+        entry = self._slots[key & self._mask]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1:5]
+        self.misses += 1
+        return None
+
+    def put(self, key, depth, score, flag, move):
+        """
+        Stores a search result, subject to the replacement policy.
+
+        Args:
+            key (int): key made by :func:`key`.
+            depth (int): depth the position was searched to.
+            score (int): score of the position.
+            flag (int):
+                :attr:`EXACT`, or :attr:`LOWER` and :attr:`UPPER` if the score
+                is only a bound.
+            move: best move found in the position.
+        """
+        idx = key & self._mask
+        entry = self._slots[idx]
+        if entry is not None and entry[0] != key:
+            if entry[5] == self._generation and entry[1] > depth:
+                return
+            self.evictions += 1
+        self._slots[idx] = (key, depth, score, flag, move, self._generation)
+
+    def clear(self):
+        """Removes all entries and resets the counters."""
+        self._slots = [None] * self.size
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return sum(entry is not None for entry in self._slots)
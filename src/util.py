@@ -3,14 +3,20 @@ class Vec:
     A very simple implementation of a 2D vector, used to facilitate operations
     on positions and directions.
 
+    Vectors are hashed once, when created, and compared coordinate by
+    coordinate, so using them as set members and dictionary keys doesn't
+    allocate anything.
+
     Args:
         x (int): vector's x coordinate.
         y (int): vector's y coordinate.
     """
-    __slots__ = 'x', 'y'
+    __slots__ = 'x', 'y', '_hash'
 
     def __init__(self, x, y):
         self.x, self.y = int(x), int(y)
+        # the hash of the (y, x) tuple, which vectors compare equal to
+        self._hash = hash((self.y, self.x))
 
     @staticmethod
     def fromtuple(tuple_pos):
@@ -29,10 +35,12 @@ class Vec:
         return Vec(tuple_pos[1], tuple_pos[0])
 
     def __eq__(self, other):
+        if type(other) is Vec:
+            return self.x == other.x and self.y == other.y
         return other is not None and tuple(self) == tuple(other)
 
     def __hash__(self):
-        return hash(tuple(self))
+        return self._hash
 
     def __add__(self, other):
         return Vec(self.x + other.x, self.y + other.y)
@@ -56,6 +64,19 @@ class Color:
         BLACK: 'black'
     }
 
+    @staticmethod
+    def opposite(color):
+        """
+        Get the color of the other player.
+
+        Args:
+            color (int): a soldier color.
+
+        Returns:
+            int: the other soldier color.
+        """
+        return Color.BLACK if color == Color.WHITE else Color.WHITE
+
 
 directions = {
     'north': Vec(0, -1),